@@ -7,5 +7,6 @@ setup(
     install_requires=[
         "selenium==4.18.1",
         "webdriver-manager==4.0.1",
+        "PyYAML>=6.0",
     ],
 ) 
\ No newline at end of file
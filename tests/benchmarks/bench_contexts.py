@@ -0,0 +1,149 @@
+"""
+Compare memory per chatbot session: one browser each versus shared browser contexts.
+
+Opens --sessions chatbot sessions against the stub, each past the lead form
+and ready to chat. It does this once with a Chrome process per session and
+once with isolated browser contexts packed --per-browser to a process. Then
+it measures the proportional set size of every chromedriver and Chrome
+process tree (Linux only). Sessions sharing a browser also share its
+WebDriver command queue, and one session's async wait holds up the rest,
+so the open time grows with --per-browser while memory falls.
+
+    python -m tests.benchmarks.bench_contexts --sessions 8 --per-browser 4
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ..config import ChatbotTarget
+from ..pages.chatbot_page import ChatbotPage
+from ..scenarios.scenario import DEFAULT_LEAD
+from ..support.browser_contexts import ContextScheduler
+from ..support.drivers import create_driver
+
+
+def _parents():
+    """Map every pid to its parent pid from /proc"""
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields resume after ')'
+                fields = f.read().rsplit(")", 1)[1].split()
+            parents[int(entry)] = int(fields[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    return parents
+
+
+def _process_memory(pid):
+    """Proportional set size in bytes, falling back to resident set size"""
+    for path, field in ((f"/proc/{pid}/smaps_rollup", "Pss:"), (f"/proc/{pid}/status", "VmRSS:")):
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith(field):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            continue
+    return 0
+
+
+def process_tree_memory(pids):
+    """Memory of the given processes and all their descendants, in bytes"""
+    if not os.path.isdir("/proc"):
+        raise Exception("Process memory is read from /proc, which this platform does not have")
+    parents = _parents()
+    tree = set(pids)
+    grew = True
+    while grew:
+        children = {pid for pid, parent in parents.items() if parent in tree} - tree
+        tree |= children
+        grew = bool(children)
+    return sum(_process_memory(pid) for pid in tree)
+
+
+def _driver_pid(driver):
+    return driver.service.process.pid
+
+
+def _open_chat(page, url):
+    page.start_chat(url, DEFAULT_LEAD)
+    if not page.wait_for_chat_input():
+        raise Exception("Chat input did not appear")
+
+
+def measure_browsers(url, sessions):
+    """Open one browser per session; returns (memory bytes, browsers, seconds to open)"""
+    started = time.monotonic()
+    with ThreadPoolExecutor(sessions) as executor:
+        drivers = list(executor.map(lambda _: create_driver(default="headless"), range(sessions)))
+    try:
+        with ThreadPoolExecutor(sessions) as executor:
+            list(executor.map(lambda driver: _open_chat(ChatbotPage(driver), url), drivers))
+        elapsed = time.monotonic() - started
+        return process_tree_memory([_driver_pid(d) for d in drivers]), len(drivers), elapsed
+    finally:
+        for driver in drivers:
+            driver.quit()
+
+
+def measure_contexts(url, sessions, per_browser):
+    """Open every session in its own context on shared browsers; same return as measure_browsers"""
+    started = time.monotonic()
+    with ContextScheduler(sessions, per_browser) as scheduler:
+        contexts = [scheduler.hosts[i // scheduler.sessions_per_browser].new_context() for i in range(sessions)]
+
+        def open_chat(context):
+            with context:
+                _open_chat(ChatbotPage(context.driver), url)
+
+        with ThreadPoolExecutor(sessions) as executor:
+            list(executor.map(open_chat, contexts))
+        elapsed = time.monotonic() - started
+        memory = process_tree_memory([_driver_pid(host.driver) for host in scheduler.hosts])
+        return memory, len(scheduler.hosts), elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent chatbot sessions")
+    parser.add_argument("--per-browser", type=int, default=4, help="Browser contexts per Chrome process")
+    parser.add_argument("--target", default="stub", help="Chatbot URL or 'stub'")
+    parser.add_argument("--report", help="Write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with ChatbotTarget(args.target) as target:
+        for mode, measure in (
+            ("browsers", lambda: measure_browsers(target.url, args.sessions)),
+            ("contexts", lambda: measure_contexts(target.url, args.sessions, args.per_browser)),
+        ):
+            memory, browsers, elapsed = measure()
+            per_session = memory / args.sessions
+            results[mode] = {
+                "sessions": args.sessions,
+                "browsers": browsers,
+                "memory": memory,
+                "memory_per_session": per_session,
+                "sessions_per_gb": 2 ** 30 / per_session if per_session else None,
+                "open_seconds": elapsed,
+            }
+
+    print(f"\n{'mode':<10}{'sessions':>9}{'browsers':>9}{'total':>11}{'per session':>13}"
+          f"{'per GB':>8}{'open':>8}")
+    for mode, result in results.items():
+        print(f"{mode:<10}{result['sessions']:>9}{result['browsers']:>9}"
+              f"{result['memory'] / 2 ** 20:>8.0f} MB{result['memory_per_session'] / 2 ** 20:>10.0f} MB"
+              f"{result['sessions_per_gb'] or 0:>8.1f}{result['open_seconds']:>7.1f}s")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmark ChatbotPage operations against the local stub chatbot.
+
+Each operation runs --runs times at every conversation length (bubbles
+already in the chat), timing only the operation and counting the WebDriver
+commands it issues. Results can be saved as a baseline and later runs are
+compared against it, flagging operations whose median time or command count
+grew by more than --threshold.
+
+    python -m tests.benchmarks.bench_page --runs 10 --save-baseline
+    python -m tests.benchmarks.bench_page --runs 10 --threshold 0.2
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from ..pages.chatbot_page import ChatbotPage
+from ..scenarios.scenario import DEFAULT_LEAD
+from ..stub.server import StubServer
+from ..support.drivers import create_driver
+from ..support.instrumentation import Instrumentation
+from ..support.stats import summarize
+
+LENGTHS = [10, 100, 1000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "page.json")
+
+# Text of a bubble near the start of every fixture conversation, the worst
+# case for a message search
+EARLY_MESSAGE = "History question 1"
+
+
+def _open(page, url, fill=True):
+    """Load the fixture with the lead form showing, optionally filling it"""
+    page.driver.execute_script("""
+        try { window.localStorage.clear(); } catch (e) {}
+        try { window.sessionStorage.clear(); } catch (e) {}
+    """)
+    page.load(url)
+    if fill:
+        page.fill_user_info(**DEFAULT_LEAD)
+        page.wait_for_chat_input()
+
+
+def _setup_load(page, url):
+    page.driver.execute_script("try { window.localStorage.clear(); } catch (e) {}")
+
+
+def _setup_chat_input(page, url):
+    _open(page, url)
+    page.handles.invalidate()
+
+
+# name: (setup, operation); setup runs untimed before every operation
+OPERATIONS = {
+    "load": (_setup_load, lambda page, url: page.load(url)),
+    "fill_user_info": (
+        lambda page, url: _open(page, url, fill=False),
+        lambda page, url: page.fill_user_info(**DEFAULT_LEAD),
+    ),
+    "wait_for_chat_input": (_setup_chat_input, lambda page, url: page.wait_for_chat_input()),
+    "send_message": (_open, lambda page, url: page.send_message("Benchmark message")),
+    "is_message_visible": (_open, lambda page, url: page.is_message_visible(EARLY_MESSAGE)),
+}
+
+
+def measure(driver, url, setup, operation):
+    """Run one operation on a fresh page; returns (seconds, WebDriver commands)"""
+    page = ChatbotPage(driver)
+    setup(page, url)
+    instrumentation = Instrumentation(driver)
+    try:
+        started = time.perf_counter()
+        result = operation(page, url)
+        elapsed = time.perf_counter() - started
+    finally:
+        instrumentation.detach()
+    if result is False:
+        raise Exception("Operation reported failure")
+    commands = sum(sum(stats.commands.values()) for stats in instrumentation.steps.values())
+    return elapsed, commands
+
+
+def run_benchmarks(driver, server, operations, lengths, runs):
+    results = {}
+    for length in lengths:
+        url = server.chatbot_url(history=length, boot=0)
+        driver.get(url)
+        for name in operations:
+            setup, operation = OPERATIONS[name]
+            timings, commands = [], []
+            for _ in range(runs):
+                elapsed, count = measure(driver, url, setup, operation)
+                timings.append(elapsed)
+                commands.append(count)
+            results[f"{name}@{length}"] = {
+                "operation": name,
+                "bubbles": length,
+                "seconds": summarize(timings),
+                "commands": statistics.median(commands),
+            }
+            print(f"{name}@{length}: p50 {results[f'{name}@{length}']['seconds']['p50'] * 1000:.1f} ms")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Flag results that regressed against the baseline.
+
+    Returns:
+        list: (key, description) for every median time or command count that
+              grew by more than threshold (a fraction, e.g. 0.2 for 20%)
+    """
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if not before:
+            continue
+        p50, base_p50 = result["seconds"]["p50"], before["seconds"]["p50"]
+        if base_p50 and p50 > base_p50 * (1 + threshold):
+            regressions.append((key, f"p50 {base_p50 * 1000:.1f} -> {p50 * 1000:.1f} ms"))
+        if result["commands"] > before["commands"] * (1 + threshold):
+            regressions.append((key, f"commands {before['commands']:g} -> {result['commands']:g}"))
+    return regressions
+
+
+def print_report(results, baseline, regressions):
+    flagged = {key for key, _ in regressions}
+    print(f"\n{'operation':<30}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'cmds':>7}{'base ms':>9}")
+    for key, result in results.items():
+        seconds = result["seconds"]
+        base = baseline.get(key)
+        base_p50 = f"{base['seconds']['p50'] * 1000:.1f}" if base else "-"
+        print(f"{key:<30}{seconds['p50'] * 1000:>9.1f}{seconds['p95'] * 1000:>9.1f}"
+              f"{seconds['max'] * 1000:>9.1f}{result['commands']:>7g}{base_p50:>9}"
+              f"{'  REGRESSED' if key in flagged else ''}")
+    for key, description in regressions:
+        print(f"REGRESSION {key}: {description}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per operation and length")
+    parser.add_argument("--operations", nargs="+", default=list(OPERATIONS), choices=list(OPERATIONS))
+    parser.add_argument("--lengths", nargs="+", type=int, default=LENGTHS,
+                        help="Bubbles in the chat before each operation")
+    parser.add_argument("--profile", default="headless", help="Browser profile (see tests/support/drivers.py)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed growth before a result is flagged (0.2 = 20%%)")
+    parser.add_argument("--report", help="Write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    with StubServer() as server:
+        driver = create_driver(args.profile)
+        try:
+            results = run_benchmarks(driver, server, args.operations, args.lengths, args.runs)
+        finally:
+            driver.quit()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    print_report(results, baseline, regressions)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(dict(baseline, **results), f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
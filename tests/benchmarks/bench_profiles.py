@@ -0,0 +1,66 @@
+"""
+Compare browser startup and page load time across driver profiles.
+
+Each run launches a fresh session with the profile, loads the chatbot with
+ChatbotPage.load and waits for the lead form or chat view. Runs against the
+local stub by default; pass --target to measure a real Flowise page, where
+blocked images, fonts and analytics make the difference.
+
+    python -m tests.benchmarks.bench_profiles --runs 5
+    python -m tests.benchmarks.bench_profiles --target https://host/chatbot/<id> --profiles headless fast
+"""
+import argparse
+import json
+import statistics
+import time
+from ..config import ChatbotTarget
+from ..pages.chatbot_page import ChatbotPage
+from ..support.drivers import PROFILES, get_profile
+from ..support.waits import CHAT_OR_LEAD_FORM
+
+
+def run_profile(profile, url):
+    """Launch, load and quit once; returns (startup seconds, load seconds)"""
+    started = time.monotonic()
+    driver = profile.create()
+    startup = time.monotonic() - started
+    try:
+        page = ChatbotPage(driver)
+        started = time.monotonic()
+        page.load(url)
+        page.waits.until(CHAT_OR_LEAD_FORM, timeout=30, message="Chatbot did not become usable")
+        return startup, time.monotonic() - started
+    finally:
+        driver.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="Sessions per profile")
+    parser.add_argument("--profiles", nargs="+", default=["headless", "fast"], choices=sorted(PROFILES))
+    parser.add_argument("--target", default="stub", help="Chatbot URL or 'stub'")
+    parser.add_argument("--report", help="Write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with ChatbotTarget(args.target) as target:
+        for name in args.profiles:
+            profile = get_profile(name)
+            runs = [run_profile(profile, target.url) for _ in range(args.runs)]
+            results[name] = {
+                "startup": statistics.median(startup for startup, _ in runs),
+                "load": statistics.median(load for _, load in runs),
+            }
+
+    print(f"\n{'profile':<12}{'startup':>9}{'load':>9}{'total':>9}")
+    for name, result in results.items():
+        total = result["startup"] + result["load"]
+        print(f"{name:<12}{result['startup']:>8.2f}s{result['load']:>8.2f}s{total:>8.2f}s")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Measure how much idle time the event-driven waits save per test.
+
+Runs the flows from tests/test_chatbot.py against the local stub chatbot and
+compares the time spent waiting with the fixed sleeps ChatbotPage used to do.
+
+    python -m tests.benchmarks.bench_waits --runs 5
+"""
+import argparse
+import statistics
+import time
+from ..pages.chatbot_page import ChatbotPage
+from ..support.drivers import create_driver
+from ..stub.server import StubServer
+
+# Unconditional sleeps each flow paid before the wait engine:
+# load 5 s, wait_for_chat_input 2 s, send_message 3 + 0.5 + 1 + 2 s
+LEGACY_FIXED_SLEEP = {
+    "test_chatbot_initial_load": 7.0,
+    "test_send_message": 11.5,
+    "test_chatbot_response": 11.5,
+}
+
+
+def _initial_load(page):
+    assert page.is_chat_input_visible()
+
+
+def _send_message(page):
+    message = "Hello, how are you?"
+    page.send_message(message)
+    assert page.is_message_visible(message)
+
+
+def _chatbot_response(page):
+    page.send_message("What can you help me with?")
+    assert page.is_chatbot_response_visible()
+
+
+FLOWS = {
+    "test_chatbot_initial_load": _initial_load,
+    "test_send_message": _send_message,
+    "test_chatbot_response": _chatbot_response,
+}
+
+
+# The stub keeps the submitted lead in localStorage, so without this every
+# run after the first would skip the lead form the flows are timed through
+CLEAR_STORAGE = """
+    try { window.localStorage.clear(); } catch (e) {}
+    try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def run_flow(driver, url, flow):
+    """Run one test flow and return (wall seconds, seconds spent waiting)"""
+    page = ChatbotPage(driver)
+    driver.execute_script(CLEAR_STORAGE)
+    started = time.monotonic()
+    page.load(url)
+    if not page.fill_user_info(name="Test User", email="test@example.com", phone="1234567890"):
+        raise Exception("The lead form was not filled, so this run did not time the full flow")
+    flow(page)
+    return time.monotonic() - started, page.waits.waited
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="Runs per test flow")
+    args = parser.parse_args(argv)
+
+    with StubServer() as server:
+        url = server.chatbot_url()
+        driver = create_driver(default="headless")
+        try:
+            rows = []
+            for name, flow in FLOWS.items():
+                walls, waits = [], []
+                for _ in range(args.runs):
+                    wall, waited = run_flow(driver, url, flow)
+                    walls.append(wall)
+                    waits.append(waited)
+                wall = statistics.median(walls)
+                waited = statistics.median(waits)
+                fixed = LEGACY_FIXED_SLEEP[name]
+                rows.append((name, wall, waited, fixed, fixed - waited, wall - waited + fixed))
+        finally:
+            driver.quit()
+
+    print(f"\n{'test':<28}{'wall':>8}{'waited':>9}{'fixed':>8}{'saved':>8}{'legacy~':>9}")
+    for name, wall, waited, fixed, saved, legacy in rows:
+        print(f"{name:<28}{wall:>7.2f}s{waited:>8.2f}s{fixed:>7.1f}s{saved:>7.2f}s{legacy:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# This file makes the client directory a Python package
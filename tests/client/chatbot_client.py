@@ -0,0 +1,166 @@
+import asyncio
+import json
+import time
+import uuid
+from urllib.parse import urlparse
+from .http_pool import HTTPConnectionPool
+
+
+class ChatReply:
+    """
+    A bot reply received over HTTP.
+
+    Attributes:
+        text: The full reply
+        time_to_first_token: Seconds until the first token (or the whole
+                             reply, when not streaming)
+        elapsed: Seconds until the reply was complete
+        streamed: Whether the reply arrived as server-sent events
+    """
+
+    def __init__(self, text, time_to_first_token, elapsed, streamed):
+        self.text = text
+        self.time_to_first_token = time_to_first_token
+        self.elapsed = elapsed
+        self.streamed = streamed
+
+    def __repr__(self):
+        return (f"ChatReply({self.text!r}, ttft={self.time_to_first_token:.3f}, "
+                f"elapsed={self.elapsed:.3f}, streamed={self.streamed})")
+
+
+class ChatbotClient:
+    """
+    Drives the same flow as ChatbotPage directly over the Flowise HTTP API.
+
+    fill_user_info submits the lead that the widget's form posts, and
+    send_message makes the prediction call the widget's send button
+    triggers. Clients can share one HTTPConnectionPool.
+
+    Args:
+        chatbot_url (str): The chatbot page URL, e.g. https://host/chatbot/<id>
+        pool (HTTPConnectionPool): Connection pool to send requests through
+    """
+
+    def __init__(self, chatbot_url, pool=None):
+        parsed = urlparse(chatbot_url)
+        self.api_host = f"{parsed.scheme}://{parsed.netloc}"
+        self.chatflow_id = parsed.path.rstrip("/").split("/")[-1]
+        self.pool = pool or HTTPConnectionPool()
+        self.chat_id = str(uuid.uuid4())
+        self.streaming = None
+        self.transcript = []
+
+    async def is_streaming(self):
+        """Ask Flowise whether the chatflow streams its answers"""
+        status, _, body = await self.pool.request(
+            "GET", f"{self.api_host}/api/v1/chatflows-streaming/{self.chatflow_id}"
+        )
+        return status == 200 and bool(json.loads(body).get("isStreaming"))
+
+    async def fill_user_info(self, name, email, phone):
+        """Submit the lead form; returns the saved lead"""
+        return await self._post_json("/api/v1/leads", {
+            "chatflowid": self.chatflow_id,
+            "chatId": self.chat_id,
+            "name": name,
+            "email": email,
+            "phone": phone,
+        })
+
+    async def send_message(self, message):
+        """Send a question and return the bot's ChatReply"""
+        if self.streaming is None:
+            self.streaming = await self.is_streaming()
+        payload = {"question": message, "chatId": self.chat_id, "streaming": self.streaming}
+        started = time.monotonic()
+        async with self.pool.stream(
+            "POST", f"{self.api_host}/api/v1/prediction/{self.chatflow_id}",
+            json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"}
+        ) as response:
+            if response.status != 200:
+                await response.read()
+                raise Exception(f"Prediction failed with HTTP {response.status}")
+            if response.headers.get("content-type", "").startswith("text/event-stream"):
+                reply = await self._read_stream(response, started)
+            else:
+                data = json.loads(await response.read())
+                elapsed = time.monotonic() - started
+                reply = ChatReply(data.get("text", ""), elapsed, elapsed, streamed=False)
+        self.transcript.append(("user", message))
+        self.transcript.append(("bot", reply.text))
+        return reply
+
+    async def run_scenario(self, scenario):
+        """Submit the scenario's lead and send each turn; returns the replies"""
+        await self.fill_user_info(**scenario.lead)
+        return [await self.send_message(turn) for turn in scenario.turns]
+
+    async def _read_stream(self, response, started):
+        tokens = []
+        first_token = None
+        buffer = b""
+        async for chunk in response.iter_chunks():
+            buffer += chunk
+            *events, buffer = buffer.split(b"\n\n")
+            for event in events:
+                for line in event.split(b"\n"):
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = json.loads(line[len(b"data:"):])
+                    if data.get("event") == "token":
+                        if first_token is None:
+                            first_token = time.monotonic() - started
+                        tokens.append(data.get("data", ""))
+        elapsed = time.monotonic() - started
+        return ChatReply("".join(tokens), first_token if first_token is not None else elapsed,
+                         elapsed, streamed=True)
+
+    async def _post_json(self, path, payload):
+        status, _, body = await self.pool.request(
+            "POST", f"{self.api_host}{path}",
+            json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"}
+        )
+        if status != 200:
+            raise Exception(f"POST {path} failed with HTTP {status}")
+        return json.loads(body)
+
+
+async def run_conversations(chatbot_url, scenario, conversations, concurrency=100, on_reply=None):
+    """
+    Run many conversations over one shared connection pool.
+
+    Args:
+        chatbot_url (str): The chatbot page URL
+        scenario (Scenario): The conversation every client runs
+        conversations (int): Number of conversations to run
+        concurrency (int): Conversations (and connections) in flight at once
+        on_reply (callable): Called with each ChatReply as it arrives
+
+    Returns:
+        tuple: (failed conversations as {session, turn, error} dicts, pool stats);
+               turn is None when the lead form failed
+    """
+    pool = HTTPConnectionPool(limit=concurrency)
+    slots = asyncio.Semaphore(concurrency)
+    failures = []
+
+    async def conversation(session):
+        async with slots:
+            client = ChatbotClient(chatbot_url, pool)
+            turn = None
+            try:
+                await client.fill_user_info(**scenario.lead)
+                for turn, message in enumerate(scenario.turns):
+                    reply = await client.send_message(message)
+                    if on_reply:
+                        on_reply(reply)
+            except Exception as e:
+                print(f"Conversation {session} failed: {str(e)}")
+                failures.append({"session": session, "turn": turn, "error": str(e) or type(e).__name__})
+
+    try:
+        await asyncio.gather(*(conversation(session) for session in range(conversations)))
+    finally:
+        await pool.close()
+    return failures, dict(pool.stats)
@@ -0,0 +1,188 @@
+import asyncio
+import ssl
+from urllib.parse import urlparse
+
+
+class PooledResponse:
+    """A response whose body is read from a pooled connection"""
+
+    def __init__(self, status, headers, reader):
+        self.status = status
+        self.headers = headers
+        self._reader = reader
+        self.consumed = False
+
+    @property
+    def keep_alive(self):
+        return self.headers.get("connection", "").lower() != "close" and (
+            "content-length" in self.headers or self.chunked
+        )
+
+    @property
+    def chunked(self):
+        return self.headers.get("transfer-encoding", "").lower() == "chunked"
+
+    async def iter_chunks(self):
+        """Yield the body as it arrives"""
+        reader = self._reader
+        if self.chunked:
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # Skip trailers up to the blank line ending the body
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                data = await reader.readexactly(size)
+                await reader.readexactly(2)
+                yield data
+        elif "content-length" in self.headers:
+            remaining = int(self.headers["content-length"])
+            while remaining:
+                data = await reader.read(min(remaining, 65536))
+                if not data:
+                    raise ConnectionError("Connection closed mid-body")
+                remaining -= len(data)
+                yield data
+        else:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                yield data
+        self.consumed = True
+
+    async def read(self):
+        return b"".join([chunk async for chunk in self.iter_chunks()])
+
+
+class _Stream:
+    """Async context manager that returns the connection to the pool on exit"""
+
+    def __init__(self, pool, method, url, body, headers):
+        self.pool = pool
+        self.args = (method, url, body, headers)
+        self.connection = None
+        self.response = None
+
+    async def __aenter__(self):
+        self.connection, self.response = await self.pool._send(*self.args)
+        return self.response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        reusable = exc_type is None and self.response.consumed and self.response.keep_alive
+        self.pool._release(self.connection, reusable)
+
+
+class HTTPConnectionPool:
+    """
+    Minimal asyncio HTTP/1.1 client with keep-alive connection pooling.
+
+    Idle connections are reused per host, and at most `limit` connections
+    are open at once, so thousands of conversations can share one process.
+    """
+
+    def __init__(self, limit=100, timeout=60):
+        self.limit = limit
+        self.timeout = timeout
+        self._idle = {}
+        self._semaphore = None
+        self.stats = {"opened": 0, "reused": 0, "requests": 0}
+
+    def stream(self, method, url, body=None, headers=None):
+        """
+        Send a request and stream the response.
+
+            async with pool.stream("POST", url, body) as response:
+                async for chunk in response.iter_chunks():
+                    ...
+        """
+        return _Stream(self, method, url, body, headers)
+
+    async def request(self, method, url, body=None, headers=None):
+        """Send a request and return (status, headers, body bytes)"""
+        async with self.stream(method, url, body, headers) as response:
+            return response.status, response.headers, await response.read()
+
+    async def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+    async def _send(self, method, url, body, headers):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+        parsed = urlparse(url)
+        key = (parsed.scheme, parsed.hostname, parsed.port or (443 if parsed.scheme == "https" else 80))
+        path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+        lines = [f"{method} {path or '/'} HTTP/1.1", f"Host: {parsed.netloc}", "Connection: keep-alive"]
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b"")
+
+        await self._semaphore.acquire()
+        self.stats["requests"] += 1
+        try:
+            connection, reused = await self._connect(key)
+            try:
+                return connection, await self._exchange(connection, request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection[1].close()
+                if not reused:
+                    raise
+            except BaseException:
+                # A timeout or cancellation leaves the response half-read
+                connection[1].close()
+                raise
+            # The server closed an idle keep-alive connection; retry on a new one
+            connection, _ = await self._connect(key, fresh=True)
+            try:
+                return connection, await self._exchange(connection, request)
+            except BaseException:
+                connection[1].close()
+                raise
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    async def _exchange(self, connection, request):
+        reader, writer = connection[:2]
+        writer.write(request)
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), self.timeout)
+        if not status_line:
+            raise ConnectionError("Connection closed before response")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return PooledResponse(status, headers, reader)
+
+    async def _connect(self, key, fresh=False):
+        idle = self._idle.get(key, [])
+        while idle and not fresh:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                self.stats["reused"] += 1
+                return (reader, writer, key), True
+            writer.close()
+        scheme, host, port = key
+        context = ssl.create_default_context() if scheme == "https" else None
+        reader, writer = await asyncio.open_connection(host, port, ssl=context)
+        self.stats["opened"] += 1
+        return (reader, writer, key), False
+
+    def _release(self, connection, reusable):
+        reader, writer, key = connection
+        if reusable:
+            self._idle.setdefault(key, []).append((reader, writer))
+        else:
+            writer.close()
+        self._semaphore.release()
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import random
+import time
+from urllib.parse import urlparse
+from .http_pool import HTTPConnectionPool
+
+
+class ReadinessResult:
+    """
+    Outcome of waiting for the chatbot target.
+
+    Attributes:
+        ready: Whether every endpoint answered 200 before the deadline
+        waited: Seconds from the first probe until ready (or the deadline)
+        cold: Whether the first probe failed, i.e. the target was booting
+        attempts: Probe rounds made
+        last_error: Status or error of the last failing endpoint
+    """
+
+    def __init__(self, ready, waited, cold, attempts, last_error=None):
+        self.ready = ready
+        self.waited = waited
+        self.cold = cold
+        self.attempts = attempts
+        self.last_error = last_error
+
+    def as_dict(self):
+        return {
+            "ready": self.ready,
+            "waited": self.waited,
+            "cold": self.cold,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+        }
+
+    def __repr__(self):
+        return f"ReadinessResult({self.as_dict()})"
+
+
+class ReadinessProbe:
+    """
+    Polls the Flowise health and chatflow endpoints until both answer 200.
+
+    Probes reuse keep-alive connections from one HTTPConnectionPool and back
+    off exponentially, with jitter, from initial_delay up to max_delay.
+
+    Args:
+        chatbot_url (str): The chatbot page URL, e.g. https://host/chatbot/<id>
+        timeout (float): Seconds to keep trying, CHATBOT_READY_TIMEOUT or 180
+        request_timeout (float): Seconds to wait for each response
+    """
+
+    def __init__(self, chatbot_url, timeout=None, request_timeout=10,
+                 initial_delay=0.5, max_delay=10.0, backoff=2.0, pool=None):
+        if timeout is None:
+            timeout = float(os.environ.get("CHATBOT_READY_TIMEOUT", 180))
+        parsed = urlparse(chatbot_url)
+        api_host = f"{parsed.scheme}://{parsed.netloc}"
+        chatflow_id = parsed.path.rstrip("/").split("/")[-1]
+        self.endpoints = [
+            f"{api_host}/api/v1/ping",
+            f"{api_host}/api/v1/chatflows-streaming/{chatflow_id}",
+        ]
+        self.timeout = timeout
+        self.request_timeout = request_timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.pool = pool or HTTPConnectionPool(limit=len(self.endpoints), timeout=request_timeout)
+
+    async def _check(self, url):
+        """Return None if the endpoint is up, else why it is not"""
+        try:
+            status, _, _ = await asyncio.wait_for(self.pool.request("GET", url), self.request_timeout)
+        except Exception as e:
+            return f"{urlparse(url).path}: {type(e).__name__} {str(e)}".strip()
+        return None if status == 200 else f"{urlparse(url).path}: HTTP {status}"
+
+    async def wait(self):
+        """Probe until ready or out of time; returns a ReadinessResult"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        delay = self.initial_delay
+        attempts = 0
+        cold = False
+        while True:
+            attempts += 1
+            errors = [e for e in await asyncio.gather(*(self._check(url) for url in self.endpoints)) if e]
+            if not errors:
+                return ReadinessResult(True, time.monotonic() - started, cold, attempts)
+            cold = True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return ReadinessResult(False, time.monotonic() - started, cold, attempts, errors[0])
+            print(f"Target not ready ({errors[0]}), retrying in {delay:.1f}s")
+            await asyncio.sleep(min(delay * random.uniform(0.8, 1.2), remaining))
+            delay = min(delay * self.backoff, self.max_delay)
+
+    def run(self):
+        """Blocking wait for code outside an event loop"""
+        async def probe():
+            try:
+                return await self.wait()
+            finally:
+                await self.pool.close()
+        return asyncio.run(probe())
+
+
+def wait_until_ready(chatbot_url, **kwargs):
+    """
+    Block until the target is warm, before any browser is launched.
+
+    Records how long a cold target took to boot as "target_ready" in the
+    latency store, and prints it.
+
+    Raises:
+        Exception: If the target did not become ready in time
+    """
+    # Imported here so the HTTP client does not pull in Selenium
+    from ..support.targets import target_key
+    from ..support.timing_policy import get_policy
+
+    result = ReadinessProbe(chatbot_url, **kwargs).run()
+    if not result.ready:
+        raise Exception(f"Chatbot target not ready after {result.waited:.1f}s: {result.last_error}")
+    if result.cold:
+        print(f"Target warmed up after {result.waited:.1f}s ({result.attempts} probes)")
+        get_policy().store.record("target_ready", result.waited, target_key(chatbot_url))
+    else:
+        print(f"Target ready ({result.waited * 1000:.0f} ms)")
+    return result
@@ -0,0 +1,90 @@
+import os
+from urllib.parse import urlparse
+from .client.readiness import wait_until_ready
+from .stub.server import StubServer
+from .stub.cassette_proxy import CassetteProxy
+from .support.targets import is_ready, mark_ready, set_active_target
+
+LIVE_CHATBOT_URL = "https://flowiseai-her8.onrender.com/chatbot/769b8e19-17f3-4e89-80d7-73553211c085"
+
+
+class ChatbotTarget:
+    """
+    The chatbot the tests run against, chosen by the CHATBOT_URL variable.
+
+    CHATBOT_URL may be a chatbot page URL, or "stub" to start the bundled
+    local stub server. It defaults to the live Flowise deployment.
+
+    CHATBOT_CASSETTES=record or replay puts a CassetteProxy in front of the
+    target, with cassettes in CHATBOT_CASSETTE_DIR and replay speed from
+    CHATBOT_CASSETTE_TIMING (0 replays without delays).
+
+    Starting waits until the target's health and chatflow endpoints answer,
+    so a cold-starting host boots before any browser is launched. Set
+    CHATBOT_READY_CHECK=0 to skip the wait.
+    """
+
+    def __init__(self, target=None, cassettes=None, ready_check=None):
+        if ready_check is None:
+            ready_check = os.environ.get("CHATBOT_READY_CHECK", "1") not in ("", "0", "false")
+        self.target = target or os.environ.get("CHATBOT_URL", LIVE_CHATBOT_URL)
+        self.cassettes = cassettes or os.environ.get("CHATBOT_CASSETTES")
+        self.ready_check = ready_check
+        self.server = None
+        self.proxy = None
+        self.url = None
+        self.readiness = None
+        # Stable across runs, unlike the stub's and the proxy's ports
+        parsed = urlparse(self.target)
+        self.key = "stub" if self.is_stub else f"{parsed.scheme}://{parsed.netloc}"
+
+    @property
+    def is_stub(self):
+        return self.target == "stub"
+
+    @property
+    def known_ready(self):
+        """Whether this run already found the target ready; each new stub is checked"""
+        return not self.is_stub and is_ready(self.key)
+
+    def start(self):
+        # Rankings, latencies and load history learned on loopback URLs are
+        # filed under this target rather than an ephemeral port
+        set_active_target(self.key)
+        if self.is_stub:
+            self.server = StubServer().start()
+            self.url = self.server.chatbot_url()
+        else:
+            self.url = self.target
+        # A replay never reaches the target, and a remote target is probed
+        # once per run: by the parallel runner before its workers start, or
+        # by the first test module to start it
+        if self.ready_check and self.cassettes != "replay" and not self.known_ready:
+            self.readiness = wait_until_ready(self.url)
+            if not self.is_stub:
+                mark_ready(self.key)
+        if self.cassettes:
+            self.proxy = CassetteProxy(
+                self.url,
+                cassette_dir=os.environ.get("CHATBOT_CASSETTE_DIR", "cassettes"),
+                mode=self.cassettes,
+                timing=float(os.environ.get("CHATBOT_CASSETTE_TIMING", "1")),
+            ).start()
+            self.url = self.proxy.proxied_url(self.url)
+        return self
+
+    def stop(self):
+        set_active_target(None)
+        if self.proxy:
+            print(f"Cassette stats: {self.proxy.stats}")
+            self.proxy.stop()
+            self.proxy = None
+        if self.server:
+            self.server.stop()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,180 @@
+"""
+Drive many concurrent chatbot sessions and report throughput and latency.
+
+In browser mode each session fills in the lead form and runs a scripted
+multi-turn conversation through ChatbotPage, drawing its browser from a
+session pool. In api mode the same scenario runs through ChatbotClient over
+pooled HTTP connections, without a browser.
+
+    python -m tests.load --target stub --concurrency 4 --sessions 20
+    python -m tests.load --target stub --mode api --concurrency 200 --sessions 5000
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .config import ChatbotTarget
+from .client.chatbot_client import run_conversations
+from .pages.chatbot_page import ChatbotPage
+from .scenarios.loader import load_scenarios
+from .scenarios.scenario import SCENARIOS, CAPITAL_PROTECTION_BASICS
+from .support.artifacts import ArtifactCollector, flush_artifacts
+from .support.session_pool import SessionPool
+from .support.stats import summarize
+
+
+class LoadResults:
+    """Thread-safe collection of per-message measurements"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.send_to_visible = []
+        self.send_to_response = []
+        self.time_to_first_token = []
+        self.messages = 0
+        self.failures = []
+
+    def record(self, send_to_visible, send_to_response, time_to_first_token):
+        with self._lock:
+            self.messages += 1
+            if send_to_visible is not None:
+                self.send_to_visible.append(send_to_visible)
+            if time_to_first_token is not None:
+                self.time_to_first_token.append(time_to_first_token)
+                self.send_to_response.append(send_to_response)
+
+    def fail(self, session, turn, error):
+        with self._lock:
+            self.failures.append({"session": session, "turn": turn, "error": error})
+
+
+def run_session(pool, url, scenario, results, session, response_timeout=30):
+    """Run one conversation on a pooled browser"""
+    driver = None
+    turn = None
+    try:
+        driver = pool.acquire()
+        page = ChatbotPage(driver, artifacts=ArtifactCollector(driver, test_id=f"session-{session}"))
+        page.load(url)
+        page.fill_user_info(**scenario.lead)
+        for turn, message in enumerate(scenario.turns):
+            page.start_response_timing()
+            started = time.monotonic()
+            if not page.send_message(message):
+                results.fail(session, turn, "Message was not visible after sending")
+                continue
+            send_to_visible = time.monotonic() - started
+            timing = page.collect_response_timing(timeout=response_timeout, settle=0.5)
+            results.record(
+                send_to_visible,
+                timing.send_offset + (timing.time_to_complete or 0),
+                timing.time_to_first_token
+            )
+    except Exception as e:
+        results.fail(session, turn, str(e))
+    finally:
+        if driver is not None:
+            pool.release(driver)
+
+
+def run_load(url, scenario, concurrency, sessions, response_timeout=30):
+    """Run `sessions` browser conversations, `concurrency` at a time, and return a report"""
+    results = LoadResults()
+    with SessionPool(size=concurrency) as pool:
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {
+                executor.submit(run_session, pool, url, scenario, results, session, response_timeout): session
+                for session in range(sessions)
+            }
+        wall = time.monotonic() - started
+    # Anything run_session did not catch, such as a failed release
+    for future, session in futures.items():
+        try:
+            future.result()
+        except Exception as e:
+            results.fail(session, None, f"Session crashed: {str(e)}")
+    flush_artifacts()
+    return build_report(results, concurrency, sessions, wall)
+
+
+def run_api_load(url, scenario, concurrency, sessions):
+    """Run `sessions` HTTP conversations, `concurrency` at a time, and return a report"""
+    results = LoadResults()
+
+    def on_reply(reply):
+        results.record(None, reply.elapsed, reply.time_to_first_token)
+
+    started = time.monotonic()
+    failures, _ = asyncio.run(run_conversations(url, scenario, sessions, concurrency, on_reply))
+    wall = time.monotonic() - started
+    for failure in failures:
+        results.fail(failure["session"], failure["turn"], failure["error"])
+    return build_report(results, concurrency, sessions, wall)
+
+
+def build_report(results, concurrency, sessions, wall):
+    return {
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "messages": results.messages,
+        "failures": results.failures,
+        "wall": wall,
+        "messages_per_minute": results.messages / wall * 60 if wall else 0,
+        "send_to_visible": summarize(results.send_to_visible),
+        "send_to_response": summarize(results.send_to_response),
+        "time_to_first_token": summarize(results.time_to_first_token),
+    }
+
+
+def print_report(report):
+    print(f"\nSessions: {report['sessions']} ({report['concurrency']} concurrent)")
+    print(f"Messages: {report['messages']} in {report['wall']:.1f}s "
+          f"({report['messages_per_minute']:.1f} messages/min), {len(report['failures'])} failed")
+    print(f"\n{'latency (s)':<22}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}")
+    for name in ("send_to_visible", "send_to_response", "time_to_first_token"):
+        summary = report[name]
+        if not summary["count"]:
+            print(f"{name:<22}{'-':>8}{'-':>8}{'-':>8}{'-':>8}")
+            continue
+        print(f"{name:<22}{summary['p50']:>8.2f}{summary['p95']:>8.2f}"
+              f"{summary['p99']:>8.2f}{summary['max']:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target", help="Chatbot URL or 'stub' (defaults to CHATBOT_URL)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent sessions")
+    parser.add_argument("--sessions", type=int, default=8, help="Total sessions to run")
+    parser.add_argument("--mode", choices=("browser", "api"), default="browser",
+                        help="Drive sessions through Chrome or directly over HTTP")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default=CAPITAL_PROTECTION_BASICS.name,
+                        help="Built-in scenario to run")
+    parser.add_argument("--conversation",
+                        help="Scenario file (.txt with one message per line, .jsonl or .yaml) "
+                             "to run instead of --scenario; its first scenario is used")
+    parser.add_argument("--response-timeout", type=float, default=30,
+                        help="Seconds to wait for each bot reply")
+    parser.add_argument("--report", help="Write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    scenario = load_scenarios(args.conversation)[0] if args.conversation else SCENARIOS[args.scenario]
+    with ChatbotTarget(args.target) as target:
+        if args.mode == "api":
+            report = run_api_load(target.url, scenario, args.concurrency, args.sessions)
+        else:
+            report = run_load(
+                target.url, scenario, args.concurrency, args.sessions, args.response_timeout
+            )
+    print_report(report)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,64 +1,284 @@
+import collections
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
-import time
 from selenium.common.exceptions import TimeoutException
+from ..support.artifacts import ArtifactCollector
+from ..support.handles import HandleCache
+from ..support.debug import DebugSnapshots
+from ..support.locators import LocatorStrategies, locator_key
+from ..support.load_timing import start_load_timing, collect_load_timing
+from ..support.scripts import INNERMOST_JS, page_log_js
+from ..support.session_snapshot import SessionSnapshot
+from ..support.timing_policy import get_policy
+from ..support.transcript import TranscriptTracker
+from ..support import response_timing
+from ..support.waits import (
+    ShadowWait,
+    SHADOW_ROOT_RENDERED,
+    CHAT_OR_LEAD_FORM,
+    CHAT_INPUT_PRESENT,
+    CHAT_VIEW_CONTAINS,
+    USER_BUBBLE_ADDED,
+    INPUT_VALUE_CONTAINS,
+)
+
+# Sends a message in a single round trip: locate the input, set its value
+# with input events, click send and resolve once the user bubble renders.
+BATCHED_SEND_SCRIPT = """
+    const done = arguments[arguments.length - 1];
+    const hostSelector = arguments[0];
+    const message = arguments[1];
+    const timeoutMs = arguments[2];
+    const started = performance.now();
+    const timings = {};
+    let mark = started;
+    function phase(name) {
+        const now = performance.now();
+        timings[name] = now - mark;
+        mark = now;
+    }
+    function finish(result) {
+        timings.total = performance.now() - started;
+        result.timings = timings;
+        done(result);
+    }
+    function occurrences(text) {
+        return text.split(message).length - 1;
+    }
+
+    const host = document.querySelector(hostSelector);
+    const root = host && host.shadowRoot;
+    if (!root) return finish({ ok: false, error: 'No chatbot or shadow root found' });
+    const chatView = root.querySelector('.chatbot-chat-view');
+    const input = root.querySelector('textarea.text-input')
+        || root.querySelector('textarea')
+        || root.querySelector("[contenteditable='true'], [role='textbox']");
+    if (!chatView || !input) return finish({ ok: false, error: 'Chat input not found' });
+    phase('locate');
+
+    if (input.isContentEditable) {
+        input.textContent = message;
+    } else {
+        const proto = Object.getPrototypeOf(input);
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(input, message);
+    }
+    input.dispatchEvent(new InputEvent('input', { bubbles: true, composed: true, data: message }));
+    input.dispatchEvent(new Event('change', { bubbles: true, composed: true }));
+    phase('fill');
+
+    const before = occurrences(chatView.textContent);
+    const buttons = Array.from(root.querySelectorAll('button'));
+    const sendButton = buttons.find(btn => btn.querySelector('svg.send-icon') && !btn.disabled)
+        || buttons.find(btn => !btn.disabled && btn.offsetParent !== null);
+    if (!sendButton) return finish({ ok: false, error: 'Send button not found' });
+    sendButton.click();
+    phase('click');
+
+    const observer = new MutationObserver(check);
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        finish({ ok: false, error: 'Message did not appear in the chat view' });
+    }, timeoutMs);
+    function check() {
+        if (occurrences(chatView.textContent) <= before) return false;
+        observer.disconnect();
+        clearTimeout(timer);
+        phase('confirm');
+        finish({ ok: true });
+        return true;
+    }
+    if (!check()) {
+        observer.observe(chatView, { childList: true, subtree: true, characterData: true });
+    }
+"""
+
+# Selectors for the chat input, most specific to Flowise first
+CHAT_INPUT_SELECTORS = [
+    "textarea.text-input",
+    "textarea[class*='text-input']",
+    "textarea",
+    "[role='textbox']",
+    "div[contenteditable='true']",
+    "[contenteditable='true']",
+    "input[type='text']",
+    ".chat-input",
+    "#chat-input",
+    "div.message-input",
+    "div.chat-textarea",
+    "[aria-label*='chat' i]",
+    "[aria-label*='message' i]",
+    "[placeholder*='message' i]",
+    "[placeholder*='type' i]",
+]
+
+# Selectors for the send button; matches resolve to their enclosing button
+SEND_BUTTON_SELECTORS = [
+    "svg.send-icon",
+    "button",
+]
+
+# Bubble selectors for each role inside .chatbot-chat-view
+USER_BUBBLE_SELECTORS = [
+    ".chatbot-guest-bubble",
+    "[class*='user-bubble']",
+    "[class*='user-message']",
+    "div.flex.flex-row.justify-end",
+    "div[class*='flex'][class*='justify-end']",
+]
+BOT_BUBBLE_SELECTORS = [
+    ".chatbot-host-bubble",
+    "[class*='host-bubble']",
+    "[class*='bot-message']",
+    "div.flex.flex-row.justify-start",
+    "div[class*='flex'][class*='justify-start']",
+]
+
+# Matches message text in the browser and returns every matching bubble
+# (innermost match only) with its role and index in a single round trip.
+# Each role uses the first of its ranked selectors that matches anything.
+FIND_MESSAGES_SCRIPT = INNERMOST_JS + """
+    const hostSelector = arguments[0];
+    const text = arguments[1];
+    const role = arguments[2];
+    const since = arguments[3];
+
+    const host = document.querySelector(hostSelector);
+    const root = host && host.shadowRoot;
+    const chatView = root && root.querySelector('.chatbot-chat-view');
+    if (!chatView) return { error: 'Chat view not found' };
+
+    const pick = selectors => selectors.find(s => chatView.querySelector(s)) || null;
+    const userSelector = pick(arguments[4]);
+    const botSelector = pick(arguments[5]);
+    const selector = [userSelector, botSelector].filter(Boolean).join(',');
+    const bubbles = selector ? innermost(Array.from(chatView.querySelectorAll(selector))) : [];
+    const matches = [];
+    for (let index = since; index < bubbles.length; index++) {
+        const bubble = bubbles[index];
+        const bubbleRole = userSelector && bubble.matches(userSelector) ? 'user' : 'bot';
+        const bubbleText = bubble.innerText || bubble.textContent || '';
+        if (role && bubbleRole !== role) continue;
+        if (text && !bubbleText.includes(text)) continue;
+        matches.push({ index: index, role: bubbleRole, text: bubbleText });
+    }
+    // Text outside any recognised bubble still counts, without a role
+    if (!matches.length && text && since === 0 && !role
+            && (chatView.innerText || chatView.textContent || '').includes(text)) {
+        matches.push({ index: -1, role: null, text: text });
+    }
+    return {
+        matches: matches,
+        count: bubbles.length,
+        selectors: { user: userSelector, bot: botSelector }
+    };
+"""
 
 class ChatbotPage:
     # Locators
     SHADOW_HOST = "flowise-fullchatbot"
     
-    def __init__(self, driver):
+    def __init__(self, driver, debug=None, batched=False, artifacts=None, log_level=None, timing=None):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+        self.batched = batched
+        self.last_send_result = None
+        self.load_timing = None  # LoadTiming of the last load(measure=True)
+        self.message_cursor = 0  # Bubble count at the last message search
+        self.last_send_mark = None  # Transcript position just before the last send
+        self.retries = collections.Counter()
+        self.locators = LocatorStrategies()
+        self.instrumentation = None
+        # Timeouts and poll intervals adapt to each operation's observed latency
+        self.timing = timing or get_policy()
+        self.waits = ShadowWait(driver, self.SHADOW_HOST, timeout=10, policy=self.timing)
+        self.handles = HandleCache(driver, self.SHADOW_HOST)
+        self.debug = DebugSnapshots(driver, enabled=debug)
+        self.artifacts = artifacts or ArtifactCollector(driver, shadow_host=self.SHADOW_HOST)
+        self.transcript = TranscriptTracker(self, USER_BUBBLE_SELECTORS, BOT_BUBBLE_SELECTORS)
+        # In-page logging for the injected scripts, CHATBOT_PAGE_LOG_LEVEL or warn
+        self.log_js = page_log_js(log_level)
+    
+    def _retry(self, operation):
+        """Count a retry of operation so flakiness shows up in reports"""
+        self.retries[operation] += 1
+        self.timing.record_retry(operation)
+        if self.instrumentation:
+            self.instrumentation.count_retry()
     
-    def load(self, url):
-        """Load the chatbot page"""
-        self.driver.get(url)
-        time.sleep(5)  # Wait for page to load
+    def load(self, url, session=None, measure=False):
+        """
+        Load the chatbot page and wait for the widget to render.
+        
+        Args:
+            url (str): The chatbot URL
+            session (SessionSnapshot): Saved session to restore while loading
+            measure (bool): Record navigation, paint, resource and widget
+                            boot timing in self.load_timing
+        """
+        script_id = start_load_timing(self.driver, self.SHADOW_HOST) if measure else None
+        if session:
+            session.open(self.driver, url)
+        else:
+            self.driver.get(url)
+        self.locators.set_key(locator_key(url))
+        self.handles.invalidate()
+        self.waits.until(SHADOW_ROOT_RENDERED, message="Chatbot widget did not render", operation="widget_render")
+        if measure:
+            self.load_timing = collect_load_timing(self.driver, script_id)
         return self
     
+    def start_chat(self, url, lead, snapshots=None, full_form=False):
+        """
+        Load the chatbot ready to chat, skipping the lead form when a saved session exists.
+        
+        Args:
+            url (str): The chatbot URL
+            lead (dict): name, email and phone for the lead form
+            snapshots (SessionSnapshotStore): Saved sessions to restore from and save to
+            full_form (bool): Always go through the lead form
+        
+        Returns:
+            bool: True if a saved session was restored instead of filling the form
+        """
+        snapshot = None if full_form or snapshots is None else snapshots.get(url)
+        self.load(url, session=snapshot)
+        if snapshot:
+            if self.waits.until_or_none(CHAT_OR_LEAD_FORM, operation="chat_or_lead_form") == 'chat':
+                print("Restored saved session, skipping the lead form")
+                snapshots.stats["restored"] += 1
+                return True
+            print("Saved session did not skip the lead form, filling it in")
+            snapshots.discard(url)
+        
+        if self.fill_user_info(**lead) and snapshots is not None:
+            if self.waits.until_or_none(CHAT_INPUT_PRESENT, operation="chat_input"):
+                snapshots.put(SessionSnapshot.capture(self.driver, url))
+        return False
+    
     def get_shadow_root(self):
         """Get the shadow root element with debugging"""
         try:
             print("Attempting to find shadow host...")
-            # First, let's see what elements are on the page
-            all_elements = self.driver.execute_script("""
-                return Array.from(document.querySelectorAll('*')).map(el => ({
-                    tagName: el.tagName,
-                    id: el.id,
-                    className: el.className,
-                    attributes: Array.from(el.attributes).map(attr => `${attr.name}=${attr.value}`)
-                }));
-            """)
-            print("All elements on page:", all_elements)
-            
-            # Try to find the shadow host
-            shadow_host = self.wait.until(
-                EC.presence_of_element_located((By.TAG_NAME, self.SHADOW_HOST))
-            )
-            print(f"Found shadow host: {shadow_host.get_attribute('outerHTML')}")
-            
-            # Try to get the shadow root
-            shadow_root = self.driver.execute_script("""
-                const host = arguments[0];
-                console.log('Host element:', host);
-                const root = host.shadowRoot;
-                console.log('Shadow root:', root);
-                if (!root) {
-                    console.log('No shadow root found');
-                    return null;
-                }
-                // Log shadow root content
-                console.log('Shadow root HTML:', root.innerHTML);
-                return root;
-            """, shadow_host)
+            # Snapshot what elements are on the page (debug mode only)
+            self.debug.capture_page_elements()
+            
+            # Reuse the cached shadow root while it is still valid
+            shadow_root = self.handles.get("shadow_root")
+            if not shadow_root:
+                # The widget may still be booting, wait for the host and resolve again
+                timeout = self.timing.timeout("shadow_host", 10)
+                with self.timing.measure("shadow_host", timeout):
+                    shadow_host = WebDriverWait(
+                        self.driver, timeout, poll_frequency=self.timing.poll_interval("shadow_host", 0.5)
+                    ).until(EC.presence_of_element_located((By.TAG_NAME, self.SHADOW_HOST)))
+                self.debug.capture("shadow_host", lambda: shadow_host.get_attribute('outerHTML'))
+                shadow_root = self.handles.get("shadow_root")
             
             if not shadow_root:
                 print("No shadow root found!")
-                self.driver.save_screenshot("no_shadow_root.png")
+                self.artifacts.capture("no_shadow_root")
                 raise Exception("Could not access shadow root")
             
             print("Successfully accessed shadow root")
@@ -66,8 +286,7 @@ class ChatbotPage:
             
         except Exception as e:
             print(f"Error in get_shadow_root: {str(e)}")
-            print("Page source:", self.driver.page_source)
-            self.driver.save_screenshot("shadow_root_error.png")
+            self.artifacts.capture("shadow_root_error")
             raise
     
     def fill_user_info(self, name, email, phone):
@@ -75,19 +294,15 @@ class ChatbotPage:
         try:
             print("\n=== Starting form fill process ===")
             
-            # Get shadow root using JavaScript
+            # Get shadow root from the handle cache
             print("Getting shadow root...")
-            script = """
-                const chatbot = document.querySelector('flowise-fullchatbot');
-                if (!chatbot) return null;
-                return chatbot.shadowRoot;
-            """
-            shadow_root = self.driver.execute_script(script)
+            self.handles.revalidate()
+            shadow_root = self.handles.get("shadow_root")
             if not shadow_root:
                 raise Exception("Could not find shadow root")
             
             # Find and fill form fields using JavaScript
-            fill_script = """
+            fill_script = self.log_js + """
                 const name = arguments[0];
                 const email = arguments[1];
                 const phone = arguments[2];
@@ -96,11 +311,9 @@ class ChatbotPage:
                 if (!chatbot || !chatbot.shadowRoot) return { error: 'No chatbot or shadow root found' };
                 
                 const shadowRoot = chatbot.shadowRoot;
-                console.log('Shadow root found:', shadowRoot);
                 
                 // Debug: Log all input elements
-                const allInputs = shadowRoot.querySelectorAll('input');
-                console.log('All inputs:', Array.from(allInputs).map(i => ({
+                log('debug', 'All inputs:', () => Array.from(shadowRoot.querySelectorAll('input')).map(i => ({
                     type: i.type,
                     placeholder: i.placeholder,
                     value: i.value
@@ -111,11 +324,11 @@ class ChatbotPage:
                 const emailInput = shadowRoot.querySelector('input[placeholder*="email" i]');
                 const phoneInput = shadowRoot.querySelector('input[placeholder*="phone" i]');
                 
-                console.log('Found inputs:', {
+                log('debug', 'Found inputs:', () => ({
                     name: nameInput?.placeholder,
                     email: emailInput?.placeholder,
                     phone: phoneInput?.placeholder
-                });
+                }));
                 
                 if (nameInput) {
                     nameInput.value = name;
@@ -150,17 +363,17 @@ class ChatbotPage:
             
             if isinstance(result, dict) and 'error' in result:
                 print(f"Error from JavaScript: {result['error']}")
-                self.driver.save_screenshot("shadow_root_error.png")
+                self.artifacts.capture("shadow_root_error")
                 return False
             
             if not all([result.get('nameFilled'), result.get('emailFilled'), result.get('phoneFilled')]):
                 print("Warning: Not all fields were filled successfully")
-                self.driver.save_screenshot("form_fill_warning.png")
+                self.artifacts.capture("form_fill_warning")
                 return False
             
             if not result.get('submitFound'):
                 print("Warning: Submit button not found")
-                self.driver.save_screenshot("submit_button_not_found.png")
+                self.artifacts.capture("submit_button_not_found")
                 return False
             
             print("Form submitted successfully")
@@ -168,30 +381,32 @@ class ChatbotPage:
             
         except Exception as e:
             print(f"Error in fill_user_info: {str(e)}")
-            print("Page source:", self.driver.page_source)
-            self.driver.save_screenshot("form_fill_error.png")
+            self.artifacts.capture("form_fill_error")
             raise
     
     def wait_for_chat_input(self):
         """Wait for and return the chat input element"""
         try:
-            # Wait a moment for the form submission to complete and chat interface to load
-            time.sleep(2)
+            # Reuse the input found by an earlier call
+            cached_input = self.handles.peek("chat_input")
+            if cached_input is not None:
+                return cached_input
+            
+            # Wait for the form submission to complete and chat interface to load
+            self.waits.until_or_none(CHAT_INPUT_PRESENT, operation="chat_input")
             
             # Find elements directly using JavaScript
-            script = """
+            script = self.log_js + """
                 const chatbot = document.querySelector('flowise-fullchatbot');
                 if (!chatbot || !chatbot.shadowRoot) {
-                    console.log('No chatbot or shadow root found');
+                    log('warn', 'No chatbot or shadow root found');
                     return { error: 'No chatbot or shadow root found' };
                 }
                 
                 const shadowRoot = chatbot.shadowRoot;
-                console.log('Shadow root found');
                 
                 // Debug: Log all elements in shadow root
-                const allElements = Array.from(shadowRoot.querySelectorAll('*'));
-                console.log('All elements:', allElements.map(el => ({
+                log('debug', 'All elements:', () => Array.from(shadowRoot.querySelectorAll('*')).map(el => ({
                     tagName: el.tagName,
                     role: el.getAttribute('role'),
                     className: el.className,
@@ -201,28 +416,14 @@ class ChatbotPage:
                     html: el.outerHTML
                 })));
                 
-                // Try different selectors
-                const selectors = [
-                    "[role='textbox']",
-                    "div[contenteditable='true']",
-                    "textarea",
-                    "input[type='text']",
-                    ".chat-input",
-                    "#chat-input",
-                    // Add more specific selectors based on the actual structure
-                    "div.message-input",
-                    "div.chat-textarea",
-                    "[aria-label*='chat' i]",
-                    "[aria-label*='message' i]",
-                    "[placeholder*='message' i]",
-                    "[placeholder*='type' i]"
-                ];
+                // Try the selectors, best ranked first
+                const selectors = arguments[0];
                 
                 for (const selector of selectors) {
-                    console.log('Trying selector:', selector);
+                    log('debug', 'Trying selector:', selector);
                     const element = shadowRoot.querySelector(selector);
                     if (element) {
-                        console.log('Found element:', element.outerHTML);
+                        log('debug', 'Found element:', () => element.outerHTML);
                         return {
                             found: true,
                             element: element,
@@ -232,7 +433,7 @@ class ChatbotPage:
                 }
                 
                 // If no element found with specific selectors, try finding any input-like element
-                const potentialInputs = allElements.filter(el => {
+                const potentialInputs = Array.from(shadowRoot.querySelectorAll('*')).filter(el => {
                     const tag = el.tagName.toLowerCase();
                     const isEditable = el.contentEditable === 'true';
                     const isTextInput = tag === 'input' && el.type === 'text';
@@ -242,7 +443,7 @@ class ChatbotPage:
                 });
                 
                 if (potentialInputs.length > 0) {
-                    console.log('Found potential input:', potentialInputs[0].outerHTML);
+                    log('info', 'Found potential input:', () => potentialInputs[0].outerHTML);
                     return {
                         found: true,
                         element: potentialInputs[0],
@@ -253,7 +454,8 @@ class ChatbotPage:
                 return { error: 'No chat input found' };
             """
             
-            result = self.driver.execute_script(script)
+            selectors = self.locators.ranked("chat_input", CHAT_INPUT_SELECTORS)
+            result = self.driver.execute_script(script, selectors)
             
             if isinstance(result, dict):
                 if 'error' in result:
@@ -261,47 +463,42 @@ class ChatbotPage:
                     raise Exception(result['error'])
                 elif result.get('found'):
                     print(f"Found chat input with selector: {result['selector']}")
+                    self.locators.succeeded("chat_input", result['selector'], selectors)
+                    self.handles.put("chat_input", result['element'])
                     return result['element']
             
             raise Exception("Could not find chat input with any known selector")
             
         except Exception as e:
             print(f"Error finding chat input: {str(e)}")
-            self.driver.save_screenshot("chat_input_error.png")
+            self.artifacts.capture("chat_input_error")
             raise
     
     def analyze_chat_interface(self):
         """Analyze the structure of the chat interface for debugging."""
         print("\n=== Analyzing Chat Interface Structure ===")
         try:
-            shadow_root = self.get_shadow_root()
-            if not shadow_root:
+            # One round trip instead of five WebDriver calls per element, and
+            # only the element list: the page HTML is for failure artifacts
+            snapshot = self.artifacts.elements()
+            if not snapshot.get('found'):
                 print("No shadow root found")
                 return
             
-            # Get all elements in the shadow root
-            elements = shadow_root.find_elements(By.CSS_SELECTOR, "*")
+            elements = snapshot['elements']
             print(f"\nFound {len(elements)} elements in shadow root:")
-            
             for element in elements:
-                try:
-                    tag_name = element.tag_name
-                    text = element.text
-                    classes = element.get_attribute("class")
-                    id_attr = element.get_attribute("id")
-                    role = element.get_attribute("role")
-                    
-                    print(f"\nElement: {tag_name}")
-                    if id_attr:
-                        print(f"ID: {id_attr}")
-                    if classes:
-                        print(f"Classes: {classes}")
-                    if role:
-                        print(f"Role: {role}")
-                    if text:
-                        print(f"Text: {text}")
-                except:
-                    continue
+                print(f"\nElement: {element['tag']}")
+                if element['id']:
+                    print(f"ID: {element['id']}")
+                if element['classes']:
+                    print(f"Classes: {element['classes']}")
+                if element['role']:
+                    print(f"Role: {element['role']}")
+                if element['text']:
+                    print(f"Text: {element['text']}")
+            if snapshot.get('truncated'):
+                print("(snapshot truncated)")
                     
         except Exception as e:
             print(f"Error analyzing chat interface: {str(e)}")
@@ -311,23 +508,122 @@ class ChatbotPage:
         print("\nWaiting for chat interface to load...")
         try:
             shadow_root = self.get_shadow_root()
-            WebDriverWait(self.driver, 10).until(
-                lambda x: shadow_root and shadow_root.find_elements(By.CSS_SELECTOR, ".chat-container")
-            )
+            timeout = self.timing.timeout("chat_interface", 10)
+            with self.timing.measure("chat_interface", timeout):
+                WebDriverWait(
+                    self.driver, timeout, poll_frequency=self.timing.poll_interval("chat_interface", 0.5)
+                ).until(
+                    lambda x: shadow_root and shadow_root.find_elements(By.CSS_SELECTOR, ".chat-container")
+                )
             print("Chat interface loaded successfully")
         except TimeoutException:
             print("Warning: Timeout waiting for chat interface")
         except Exception as e:
             print(f"Error waiting for chat interface: {str(e)}")
 
+    def _send_button(self):
+        """Return the send button, locating it only when it is not cached"""
+        send_button = self.handles.get("send_button")
+        if send_button:
+            return send_button
+        selectors = self.locators.ranked("send_button", SEND_BUTTON_SELECTORS)
+        result = self.driver.execute_script(self.log_js + """
+            const shadowHost = document.querySelector('flowise-fullchatbot');
+            if (!shadowHost || !shadowHost.shadowRoot) {
+                log('warn', 'No shadow host or root found');
+                return null;
+            }
+            
+            const root = shadowHost.shadowRoot;
+            
+            // Check if button is visible and enabled
+            const usable = btn => {
+                const style = window.getComputedStyle(btn);
+                return style.display !== 'none' && 
+                       style.visibility !== 'hidden' && 
+                       style.opacity !== '0' &&
+                       !btn.disabled;
+            };
+            
+            // Try the selectors, best ranked first; matches inside a button
+            // (such as the send icon SVG) resolve to that button
+            for (const selector of arguments[0]) {
+                const buttons = Array.from(root.querySelectorAll(selector))
+                    .map(el => el.closest('button'))
+                    .filter(btn => btn && usable(btn));
+                if (buttons.length) {
+                    log('debug', 'Found send button with selector:', selector);
+                    return { element: buttons[0], selector: selector };
+                }
+            }
+            
+            log('warn', 'No suitable button found');
+            return null;
+        """, selectors)
+        if not result:
+            return None
+        self.locators.succeeded("send_button", result['selector'], selectors)
+        send_button = result['element']
+        self.handles.put("send_button", send_button)
+        return send_button
+    
+    def _click_send_button(self, send_button):
+        """Click the send button with a native and a dispatched click"""
+        self.driver.execute_script("""
+            const button = arguments[0];
+            // First try standard click
+            button.click();
+            // Then try dispatching click event
+            button.dispatchEvent(new MouseEvent('click', {
+                bubbles: true,
+                cancelable: true,
+                view: window
+            }));
+        """, send_button)
+    
+    def send_message_batched(self, message, timeout=10):
+        """
+        Send a message with a single execute_async_script call.
+        
+        Args:
+            message (str): The message to send
+            timeout (float): Seconds to wait for the user bubble to appear
+            
+        Returns:
+            dict: ok, error (on failure) and per-phase timings in milliseconds
+                  (locate, fill, click, confirm, total)
+        """
+        timeout = self.timing.timeout("batched_send", timeout)
+        self.waits.ensure_script_timeout(timeout)
+        result = self.driver.execute_async_script(
+            BATCHED_SEND_SCRIPT, self.SHADOW_HOST, message, int(timeout * 1000)
+        )
+        if result and result.get('ok'):
+            self.timing.record("batched_send", result['timings']['total'] / 1000.0)
+        elif result and result.get('error') == 'Message did not appear in the chat view':
+            self.timing.record("batched_send", timeout, timed_out=True)
+        self.last_send_result = result
+        print(f"Batched send result: {result}")
+        return result
+    
     def send_message(self, message):
         """Send a message in the chat interface."""
+        if self.batched:
+            result = self.send_message_batched(message)
+            if not result.get('ok'):
+                self.artifacts.capture("send_message_error")
+            return bool(result.get('ok'))
+        
         print(f"\n=== Starting message send process ===")
         print(f"Attempting to send message: {message}")
         
         try:
-            # Wait longer for initial chat interface load
-            time.sleep(3)
+            # Drop cached handles if the page navigated since they were resolved
+            self.handles.revalidate()
+            
+            # Wait for the chat interface to be ready for input
+            if self.handles.peek("chat_input") is None:
+                self.waits.until_or_none(CHAT_INPUT_PRESENT, operation="chat_input")
             
             shadow_root = self.get_shadow_root()
             if not shadow_root:
@@ -336,46 +632,43 @@ class ChatbotPage:
             # Find and fill the message input with retry logic
             max_attempts = 3
             for attempt in range(max_attempts):
+                if attempt:
+                    self._retry("send_message")
                 try:
-                    # Try different selectors for the input field
-                    selectors = [
-                        "textarea.text-input",  # More specific for Flowise
-                        "textarea[class*='text-input']",
-                        "textarea",
-                        "input[type='text']",
-                        "[contenteditable='true']",
-                        "[role='textbox']"
-                    ]
+                    # Try the input selectors, best ranked first
+                    selectors = self.locators.ranked("chat_input", CHAT_INPUT_SELECTORS)
+                    used_selector = None
                     
-                    message_input = None
-                    for selector in selectors:
-                        try:
-                            elements = shadow_root.find_elements(By.CSS_SELECTOR, selector)
-                            for element in elements:
-                                if element.is_displayed():
-                                    message_input = element
-                                    print(f"Found input field with selector: {selector}")
+                    # Reuse the cached input, walking the selectors only on a miss
+                    message_input = self.handles.peek("chat_input")
+                    if message_input is None:
+                        for selector in selectors:
+                            try:
+                                elements = shadow_root.find_elements(By.CSS_SELECTOR, selector)
+                                for element in elements:
+                                    if element.is_displayed():
+                                        message_input = element
+                                        used_selector = selector
+                                        print(f"Found input field with selector: {selector}")
+                                        break
+                                if message_input:
                                     break
-                            if message_input:
-                                break
-                        except:
-                            continue
+                            except:
+                                continue
                     
                     if not message_input:
                         raise Exception("Message input not found")
+                    self.handles.put("chat_input", message_input)
+                    self.locators.succeeded("chat_input", used_selector, selectors)
                     
                     # Clear and fill the input
                     message_input.clear()
                     message_input.send_keys(message)
-                    time.sleep(0.5)  # Wait for input to register
                     
                     # Verify the message was entered correctly
-                    input_value = self.driver.execute_script("""
-                        const el = arguments[0];
-                        return el.value || el.textContent;
-                    """, message_input)
-                    
-                    if message not in input_value:
+                    if not self.waits.until_or_none(
+                        INPUT_VALUE_CONTAINS, timeout=2, args=[message_input, message], operation="input_value"
+                    ):
                         raise Exception("Message not entered correctly")
                     
                     break
@@ -383,108 +676,75 @@ class ChatbotPage:
                     if attempt == max_attempts - 1:
                         raise
                     print(f"Attempt {attempt + 1} failed: {str(e)}")
-                    time.sleep(1)
+                    if used_selector:
+                        self.locators.failed("chat_input", used_selector, selectors)
+                    self.handles.invalidate("chat_input")
+                    self.waits.until_or_none(CHAT_INPUT_PRESENT, timeout=1, operation="chat_input")
             
-            # Find and click the send button using JavaScript
+            # Find and click the send button, reusing the cached handle
             print("Looking for send button...")
-            send_button = self.driver.execute_script("""
-                const shadowHost = document.querySelector('flowise-fullchatbot');
-                if (!shadowHost || !shadowHost.shadowRoot) {
-                    console.log('No shadow host or root found');
-                    return null;
-                }
-                
-                const root = shadowHost.shadowRoot;
-                
-                // Find the button with the send icon
-                const buttons = Array.from(root.querySelectorAll('button'));
-                const sendButton = buttons.find(btn => {
-                    // Check if button contains an SVG with send-icon class
-                    const svg = btn.querySelector('svg.send-icon');
-                    if (!svg) return false;
-                    
-                    // Check if button is visible and enabled
-                    const style = window.getComputedStyle(btn);
-                    if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0') {
-                        return false;
-                    }
-                    if (btn.disabled) return false;
-                    
-                    return true;
-                });
-                
-                if (sendButton) {
-                    console.log('Found send button with SVG');
-                    return sendButton;
-                }
-                
-                // If not found, try finding any visible button
-                const visibleButton = buttons.find(btn => {
-                    const style = window.getComputedStyle(btn);
-                    return style.display !== 'none' && 
-                           style.visibility !== 'hidden' && 
-                           style.opacity !== '0' &&
-                           !btn.disabled;
-                });
-                
-                if (visibleButton) {
-                    console.log('Found visible button as fallback');
-                    return visibleButton;
-                }
-                
-                console.log('No suitable button found');
-                return null;
-            """)
-            
-            if not send_button:
+            if not self._send_button():
                 print("\nAnalyzing shadow root structure for debugging:")
                 self.analyze_chat_interface()
                 raise Exception("Send button not found with any selector")
             
+            # Catch up on the transcript so only bubbles from this send are checked
+            self.last_send_mark = None
+            try:
+                self.transcript.update()
+                self.last_send_mark = self.transcript.mark()
+            except Exception as e:
+                print(f"Could not update transcript: {str(e)}")
+            
             # Click the button using JavaScript for better reliability
             print("Clicking send button...")
-            self.driver.execute_script("""
-                const button = arguments[0];
-                // First try standard click
-                button.click();
-                // Then try dispatching click event
-                button.dispatchEvent(new MouseEvent('click', {
-                    bubbles: true,
-                    cancelable: true,
-                    view: window
-                }));
-            """, send_button)
-            time.sleep(1)  # Wait after click
+            self.handles.retry_stale(lambda: self._click_send_button(self._send_button()))
             
-            # Verify message was sent
+            # Wait for the message to show up in the chat view
             print("Message sent, waiting for it to appear...")
-            time.sleep(2)  # Initial wait for message processing
+            # Only a user bubble added after the transcript update above counts
+            self.waits.until_or_none(USER_BUBBLE_ADDED, timeout=5, args=[message], operation="message_render")
             
             # Verify message was sent
-            if not self.get_sent_message(message):
-                print("Message not immediately visible, performing extended check...")
-                time.sleep(2)  # Additional wait
-                if not self.get_sent_message(message):
-                    print("Warning: Message may not have been sent successfully")
-                    return False
+            if not self.get_sent_message(message, since=self.last_send_mark):
+                print("Warning: Message may not have been sent successfully")
+                return False
             
             print("Message sent and verified successfully")
             return True
             
         except Exception as e:
             print(f"Error sending message: {str(e)}")
-            self.driver.save_screenshot("send_message_error.png")
+            self.artifacts.capture("send_message_error")
             return False
     
-    def get_sent_message(self, message_text):
-        """Get the sent message element with retry logic"""
+    def get_sent_message(self, message_text, since=None):
+        """
+        Get the sent message element with retry logic.
+        
+        Only user bubbles count, so a bot reply echoing the text cannot
+        verify a send that never appeared.
+        
+        Args:
+            message_text (str): The message that was sent
+            since (int): Transcript mark taken before sending; only bubbles
+                         added after it are checked, fetched incrementally
+        """
         print(f"\nLooking for sent message: {message_text}")
         
         max_attempts = 5
         for attempt in range(max_attempts):
+            if attempt:
+                self._retry("get_sent_message")
             try:
-                # First try exact message match
-                if self.is_message_visible(message_text):
+                if since is not None:
+                    # Only the bubbles added since the send, not the whole chat
+                    self.transcript.update()
+                    if self.transcript.find(message_text, role="user", since=since):
+                        print(f"Found message on attempt {attempt + 1}")
+                        return True
+                # Otherwise search the user bubbles across the chat
+                elif self.find_messages(message_text, role="user")['matches']:
                     print(f"Found message on attempt {attempt + 1}")
                     return True
                 
@@ -492,111 +752,149 @@ class ChatbotPage:
                 if attempt % 2 == 0:  # Analyze every other attempt
                     self.analyze_chat_interface()
                 
-                # Wait before next attempt
+                # Wait for the chat view to change before next attempt
                 if attempt < max_attempts - 1:
-                    time.sleep(1)
+                    self.waits.until_or_none(
+                        USER_BUBBLE_ADDED, timeout=1, args=[message_text], operation="message_render"
+                    )
                     
             except Exception as e:
                 print(f"Error on attempt {attempt + 1}: {str(e)}")
                 if attempt == max_attempts - 1:
                     print("All attempts to find message failed")
-                    self.driver.save_screenshot("find_message_error.png")
+                    self.artifacts.capture("find_message_error")
                     return False
-                time.sleep(1)
+                self.waits.until_or_none(
+                    USER_BUBBLE_ADDED, timeout=1, args=[message_text], operation="message_render"
+                )
         
         print("Message not found after all attempts")
         return False
     
     def get_chatbot_response(self):
-        """Get the chatbot's response element"""
+        """Get the chatbot's latest response element"""
         try:
+            # The newest bot bubble from the transcript, not the first message
+            self.transcript.update()
+            response = self.transcript.last_bot_element()
+            if response:
+                return response
             shadow_root = self.get_shadow_root()
             return shadow_root.find_element(By.CSS_SELECTOR, ".message")
         except Exception as e:
             print(f"Error finding chatbot response: {str(e)}")
-            self.driver.save_screenshot("response_error.png")
+            self.artifacts.capture("response_error")
             raise
     
     def is_chat_input_visible(self):
         """Check if chat input is visible"""
         try:
-            return self.wait_for_chat_input().is_displayed()
+            return self.handles.retry_stale(lambda: self.wait_for_chat_input().is_displayed())
         except:
             return False
     
-    def is_message_visible(self, message_text):
+    def find_messages(self, text=None, role=None, since=0):
+        """
+        Search the chat bubbles for text inside the browser in one script call.
+        
+        Args:
+            text (str): Text the bubble must contain, or None for any bubble
+            role (str): 'user' or 'bot' to only match that side of the chat
+            since (int): Index of the first bubble to look at
+            
+        Returns:
+            dict: 'matches', a list of {index, role, text}, and 'count', the
+                  number of bubbles in the chat view
+        """
+        user_selectors = self.locators.ranked("user_bubble", USER_BUBBLE_SELECTORS)
+        bot_selectors = self.locators.ranked("bot_bubble", BOT_BUBBLE_SELECTORS)
+        result = self.driver.execute_script(
+            FIND_MESSAGES_SCRIPT, self.SHADOW_HOST, text, role, since,
+            user_selectors, bot_selectors
+        )
+        if not result or 'error' in result:
+            raise Exception((result or {}).get('error', 'Message search failed'))
+        self.locators.succeeded("user_bubble", result['selectors']['user'], user_selectors)
+        self.locators.succeeded("bot_bubble", result['selectors']['bot'], bot_selectors)
+        self.message_cursor = result['count']
+        return result
+    
+    def is_message_visible(self, message_text, incremental=False):
         """
         Check if a specific message is visible in the chat interface.
         
         Args:
             message_text (str): The text of the message to look for
+            incremental (bool): Only look at bubbles appended since the
+                                previous message search
             
         Returns:
             bool: True if the message is found, False otherwise
         """
         print(f"\nChecking if message is visible: {message_text}")
         max_attempts = 5
-        attempt = 1
+        since = self.message_cursor if incremental else 0
         
-        while attempt <= max_attempts:
+        for attempt in range(1, max_attempts + 1):
+            if attempt > 1:
+                self._retry("is_message_visible")
             try:
-                # Get the shadow root
-                shadow_host = self.driver.find_element(By.TAG_NAME, "flowise-fullchatbot")
-                shadow_root = shadow_host.shadow_root
-                
-                # Find the chat view container
-                chat_view = shadow_root.find_element(By.CLASS_NAME, "chatbot-chat-view")
-                
-                # Look for user messages with various possible class combinations
-                user_message_selectors = [
-                    "div.flex.flex-row.justify-end",  # User message container
-                    "div[class*='flex'][class*='justify-end']",
-                    "div[class*='user-message']",
-                    "div[class*='user-bubble']",
-                    "span[class*='user-bubble']",
-                    "span[class*='chatbot-user-bubble']",
-                    "div[class*='flex'][class*='justify-end'] span"  # Text within user message
-                ]
-                
-                # Try each selector
-                for selector in user_message_selectors:
-                    try:
-                        elements = chat_view.find_elements(By.CSS_SELECTOR, selector)
-                        for element in elements:
-                            if message_text in element.text:
-                                print(f"Found message with selector: {selector}")
-                                return True
-                    except:
-                        continue
-                
-                # If not found with specific selectors, search all elements
-                print("\nSearching all elements in chat view...")
-                all_elements = chat_view.find_elements(By.XPATH, ".//*")
-                for element in all_elements:
-                    try:
-                        if message_text in element.text:
-                            print(f"\nFound message in element:")
-                            print(f"Tag: {element.tag_name}")
-                            print(f"Classes: {element.get_attribute('class')}")
-                            print(f"Text: {element.text}")
-                            return True
-                    except:
-                        continue
-                
-                if attempt < max_attempts:
-                    print(f"Message not found, waiting and retrying... (Attempt {attempt + 1}/{max_attempts})")
-                    time.sleep(2)
-                attempt += 1
-                
+                result = self.find_messages(message_text, since=since)
+                if result['matches']:
+                    match = result['matches'][0]
+                    print(f"Found message in {match['role']} bubble #{match['index']}")
+                    return True
+                # Later attempts only need the bubbles appended since this one,
+                # plus the last bubble in case its text is still streaming in
+                since = max(result['count'] - 1, 0)
             except Exception as e:
                 print(f"Error checking message visibility: {str(e)}")
-                if attempt < max_attempts:
-                    time.sleep(2)
-                attempt += 1
+            
+            if attempt < max_attempts:
+                print(f"Message not found, waiting and retrying... (Attempt {attempt + 1}/{max_attempts})")
+                self.waits.until_or_none(
+                    CHAT_VIEW_CONTAINS, timeout=2, args=[message_text], operation="message_render"
+                )
         
         print("Message not found after all attempts")
         return False
     
+    def start_response_timing(self):
+        """
+        Start recording how the next bot reply streams in.
+        
+        Call before send_message; the recorder lives in the page and
+        timestamps every change to the newest bot bubble.
+        """
+        if not response_timing.start_response_timing(
+            self.driver, self.SHADOW_HOST, USER_BUBBLE_SELECTORS, BOT_BUBBLE_SELECTORS
+        ):
+            raise Exception("Chat view not found, cannot time the response")
+    
+    def collect_response_timing(self, timeout=30, settle=2.0):
+        """
+        Wait for the bot reply to stop changing and return its timing.
+        
+        Args:
+            timeout (float): Seconds to wait for the reply
+            settle (float): Seconds without changes after which the reply
+                            is considered complete
+            
+        Returns:
+            ResponseTiming: time to first token, time to complete,
+                            characters per second and stall gaps
+        """
+        timeout = self.timing.timeout("response", timeout)
+        self.waits.ensure_script_timeout(timeout + settle)
+        # The learned timeout covers the reply; the quiet period that proves
+        # it finished comes on top, or fast targets would never settle in time
+        timing = response_timing.collect_response_timing(self.driver, timeout=timeout + settle, settle=settle)
+        self.timing.record(
+            "response", timing.time_to_complete if timing.complete else timeout, timed_out=not timing.complete
+        )
+        print(f"Response timing: {timing}")
+        return timing
+    
     def is_chatbot_response_visible(self):
         """Check if chatbot response is visible"""
         try:
@@ -0,0 +1,155 @@
+"""
+Run the test suite in parallel over pools of pre-warmed headless browsers.
+
+Test methods are sharded across worker processes. Each worker launches its
+browser sessions once and resets them between tests instead of relaunching.
+A remote target is probed until it is warm before any worker starts.
+
+    python -m tests.runner --workers 3
+    python -m tests.runner --workers 3 --compare   # also time the serial runner
+"""
+import argparse
+import json
+import multiprocessing
+import time
+import unittest
+
+DEFAULT_MODULES = ["tests.test_chatbot"]
+
+
+def iter_test_ids(suite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iter_test_ids(test)
+        else:
+            yield test.id()
+
+
+def collect_test_ids(modules):
+    """Return the ids of every test method in the given modules"""
+    suite = unittest.defaultTestLoader.loadTestsFromNames(modules)
+    return sorted(iter_test_ids(suite))
+
+
+def shard(test_ids, workers):
+    """Split test ids round-robin into at most `workers` non-empty shards"""
+    shards = [test_ids[i::workers] for i in range(workers)]
+    return [ids for ids in shards if ids]
+
+
+def _summarize(result, wall):
+    return {
+        "tests": result.testsRun,
+        "failures": len(result.failures),
+        "errors": len(result.errors),
+        "skipped": len(result.skipped),
+        "wall": wall,
+    }
+
+
+def run_shard(test_ids, pool_size=1, ready=()):
+    """Worker entry point: run a shard over a pool of pre-warmed sessions"""
+    from .support.session_pool import SessionPool, set_active_pool
+    from .support.targets import mark_ready
+
+    # Targets the parent already probed, so the worker skips its own probe
+    for key in ready:
+        mark_ready(key)
+    started = time.monotonic()
+    with SessionPool(size=pool_size) as pool:
+        warmup = time.monotonic() - started
+        set_active_pool(pool)
+        suite = unittest.defaultTestLoader.loadTestsFromNames(test_ids)
+        result = unittest.TextTestRunner(verbosity=1).run(suite)
+        summary = _summarize(result, time.monotonic() - started)
+        summary["warmup"] = warmup
+        summary["pool"] = dict(pool.stats)
+        return summary
+
+
+def run_parallel(test_ids, workers, pool_size=1):
+    """Run test ids across worker processes and return the combined summary"""
+    from .support.targets import ready_targets
+
+    shards = shard(test_ids, workers)
+    ready = ready_targets()
+    started = time.monotonic()
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(len(shards)) as processes:
+        results = processes.starmap(run_shard, [(ids, pool_size, ready) for ids in shards])
+    wall = time.monotonic() - started
+    return {
+        "mode": "parallel",
+        "workers": len(shards),
+        "tests": sum(r["tests"] for r in results),
+        "failures": sum(r["failures"] for r in results),
+        "errors": sum(r["errors"] for r in results),
+        "wall": wall,
+        "shards": results,
+    }
+
+
+def warm_up_target():
+    """Wait once for a remote target to boot, so workers launch browsers against a warm host"""
+    from .config import ChatbotTarget
+
+    target = ChatbotTarget()
+    # Stubs start inside each worker and check themselves
+    if target.is_stub or not target.ready_check or target.cassettes == "replay":
+        return None
+    # Starting marks the target ready; run_parallel hands that to the workers
+    result = target.start().readiness
+    target.stop()
+    return result
+
+
+def run_serial(test_ids):
+    """Run test ids in this process with one fresh browser per test"""
+    started = time.monotonic()
+    suite = unittest.defaultTestLoader.loadTestsFromNames(test_ids)
+    result = unittest.TextTestRunner(verbosity=1).run(suite)
+    summary = _summarize(result, time.monotonic() - started)
+    summary.update({"mode": "serial", "workers": 1})
+    return summary
+
+
+def print_report(reports):
+    print(f"\n{'mode':<10}{'workers':>8}{'tests':>7}{'failed':>8}{'wall':>10}{'speedup':>9}")
+    serial = next((r for r in reports if r["mode"] == "serial"), None)
+    for report in reports:
+        failed = report["failures"] + report["errors"]
+        speedup = f"{serial['wall'] / report['wall']:.2f}x" if serial else "-"
+        print(f"{report['mode']:<10}{report['workers']:>8}{report['tests']:>7}"
+              f"{failed:>8}{report['wall']:>9.2f}s{speedup:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES,
+                        help="Test modules, classes or methods to run")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(),
+                        help="Number of worker processes")
+    parser.add_argument("--pool-size", type=int, default=1,
+                        help="Browser sessions per worker")
+    parser.add_argument("--compare", action="store_true",
+                        help="Also run the serial runner and compare wall-clock time")
+    parser.add_argument("--report", help="Write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    test_ids = collect_test_ids(args.modules)
+    warm_up_target()
+    reports = [run_parallel(test_ids, args.workers, args.pool_size)]
+    if args.compare:
+        reports.insert(0, run_serial(test_ids))
+    print_report(reports)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(reports, f, indent=2)
+
+    failed = any(r["failures"] or r["errors"] for r in reports)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
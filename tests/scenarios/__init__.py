@@ -0,0 +1 @@
+# This file makes the scenarios directory a Python package
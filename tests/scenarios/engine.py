@@ -0,0 +1,109 @@
+class TurnResult:
+    """
+    What happened on one turn of a scenario.
+
+    Attributes:
+        message: The message that was sent
+        reply: The bot's reply, joined across its bubbles
+        timing: The reply's ResponseTiming, or None if it was never measured
+        problems: Expectations and budgets the reply did not meet
+    """
+
+    def __init__(self, message, reply=None, timing=None, problems=None):
+        self.message = message
+        self.reply = reply
+        self.timing = timing
+        self.problems = list(problems or [])
+
+    @property
+    def passed(self):
+        return not self.problems
+
+    def as_dict(self):
+        return {
+            "message": self.message,
+            "reply": self.reply,
+            "timing": self.timing.as_dict() if self.timing else None,
+            "problems": self.problems,
+        }
+
+
+class ScenarioResult:
+    """The turns of one scenario run, stopping at the first turn that could not be sent"""
+
+    def __init__(self, scenario):
+        self.scenario = scenario
+        self.turns = []
+
+    @property
+    def passed(self):
+        return len(self.turns) == len(self.scenario.steps) and all(t.passed for t in self.turns)
+
+    def problems(self):
+        """Return every problem, prefixed with its turn number"""
+        problems = [
+            f"Turn {number} ({turn.message!r}): {problem}"
+            for number, turn in enumerate(self.turns, 1) for problem in turn.problems
+        ]
+        if len(self.turns) < len(self.scenario.steps):
+            problems.append(f"Stopped after {len(self.turns)} of {len(self.scenario.steps)} turns")
+        return problems
+
+    def as_dict(self):
+        return {
+            "scenario": self.scenario.name,
+            "passed": self.passed,
+            "turns": [turn.as_dict() for turn in self.turns],
+        }
+
+
+def find_reply(entries, message):
+    """
+    Pick this turn's reply out of the transcript entries added since it was sent.
+
+    The reply is every bot bubble after the user bubble holding the message.
+
+    Returns:
+        str: The reply text, or None if the user bubble is missing
+    """
+    for position, entry in enumerate(entries):
+        if entry.role == "user" and message in entry.text:
+            return "\n".join(e.text for e in entries[position + 1:] if e.role == "bot")
+    return None
+
+
+def run_scenario(page, scenario, response_timeout=30, settle=1.0):
+    """
+    Run every turn of a scenario in the page's current chat, without reloading.
+
+    Each turn reads only the bubbles appended since the previous turn from
+    the page's TranscriptTracker, so a long conversation is never rescanned.
+
+    Args:
+        page (ChatbotPage): A page that is ready to chat
+        scenario (Scenario): The conversation to run
+        response_timeout (float): Seconds to wait for each reply
+        settle (float): Seconds without changes after which a reply is complete
+
+    Returns:
+        ScenarioResult: Per-turn replies, timings and problems
+    """
+    result = ScenarioResult(scenario)
+    transcript = page.transcript
+    transcript.update()
+    for turn in scenario.steps:
+        cursor = transcript.mark()
+        page.start_response_timing()
+        if not page.send_message(turn.message):
+            result.turns.append(TurnResult(turn.message, problems=["Message could not be sent"]))
+            break
+        timing = page.collect_response_timing(timeout=response_timeout, settle=settle)
+
+        transcript.update()
+        reply = find_reply(transcript.since(cursor), turn.message)
+        if reply is None:
+            result.turns.append(TurnResult(turn.message, timing=timing,
+                                           problems=["Sent message did not appear in the chat"]))
+            break
+        result.turns.append(TurnResult(turn.message, reply, timing, turn.check(reply, timing)))
+    return result
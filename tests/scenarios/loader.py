@@ -0,0 +1,49 @@
+import json
+import os
+from .scenario import Scenario
+
+SCENARIO_EXTENSIONS = (".yaml", ".yml", ".jsonl", ".txt")
+
+
+def load_scenarios(path):
+    """
+    Load scenarios from a file, or from every scenario file in a directory.
+
+    .jsonl files hold one scenario per line, .yaml/.yml files a list of
+    scenarios (or a mapping with a "scenarios" list), and .txt files one
+    message per line as a single scenario named after the file.
+
+    Args:
+        path (str): File or directory to load
+
+    Returns:
+        list: Scenarios in file order
+    """
+    if os.path.isdir(path):
+        scenarios = []
+        for name in sorted(os.listdir(path)):
+            if name.endswith(SCENARIO_EXTENSIONS):
+                scenarios += load_scenarios(os.path.join(path, name))
+        return scenarios
+
+    extension = os.path.splitext(path)[1]
+    with open(path, encoding="utf-8") as f:
+        if extension == ".jsonl":
+            return [Scenario.from_dict(json.loads(line)) for line in f if line.strip()]
+        if extension in (".yaml", ".yml"):
+            return [Scenario.from_dict(data) for data in _read_yaml(f, path)]
+        if extension == ".txt":
+            name = os.path.splitext(os.path.basename(path))[0]
+            return [Scenario(name, [line.strip() for line in f if line.strip()])]
+    raise Exception(f"Unsupported scenario file: {path}")
+
+
+def _read_yaml(f, path):
+    try:
+        import yaml
+    except ImportError:
+        raise Exception(f"PyYAML is needed to read {path}: pip install pyyaml")
+    data = yaml.safe_load(f) or []
+    if isinstance(data, dict):
+        data = data.get("scenarios", [])
+    return data
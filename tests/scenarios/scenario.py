@@ -0,0 +1,88 @@
+import re
+
+DEFAULT_LEAD = {
+    "name": "Test User",
+    "email": "test@example.com",
+    "phone": "1234567890",
+}
+
+
+class Turn:
+    """
+    One message in a scenario and what the bot's reply must satisfy.
+
+    Args:
+        message (str): The message to send
+        expect (list): Regular expressions the reply must match (case-insensitive)
+        budget (dict): Latency budget in seconds: "ttft" (time to first
+                       token) and/or "complete" (time until the reply settled)
+    """
+
+    def __init__(self, message, expect=None, budget=None):
+        self.message = message
+        self.expect = [expect] if isinstance(expect, str) else list(expect or [])
+        self.budget = dict(budget or {})
+
+    @classmethod
+    def from_value(cls, value):
+        """Build a Turn from a plain message or a {message, expect, budget} mapping"""
+        if isinstance(value, Turn):
+            return value
+        if isinstance(value, str):
+            return cls(value)
+        return cls(value["message"], value.get("expect"), value.get("budget"))
+
+    def check(self, reply, timing=None):
+        """
+        Check a reply against the expectations and budget.
+
+        Returns:
+            list: A description of every expectation that was not met
+        """
+        problems = [
+            f"Reply does not match {pattern!r}" for pattern in self.expect
+            if not re.search(pattern, reply or "", re.IGNORECASE)
+        ]
+        if timing is not None and self.budget:
+            problems += timing.violations(
+                max_ttft=self.budget.get("ttft"), max_complete=self.budget.get("complete")
+            )
+        return problems
+
+
+class Scenario:
+    """
+    A scripted conversation shared by the browser and HTTP test paths.
+
+    Args:
+        name (str): Scenario name, used in reports
+        turns (list): Messages to send, in order, as strings or Turns
+        lead (dict): name, email and phone for the lead form
+    """
+
+    def __init__(self, name, turns, lead=None):
+        self.name = name
+        self.steps = [Turn.from_value(turn) for turn in turns]
+        self.turns = [step.message for step in self.steps]
+        self.lead = dict(lead or DEFAULT_LEAD)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Scenario from a {name, turns, lead} mapping"""
+        if not data.get("name") or not data.get("turns"):
+            raise Exception(f"Scenario needs a name and turns: {data}")
+        return cls(data["name"], data["turns"], data.get("lead"))
+
+    def __repr__(self):
+        return f"Scenario({self.name!r}, {len(self.turns)} turns)"
+
+
+CAPITAL_PROTECTION_BASICS = Scenario("capital_protection_basics", [
+    "What is capital protection?",
+    "How does a capital protected note work?",
+    "What happens if the market falls?",
+])
+
+GREETING = Scenario("greeting", ["Hello, how are you?", "What can you help me with?"])
+
+SCENARIOS = {scenario.name: scenario for scenario in (CAPITAL_PROTECTION_BASICS, GREETING)}
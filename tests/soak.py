@@ -0,0 +1,245 @@
+"""
+Run one long chatbot conversation and watch for latency drift and memory growth.
+
+A single ChatbotPage session sends the scenario's messages round and round
+for --turns turns or --minutes minutes, sampling the JS heap and the
+widget's shadow DOM size every --sample-every turns. The run fails when the
+heap, DOM or latency grows past the thresholds.
+
+    python -m tests.soak --target stub --turns 200
+    python -m tests.soak --target stub --minutes 30 --sample-every 20 --report soak.json
+"""
+import argparse
+import json
+import statistics
+import time
+from .config import ChatbotTarget
+from .pages.chatbot_page import ChatbotPage
+from .scenarios.scenario import SCENARIOS, CAPITAL_PROTECTION_BASICS
+from .support.drivers import create_driver
+from .support.page_metrics import sample_page_metrics
+from .support.stats import slope
+
+# Growth allowed over a run before it fails
+DEFAULT_THRESHOLDS = {
+    "max_heap_growth": 100.0,    # Percent growth of the JS heap, first to last sample
+    "max_nodes_per_turn": 40.0,  # Shadow DOM nodes added per turn, on average
+    "max_latency_drift": 1.5,    # Late-run median latency / early-run median latency
+}
+
+# Consecutive failed sends after which the run gives up
+MAX_CONSECUTIVE_FAILURES = 5
+
+
+class SoakRun:
+    """Per-turn latencies and periodic page samples from one soak session"""
+
+    def __init__(self):
+        self.turns = []
+        self.samples = []
+        self.failures = []
+        self.started = time.monotonic()
+
+    def record_turn(self, turn, send, timing):
+        self.turns.append({
+            "turn": turn,
+            "elapsed": time.monotonic() - self.started,
+            "send": send,
+            "response": timing.send_offset + (timing.time_to_complete or 0),
+            "time_to_first_token": timing.time_to_first_token,
+        })
+
+    def sample(self, page, turn):
+        sample = sample_page_metrics(page.driver, page.SHADOW_HOST, collect_garbage=True)
+        sample["turn"] = turn
+        sample["elapsed"] = time.monotonic() - self.started
+        self.samples.append(sample)
+        print(f"Turn {turn}: heap {_mb(sample['heap_used'])}, "
+              f"{sample['shadow_nodes']} shadow DOM nodes")
+
+
+def run_soak(page, url, scenario, turns=None, minutes=None, sample_every=10,
+             response_timeout=30, settle=0.5):
+    """
+    Run one conversation until `turns` messages or `minutes` have passed.
+
+    Args:
+        page (ChatbotPage): Page on a fresh browser session
+        url (str): The chatbot URL
+        scenario (Scenario): Messages to cycle through
+        turns (int): Messages to send; defaults to 100 when minutes is not set
+        minutes (float): Stop after this long
+        sample_every (int): Turns between page samples
+
+    Returns:
+        SoakRun: Latencies, samples and failures
+    """
+    if turns is None and minutes is None:
+        turns = 100
+    deadline = time.monotonic() + minutes * 60 if minutes else None
+    run = SoakRun()
+    page.start_chat(url, scenario.lead)
+    run.sample(page, 0)
+
+    turn = 0
+    consecutive_failures = 0
+    while (turns is None or turn < turns) and (deadline is None or time.monotonic() < deadline):
+        message = scenario.turns[turn % len(scenario.turns)]
+        turn += 1
+        try:
+            page.start_response_timing()
+            started = time.monotonic()
+            if not page.send_message(message):
+                raise Exception("Message was not visible after sending")
+            send = time.monotonic() - started
+            run.record_turn(turn, send, page.collect_response_timing(timeout=response_timeout, settle=settle))
+            consecutive_failures = 0
+        except Exception as e:
+            run.failures.append({"turn": turn, "error": str(e)})
+            consecutive_failures += 1
+            if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                print(f"Stopping after {consecutive_failures} failed turns in a row")
+                break
+        if turn % sample_every == 0:
+            run.sample(page, turn)
+
+    if run.samples[-1]["turn"] != turn:
+        run.sample(page, turn)
+    return run
+
+
+def _mb(value):
+    return f"{value / 1e6:.1f} MB" if value is not None else "n/a"
+
+
+def _drift(values):
+    """Median of the last fifth of values over the median of the first fifth"""
+    window = max(len(values) // 5, 1)
+    if len(values) < 2 * window or len(values) < 4:
+        return None
+    early = statistics.median(values[:window])
+    late = statistics.median(values[-window:])
+    return late / early if early else None
+
+
+def analyze(run, thresholds=None):
+    """
+    Turn a SoakRun into trends and threshold violations.
+
+    Returns:
+        dict: heap, dom and per-latency trends plus a list of violations
+    """
+    thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+    violations = []
+    samples = [s for s in run.samples if s["heap_used"] is not None]
+
+    heap = {"first": None, "last": None, "growth": None, "per_turn": None}
+    if samples:
+        first, last = samples[0]["heap_used"], samples[-1]["heap_used"]
+        heap.update(first=first, last=last,
+                    growth=(last - first) / first * 100 if first else None,
+                    per_turn=slope([s["turn"] for s in samples], [s["heap_used"] for s in samples]))
+        if heap["growth"] is not None and heap["growth"] > thresholds["max_heap_growth"]:
+            violations.append(f"JS heap grew {heap['growth']:.0f}% > {thresholds['max_heap_growth']:.0f}%")
+
+    nodes = [s for s in run.samples if s["shadow_nodes"] is not None]
+    dom = {"first": None, "last": None, "per_turn": None}
+    if nodes:
+        dom.update(first=nodes[0]["shadow_nodes"], last=nodes[-1]["shadow_nodes"],
+                   per_turn=slope([s["turn"] for s in nodes], [s["shadow_nodes"] for s in nodes]))
+        if dom["per_turn"] is not None and dom["per_turn"] > thresholds["max_nodes_per_turn"]:
+            violations.append(f"Shadow DOM grew {dom['per_turn']:.1f} nodes/turn "
+                              f"> {thresholds['max_nodes_per_turn']:.1f}")
+
+    latency = {}
+    for name in ("send", "response"):
+        values = [t[name] for t in run.turns]
+        latency[name] = {
+            "drift": _drift(values),
+            "per_turn": slope([t["turn"] for t in run.turns], values),
+        }
+        drift = latency[name]["drift"]
+        if drift is not None and drift > thresholds["max_latency_drift"]:
+            violations.append(f"{name.capitalize()} latency drifted {drift:.2f}x "
+                              f"> {thresholds['max_latency_drift']:.2f}x")
+    if run.failures:
+        violations.append(f"{len(run.failures)} of {len(run.turns) + len(run.failures)} turns failed")
+
+    return {
+        "turns": len(run.turns),
+        "failures": run.failures,
+        "heap": heap,
+        "dom": dom,
+        "latency": latency,
+        "thresholds": thresholds,
+        "violations": violations,
+        "samples": run.samples,
+    }
+
+
+def print_report(report):
+    print(f"\n{'turn':>6}{'elapsed':>10}{'heap':>12}{'shadow nodes':>14}{'listeners':>11}")
+    for sample in report["samples"]:
+        listeners = sample["js_listeners"] if sample["js_listeners"] is not None else "-"
+        print(f"{sample['turn']:>6}{sample['elapsed']:>9.0f}s{_mb(sample['heap_used']):>12}"
+              f"{str(sample['shadow_nodes']):>14}{str(listeners):>11}")
+
+    heap, dom = report["heap"], report["dom"]
+    print(f"\nTurns: {report['turns']} ({len(report['failures'])} failed)")
+    if heap["growth"] is not None:
+        print(f"JS heap: {_mb(heap['first'])} -> {_mb(heap['last'])} "
+              f"({heap['growth']:+.0f}%, {heap['per_turn'] or 0:+.0f} bytes/turn)")
+    if dom["per_turn"] is not None:
+        print(f"Shadow DOM: {dom['first']} -> {dom['last']} nodes ({dom['per_turn']:+.1f}/turn)")
+    for name, trend in report["latency"].items():
+        if trend["drift"] is not None:
+            print(f"{name.capitalize()} latency: {trend['drift']:.2f}x late/early, "
+                  f"{trend['per_turn'] * 1000:+.1f} ms/turn")
+    for violation in report["violations"]:
+        print(f"FAIL: {violation}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target", default="stub", help="Chatbot URL or 'stub'")
+    parser.add_argument("--turns", type=int, help="Messages to send (default 100)")
+    parser.add_argument("--minutes", type=float, help="Run for this long instead of a turn count")
+    parser.add_argument("--sample-every", type=int, default=10, help="Turns between memory samples")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default=CAPITAL_PROTECTION_BASICS.name,
+                        help="Scenario whose messages are cycled")
+    parser.add_argument("--profile", default="headless", help="Browser profile (see tests/support/drivers.py)")
+    parser.add_argument("--response-timeout", type=float, default=30, help="Seconds to wait for each reply")
+    parser.add_argument("--max-heap-growth", type=float, default=DEFAULT_THRESHOLDS["max_heap_growth"],
+                        help="Percent JS heap growth allowed")
+    parser.add_argument("--max-nodes-per-turn", type=float, default=DEFAULT_THRESHOLDS["max_nodes_per_turn"],
+                        help="Shadow DOM nodes allowed per turn")
+    parser.add_argument("--max-latency-drift", type=float, default=DEFAULT_THRESHOLDS["max_latency_drift"],
+                        help="Late/early median latency ratio allowed")
+    parser.add_argument("--report", help="Write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    with ChatbotTarget(args.target) as target:
+        driver = create_driver(args.profile)
+        try:
+            run = run_soak(
+                ChatbotPage(driver), target.url, SCENARIOS[args.scenario],
+                turns=args.turns, minutes=args.minutes, sample_every=args.sample_every,
+                response_timeout=args.response_timeout
+            )
+        finally:
+            driver.quit()
+
+    report = analyze(run, {
+        "max_heap_growth": args.max_heap_growth,
+        "max_nodes_per_turn": args.max_nodes_per_turn,
+        "max_latency_drift": args.max_latency_drift,
+    })
+    print_report(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["violations"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1 @@
+# This file makes the stub directory a Python package
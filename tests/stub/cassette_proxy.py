@@ -0,0 +1,298 @@
+"""
+Record and replay the chatbot's HTTP traffic through a local proxy.
+
+In record mode every request is forwarded to the upstream Flowise host and
+the response is saved, chunk by chunk with its arrival time, to a cassette
+file keyed by the normalized request. In replay mode the same requests are
+answered from the cassettes without touching the upstream, with the
+recorded timing scaled by `timing` (0 serves everything immediately).
+
+    python -m tests.stub.cassette_proxy record https://host/chatbot/<id>
+    python -m tests.stub.cassette_proxy replay https://host/chatbot/<id> --timing 0
+"""
+import argparse
+import base64
+import hashlib
+import http.client
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Top-level request fields that differ on every run and must not change
+# the key; nested fields, such as history message ids, are left alone
+VOLATILE_FIELDS = ("chatId", "chatMessageId", "socketIOClientId", "id")
+
+# Headers that describe one connection rather than the response
+HOP_BY_HOP = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "content-length", "host",
+    "accept-encoding", "content-encoding",
+}
+
+
+def normalize_body(body):
+    """Drop the top-level volatile fields from a JSON request body"""
+    if isinstance(body, dict):
+        return {k: v for k, v in body.items() if k not in VOLATILE_FIELDS}
+    return body
+
+
+def cassette_key(method, path, body):
+    """
+    Return the cassette key for a request.
+
+    Args:
+        method (str): HTTP method
+        path (str): Path including the query string
+        body (bytes): Request body
+
+    Returns:
+        str: A readable, file-name-safe key
+    """
+    try:
+        normalized = json.dumps(normalize_body(json.loads(body)), sort_keys=True) if body else ""
+    except ValueError:
+        normalized = body.decode("utf-8", "replace")
+    digest = hashlib.sha256(f"{method} {path}\n{normalized}".encode("utf-8")).hexdigest()[:16]
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", path.split("?", 1)[0]).strip("-")[:80]
+    return f"{method.lower()}-{slug}-{digest}"
+
+
+def _encode(data):
+    try:
+        return {"text": data.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(data).decode("ascii")}
+
+
+def _decode(chunk):
+    if "base64" in chunk:
+        return base64.b64decode(chunk["base64"])
+    return chunk["text"].encode("utf-8")
+
+
+class CassetteRequestHandler(BaseHTTPRequestHandler):
+    """Forward and record, or replay, every request the widget makes"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.handle_request()
+
+    def do_POST(self):
+        self.handle_request()
+
+    def do_PUT(self):
+        self.handle_request()
+
+    def do_DELETE(self):
+        self.handle_request()
+
+    def handle_request(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        key = cassette_key(self.command, self.path, body)
+        self.chunked = None
+        if self.server.mode == REPLAY:
+            self.replay(key)
+        else:
+            self.record(key, body)
+
+    def record(self, key, body):
+        server = self.server
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in HOP_BY_HOP}
+        connection = server.upstream_connection()
+        started = time.monotonic()
+        try:
+            connection.request(self.command, self.path, body=body or None, headers=headers)
+            upstream = connection.getresponse()
+            response_headers = [
+                (k, v) for k, v in upstream.getheaders() if k.lower() not in HOP_BY_HOP
+            ]
+            self.start_response(upstream.status, response_headers)
+            chunks = []
+            while True:
+                data = upstream.read1(65536)
+                if not data:
+                    break
+                chunks.append(dict(_encode(data), at=time.monotonic() - started))
+                self.write_chunk(data)
+            self.write_chunk(b"")
+        except (OSError, http.client.HTTPException) as e:
+            print(f"Upstream request {self.command} {self.path} failed: {str(e)}")
+            if self.chunked is None:
+                self.send_error(502, "Upstream request failed")
+            else:
+                # The response already started; the client sees a truncated body
+                self.close_connection = True
+            return
+        finally:
+            connection.close()
+
+        server.save(key, {
+            "request": {"method": self.command, "path": self.path, "body": _encode(body)},
+            "response": {"status": upstream.status, "headers": response_headers, "chunks": chunks},
+        })
+
+    def replay(self, key):
+        cassette = self.server.load(key)
+        if cassette is None:
+            print(f"No cassette for {self.command} {self.path} ({key})")
+            payload = json.dumps({"error": f"No cassette for {self.command} {self.path}"}).encode()
+            self.start_response(404, [("Content-Type", "application/json")])
+            self.write_chunk(payload)
+            self.write_chunk(b"")
+            return
+
+        response = cassette["response"]
+        self.start_response(response["status"], response["headers"])
+        started = time.monotonic()
+        for chunk in response["chunks"]:
+            delay = chunk["at"] * self.server.timing - (time.monotonic() - started)
+            if delay > 0:
+                time.sleep(delay)
+            self.write_chunk(_decode(chunk))
+        self.write_chunk(b"")
+
+    def start_response(self, status, headers):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        # These responses never carry a body
+        self.chunked = not (status in (204, 304) or 100 <= status < 200 or self.command == "HEAD")
+        if self.chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def write_chunk(self, data):
+        if not self.chunked:
+            return
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CassetteHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, upstream, cassette_dir, mode, timing):
+        super().__init__(address, CassetteRequestHandler)
+        self.upstream = urlparse(upstream)
+        self.cassette_dir = cassette_dir
+        self.mode = mode
+        self.timing = timing
+        self.stats = {"recorded": 0, "replayed": 0, "missed": 0}
+        self._lock = threading.Lock()
+
+    def upstream_connection(self):
+        if self.upstream.scheme == "https":
+            return http.client.HTTPSConnection(self.upstream.netloc, timeout=120)
+        return http.client.HTTPConnection(self.upstream.netloc, timeout=120)
+
+    def path_for(self, key):
+        return os.path.join(self.cassette_dir, f"{key}.json")
+
+    def save(self, key, cassette):
+        os.makedirs(self.cassette_dir, exist_ok=True)
+        path = self.path_for(key)
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(cassette, f, indent=1)
+        os.replace(temporary, path)
+        with self._lock:
+            self.stats["recorded"] += 1
+
+    def load(self, key):
+        try:
+            with open(self.path_for(key), encoding="utf-8") as f:
+                cassette = json.load(f)
+        except OSError:
+            cassette = None
+        with self._lock:
+            self.stats["replayed" if cassette else "missed"] += 1
+        return cassette
+
+
+class CassetteProxy:
+    """
+    Local proxy that records or replays the traffic of one chatbot host.
+
+    Args:
+        upstream (str): URL of the Flowise host (any path is ignored)
+        cassette_dir (str): Directory holding the cassette files
+        mode (str): "record" or "replay"
+        timing (float): Replay speed; 1 keeps recorded timing, 0 removes it
+    """
+
+    def __init__(self, upstream, cassette_dir="cassettes", mode=REPLAY, timing=1.0,
+                 host="127.0.0.1", port=0):
+        if mode not in (RECORD, REPLAY):
+            raise Exception(f"Unknown cassette mode: {mode}")
+        self.httpd = CassetteHTTPServer((host, port), upstream, cassette_dir, mode, timing)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self):
+        return self.httpd.stats
+
+    def proxied_url(self, url):
+        """Return url with its host replaced by the proxy"""
+        parsed = urlparse(url)
+        return self.base_url + parsed.path + (f"?{parsed.query}" if parsed.query else "")
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("mode", choices=(RECORD, REPLAY))
+    parser.add_argument("url", help="Chatbot page URL to proxy")
+    parser.add_argument("--cassettes", default=os.environ.get("CHATBOT_CASSETTE_DIR", "cassettes"),
+                        help="Cassette directory")
+    parser.add_argument("--timing", type=float, default=1.0,
+                        help="Replay speed: 1 keeps recorded timing, 0 serves immediately")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args(argv)
+
+    proxy = CassetteProxy(args.url, args.cassettes, args.mode, args.timing, port=args.port)
+    print(f"{args.mode.capitalize()}ing {args.url} at {proxy.proxied_url(args.url)}")
+    try:
+        proxy.httpd.serve_forever()
+    except KeyboardInterrupt:
+        proxy.httpd.server_close()
+        print(f"Cassette stats: {proxy.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import collections
+import json
+import os
+import threading
+import time
+import uuid
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+DEFAULT_CHATFLOW_ID = "769b8e19-17f3-4e89-80d7-73553211c085"
+
+
+class StubConfig:
+    """Behaviour of the fake Flowise API.
+
+    Args:
+        latency (float): Seconds before the prediction endpoint responds
+        token_delay (float): Seconds between streamed tokens
+        streaming (bool): Stream predictions as server-sent events
+        reply (str): Reply template, formatted with the question
+        startup (float): Seconds after start during which every request gets
+                         a 503, like a cold-starting host
+    """
+
+    def __init__(self, latency=0.0, token_delay=0.0, streaming=False, reply="You said: {question}", startup=0.0):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.streaming = streaming
+        self.reply = reply
+        self.startup = startup
+
+    @classmethod
+    def from_env(cls):
+        """Build a config from STUB_LATENCY, STUB_TOKEN_DELAY, STUB_STREAMING and STUB_STARTUP"""
+        return cls(
+            latency=float(os.environ.get("STUB_LATENCY", "0")),
+            token_delay=float(os.environ.get("STUB_TOKEN_DELAY", "0")),
+            streaming=os.environ.get("STUB_STREAMING", "") not in ("", "0", "false"),
+            startup=float(os.environ.get("STUB_STARTUP", "0")),
+        )
+
+    def answer(self, question):
+        return self.reply.format(question=question)
+
+
+class StubRequestHandler(SimpleHTTPRequestHandler):
+    """Serve the stub chatbot page, its assets and the fake Flowise API"""
+
+    protocol_version = "HTTP/1.1"
+
+    def translate_path(self, path):
+        route = path.split("?", 1)[0]
+        if route.startswith("/chatbot/"):
+            return os.path.join(STATIC_DIR, "index.html")
+        if route.startswith("/stub/"):
+            return os.path.join(STATIC_DIR, route[len("/stub/"):])
+        return super().translate_path(path)
+
+    def do_GET(self):
+        route = self.path.split("?", 1)[0]
+        self.server.record("GET", route, None)
+        if not self.server.booted():
+            self.send_text("Service is starting", status=503)
+        elif route == "/api/v1/ping":
+            self.send_text("pong")
+        elif route.startswith("/api/v1/public-chatbotConfig/"):
+            self.send_json({})
+        elif route.startswith("/api/v1/chatflows-streaming/"):
+            self.send_json({"isStreaming": self.server.config.streaming})
+        elif route.startswith("/api/"):
+            self.send_json({"error": "Not found"}, status=404)
+        else:
+            super().do_GET()
+
+    def do_POST(self):
+        route = self.path.split("?", 1)[0]
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_json({"error": "Invalid JSON"}, status=400)
+            return
+        self.server.record("POST", route, body)
+        if not self.server.booted():
+            self.send_text("Service is starting", status=503)
+        elif route == "/api/v1/leads":
+            lead = dict(body, id=str(uuid.uuid4()))
+            self.server.leads.append(lead)
+            self.send_json(lead)
+        elif route.startswith("/api/v1/prediction/"):
+            self.predict(body)
+        else:
+            self.send_json({"error": "Not found"}, status=404)
+
+    def predict(self, body):
+        config = self.server.config
+        question = body.get("question", "")
+        chat_id = body.get("chatId") or str(uuid.uuid4())
+        answer = config.answer(question)
+        time.sleep(config.latency)
+
+        if not (body.get("streaming") and config.streaming):
+            time.sleep(config.token_delay * len(answer.split()))
+            self.send_json({
+                "text": answer,
+                "question": question,
+                "chatId": chat_id,
+                "chatMessageId": str(uuid.uuid4()),
+            })
+            return
+
+        # Server-sent events in the format the Flowise prediction API streams
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self.send_event("start", "")
+        words = answer.split(" ")
+        for index, word in enumerate(words):
+            if index:
+                time.sleep(config.token_delay)
+            self.send_event("token", word if index == 0 else " " + word)
+        self.send_event("metadata", {"chatId": chat_id, "question": question})
+        self.send_event("end", "[DONE]")
+        self.write_chunk(b"")
+
+    def send_event(self, event, data):
+        payload = json.dumps({"event": event, "data": data})
+        self.write_chunk(f"message:\ndata: {payload}\n\n".encode("utf-8"))
+
+    def write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def send_json(self, data, status=200):
+        self.send_body(json.dumps(data).encode("utf-8"), "application/json", status)
+
+    def send_text(self, text, status=200):
+        self.send_body(text.encode("utf-8"), "text/plain", status)
+
+    def send_body(self, body, content_type, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep test output readable; the stub is not what we are testing
+        pass
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, handler, config):
+        super().__init__(address, handler)
+        self.config = config
+        self.leads = []
+        self.requests = collections.deque(maxlen=1000)
+        self.ready_at = 0.0
+
+    def record(self, method, path, body):
+        self.requests.append((method, path, body))
+
+    def booted(self):
+        return time.monotonic() >= self.ready_at
+
+
+class StubServer:
+    """Run the local Flowise stand-in on a background thread"""
+
+    def __init__(self, host="127.0.0.1", port=0, config=None):
+        handler = partial(StubRequestHandler, directory=STATIC_DIR)
+        self.config = config or StubConfig.from_env()
+        self.httpd = StubHTTPServer((host, port), handler, self.config)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def leads(self):
+        return self.httpd.leads
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    def chatbot_url(self, chatflow_id=DEFAULT_CHATFLOW_ID, **params):
+        """Return the chatbot page URL, passing params to the stub widget"""
+        url = f"{self.base_url}/chatbot/{chatflow_id}"
+        if params:
+            url += "?" + "&".join(f"{key}={value}" for key, value in params.items())
+        return url
+
+    def start(self):
+        self.httpd.ready_at = time.monotonic() + self.config.startup
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+if __name__ == "__main__":
+    server = StubServer(port=int(os.environ.get("STUB_PORT", "8765")))
+    print(f"Serving stub chatbot at {server.chatbot_url()}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
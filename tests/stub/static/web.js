@@ -0,0 +1,192 @@
+// Local stand-in for the flowise-embed full page chatbot.
+//
+// It reproduces the parts of the widget's shadow DOM that ChatbotPage
+// targets: the lead form, the chat view with user/bot bubbles, the
+// textarea.text-input and the send button holding svg.send-icon.
+//
+// Like the real widget it submits leads to /api/v1/leads and sends
+// questions to /api/v1/prediction/<chatflowid>, reading server-sent events
+// when the chatflow streams. The lead is kept in localStorage under
+// `<chatflowid>_EXTERNAL` so a returning visitor goes straight to the chat.
+//
+// Query parameters:
+//   boot    - milliseconds before the widget renders (default 300)
+//   history - bubbles already in the chat when it opens, including the
+//             welcome message, alternating questions and answers (default 1)
+(function () {
+    const params = new URLSearchParams(window.location.search);
+    const bootDelay = parseInt(params.get('boot') || '300', 10);
+    const historyLength = parseInt(params.get('history') || '1', 10);
+    const apiHost = window.location.origin;
+    const chatflowid = window.location.pathname.split('/').filter(Boolean).pop();
+    const storageKey = `${chatflowid}_EXTERNAL`;
+
+    function loadSession() {
+        try {
+            return JSON.parse(localStorage.getItem(storageKey)) || {};
+        } catch (e) {
+            return {};
+        }
+    }
+
+    function saveSession(session) {
+        localStorage.setItem(storageKey, JSON.stringify(session));
+    }
+
+    const STYLE = `
+        :host { display: block; height: 100%; font-family: sans-serif; }
+        .chatbot-container { display: flex; flex-direction: column; height: 100%; }
+        .lead-form { display: flex; flex-direction: column; gap: 8px; padding: 16px; }
+        .chatbot-chat-view { flex: 1; overflow-y: auto; padding: 16px; }
+        .flex { display: flex; }
+        .flex-row { flex-direction: row; }
+        .justify-end { justify-content: flex-end; }
+        .justify-start { justify-content: flex-start; }
+        .chatbot-user-bubble { background: #3b81f6; color: #fff; }
+        .chatbot-host-bubble { background: #f7f8ff; color: #303235; }
+        .chatbot-user-bubble, .chatbot-host-bubble { border-radius: 6px; margin: 4px 0; padding: 8px 16px; }
+        .chatbot-input { display: flex; padding: 8px; }
+        .text-input { flex: 1; min-height: 40px; }
+        .send-icon { width: 20px; height: 20px; }
+    `;
+
+    class FlowiseFullChatbot extends HTMLElement {
+        connectedCallback() {
+            if (this.shadowRoot) return;
+            const root = this.attachShadow({ mode: 'open' });
+            setTimeout(() => this.boot(root), bootDelay);
+        }
+
+        async boot(root) {
+            this.session = loadSession();
+            if (!this.session.chatId) {
+                this.session.chatId = crypto.randomUUID ? crypto.randomUUID() : `${Date.now()}-${Math.random()}`;
+                saveSession(this.session);
+            }
+            const response = await fetch(`${apiHost}/api/v1/chatflows-streaming/${chatflowid}`);
+            this.streaming = (await response.json()).isStreaming;
+            root.innerHTML = `<style>${STYLE}</style><div class="chatbot-container"></div>`;
+            if (this.session.lead) {
+                this.renderChat(root);
+            } else {
+                this.renderLeadForm(root);
+            }
+        }
+
+        renderLeadForm(root) {
+            root.querySelector('.chatbot-container').innerHTML = `
+                    <form class="lead-form">
+                        <p>Let us know where we can reach you</p>
+                        <input type="text" placeholder="Name">
+                        <input type="email" placeholder="Email Address">
+                        <input type="tel" placeholder="Phone Number">
+                        <button type="submit">Submit</button>
+                    </form>
+            `;
+            root.querySelector('form').addEventListener('submit', async (event) => {
+                event.preventDefault();
+                const [name, email, phone] = Array.from(root.querySelectorAll('form input')).map(i => i.value);
+                const lead = { chatflowid: chatflowid, chatId: this.session.chatId, name, email, phone };
+                await fetch(`${apiHost}/api/v1/leads`, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify(lead)
+                });
+                this.session.lead = { name, email, phone };
+                saveSession(this.session);
+                this.renderChat(root);
+            });
+        }
+
+        renderChat(root) {
+            root.querySelector('.chatbot-container').innerHTML = `
+                <div class="chatbot-chat-view"></div>
+                <div class="chatbot-input">
+                    <textarea class="text-input" placeholder="Type your question"></textarea>
+                    <button type="button" class="chatbot-button">
+                        <svg class="send-icon" viewBox="0 0 24 24"><path d="M2 21l21-9L2 3v7l15 2-15 2z"></path></svg>
+                    </button>
+                </div>
+            `;
+            const chatView = root.querySelector('.chatbot-chat-view');
+            const input = root.querySelector('textarea.text-input');
+            this.appendBubble(chatView, 'bot', 'Hi there! How can I help?');
+            for (let i = 1; i < historyLength; i++) {
+                const turn = Math.ceil(i / 2);
+                if (i % 2) {
+                    this.appendBubble(chatView, 'user', `History question ${turn}`);
+                } else {
+                    this.appendBubble(chatView, 'bot', `History answer ${turn}`);
+                }
+            }
+
+            const submit = () => {
+                const question = input.value.trim();
+                if (!question) return;
+                input.value = '';
+                this.appendBubble(chatView, 'user', question);
+                this.predict(chatView, question);
+            };
+            root.querySelector('button').addEventListener('click', submit);
+            input.addEventListener('keydown', (event) => {
+                if (event.key === 'Enter' && !event.shiftKey) {
+                    event.preventDefault();
+                    submit();
+                }
+            });
+        }
+
+        async predict(chatView, question) {
+            const response = await fetch(`${apiHost}/api/v1/prediction/${chatflowid}`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ question, chatId: this.session.chatId, streaming: this.streaming })
+            });
+            if (!response.headers.get('Content-Type').startsWith('text/event-stream')) {
+                const data = await response.json();
+                this.appendBubble(chatView, 'bot', data.text);
+                return;
+            }
+            // Grow one bot bubble token by token, like the streaming widget
+            const bubble = this.appendBubble(chatView, 'bot', '');
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+                for (const event of events) {
+                    const line = event.split('\n').find(l => l.startsWith('data: '));
+                    if (!line) continue;
+                    const message = JSON.parse(line.slice(6));
+                    if (message.event === 'token') {
+                        bubble.textContent += message.data;
+                        chatView.scrollTop = chatView.scrollHeight;
+                    }
+                }
+            }
+        }
+
+        appendBubble(chatView, role, text) {
+            const row = document.createElement('div');
+            const bubble = document.createElement('span');
+            if (role === 'user') {
+                row.className = 'flex flex-row justify-end';
+                bubble.className = 'chatbot-user-bubble';
+            } else {
+                row.className = 'flex flex-row justify-start';
+                bubble.className = 'chatbot-host-bubble message';
+            }
+            bubble.textContent = text;
+            row.appendChild(bubble);
+            chatView.appendChild(row);
+            chatView.scrollTop = chatView.scrollHeight;
+            return bubble;
+        }
+    }
+
+    customElements.define('flowise-fullchatbot', FlowiseFullChatbot);
+})();
@@ -0,0 +1 @@
+# This file makes the support directory a Python package
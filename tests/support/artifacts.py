@@ -0,0 +1,228 @@
+import atexit
+import base64
+import gzip
+import json
+import os
+import queue
+import re
+import threading
+
+# Lists the chatbot's shadow DOM elements, truncated at maxBytes
+ELEMENTS_SCRIPT = """
+    const host = document.querySelector(arguments[0]);
+    const maxBytes = arguments[1];
+    const root = host && host.shadowRoot;
+    const elements = [];
+    let size = 0;
+    let truncated = false;
+    for (const el of root ? root.querySelectorAll('*') : []) {
+        const entry = {
+            tag: el.tagName.toLowerCase(),
+            id: el.id || null,
+            classes: el.getAttribute('class'),
+            role: el.getAttribute('role'),
+            text: el.children.length ? null : (el.textContent || '').trim().slice(0, 200) || null
+        };
+        size += JSON.stringify(entry).length;
+        if (size > maxBytes) { truncated = true; break; }
+        elements.push(entry);
+    }
+"""
+
+# Serializes the page and the chatbot's shadow DOM in one round trip,
+# truncating each part at maxBytes
+SNAPSHOT_SCRIPT = ELEMENTS_SCRIPT + """
+    return {
+        url: location.href,
+        title: document.title,
+        html: document.documentElement.outerHTML.slice(0, maxBytes),
+        shadowHtml: root ? root.innerHTML.slice(0, maxBytes) : null,
+        elements: elements,
+        truncated: truncated
+    };
+"""
+
+
+class ArtifactWriter:
+    """
+    Background thread that encodes and writes failure artifacts.
+
+    The queue is bounded and writes stop once max_total_bytes have been
+    written, so a burst of failures is dropped rather than stalling tests
+    or filling the disk.
+    """
+
+    def __init__(self, max_queue=32, max_total_bytes=None):
+        if max_total_bytes is None:
+            max_total_bytes = int(os.environ.get("CHATBOT_ARTIFACT_MAX_BYTES", 200 * 1024 * 1024))
+        self.max_total_bytes = max_total_bytes
+        self.written = 0
+        self.stats = {"written": 0, "dropped": 0, "errors": 0}
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def full(self):
+        return self.written >= self.max_total_bytes
+
+    def submit(self, path, encode):
+        """Queue encode() to be written to path; returns False if it was dropped"""
+        if self.full():
+            self.stats["dropped"] += 1
+            return False
+        try:
+            self._queue.put_nowait((path, encode))
+            return True
+        except queue.Full:
+            self.stats["dropped"] += 1
+            return False
+
+    def flush(self, timeout=10):
+        """Wait up to timeout seconds for queued artifacts to be written"""
+        done = threading.Event()
+        threading.Thread(target=lambda: (self._queue.join(), done.set()), daemon=True).start()
+        return done.wait(timeout)
+
+    def _run(self):
+        while True:
+            path, encode = self._queue.get()
+            try:
+                if self.full():
+                    self.stats["dropped"] += 1
+                    continue
+                payload = encode()
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(payload)
+                self.written += len(payload)
+                self.stats["written"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"Could not write artifact {path}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """Return the process-wide writer, starting it on first use"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ArtifactWriter()
+            atexit.register(_writer.flush)
+        return _writer
+
+
+def flush_artifacts(timeout=10):
+    """Wait for pending artifacts to reach the disk, e.g. at the end of a run"""
+    return _writer.flush(timeout) if _writer else True
+
+
+def _safe_name(name):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+
+
+class ArtifactCollector:
+    """
+    Captures a screenshot and a DOM snapshot when a page-object step fails.
+
+    Only the two browser calls happen on the caller's thread; decoding,
+    compression and disk writes happen on the shared ArtifactWriter.
+    Artifacts go to <root>/worker-<pid>/<test id>/, and at most
+    max_per_test captures are made per test.
+
+    Args:
+        driver: The WebDriver to capture from
+        test_id (str): Directory name for this test's artifacts
+        root (str): Artifact root, CHATBOT_ARTIFACT_DIR or "artifacts" by default
+        enabled (bool): Defaults to on unless CHATBOT_ARTIFACTS=0
+        max_per_test (int): Captures allowed per test, CHATBOT_ARTIFACT_LIMIT or 5
+        max_snapshot_bytes (int): Size cap for each part of the DOM snapshot
+    """
+
+    def __init__(self, driver, test_id="session", root=None, enabled=None,
+                 max_per_test=None, max_snapshot_bytes=512 * 1024, shadow_host="flowise-fullchatbot"):
+        if enabled is None:
+            enabled = os.environ.get("CHATBOT_ARTIFACTS", "1") not in ("", "0", "false")
+        if max_per_test is None:
+            max_per_test = int(os.environ.get("CHATBOT_ARTIFACT_LIMIT", 5))
+        self.driver = driver
+        self.enabled = enabled
+        self.max_per_test = max_per_test
+        self.max_snapshot_bytes = max_snapshot_bytes
+        self.shadow_host = shadow_host
+        self.directory = os.path.join(
+            root or os.environ.get("CHATBOT_ARTIFACT_DIR", "artifacts"),
+            f"worker-{os.getpid()}", _safe_name(test_id)
+        )
+        self.captured = 0
+
+    def snapshot(self):
+        """Return the page and shadow DOM in a single WebDriver call"""
+        return self.driver.execute_script(
+            SNAPSHOT_SCRIPT, self.shadow_host, self.max_snapshot_bytes
+        ) or {}
+
+    def elements(self):
+        """Return just the shadow DOM element list, without the page's HTML"""
+        return self.driver.execute_script(
+            ELEMENTS_SCRIPT + "return { found: !!root, elements: elements, truncated: truncated };",
+            self.shadow_host, self.max_snapshot_bytes
+        ) or {}
+
+    def capture(self, name):
+        """
+        Capture a screenshot and DOM snapshot and queue them for writing.
+
+        Never raises, so it is safe to call from exception handlers.
+
+        Args:
+            name (str): Artifact name, used in the file names
+
+        Returns:
+            str: The path prefix the artifacts will be written to, or None if skipped
+        """
+        if not self.enabled or self.captured >= self.max_per_test:
+            return None
+        writer = get_writer()
+        if writer.full():
+            return None
+        self.captured += 1
+        base = os.path.join(self.directory, f"{self.captured:02d}-{_safe_name(name)}")
+
+        try:
+            screenshot = self.driver.get_screenshot_as_base64()
+            writer.submit(base + ".png", lambda: base64.b64decode(screenshot))
+        except Exception as e:
+            print(f"Could not take screenshot for {name}: {str(e)}")
+        try:
+            snapshot = self.snapshot()
+            writer.submit(base + ".json.gz", lambda: gzip.compress(
+                json.dumps(snapshot, indent=1).encode("utf-8")
+            ))
+        except Exception as e:
+            print(f"Could not snapshot DOM for {name}: {str(e)}")
+        print(f"Saving failure artifacts to {base}.*")
+        return base
+
+    def attach(self, name, data):
+        """
+        Queue a JSON attachment, such as the browser log, for this test.
+
+        Unlike capture() it makes no browser calls and does not count
+        against max_per_test.
+
+        Returns:
+            str: The path the attachment will be written to, or None if skipped
+        """
+        if not self.enabled:
+            return None
+        path = os.path.join(self.directory, f"{_safe_name(name)}.json.gz")
+        if not get_writer().submit(path, lambda: gzip.compress(json.dumps(data, indent=1).encode("utf-8"))):
+            return None
+        print(f"Saving {name} to {path}")
+        return path
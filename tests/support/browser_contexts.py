@@ -0,0 +1,195 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from selenium.webdriver.remote.command import Command
+from ..pages.chatbot_page import ChatbotPage
+from .session_pool import headless_chrome
+
+
+class BrowserHost:
+    """
+    One Chrome process shared by several isolated browser contexts.
+
+    Each context is created with CDP Target.createBrowserContext, so it has
+    its own cookies, storage and cache, like a separate incognito window.
+    WebDriver drives one window at a time, so every command is sent under a
+    lock after switching to the calling thread's active context. Sessions
+    on one host therefore share a command queue: they save memory, not
+    WebDriver round trips. ChromeDriver runs one command per session at a
+    time, so while one session sits in an async wait (up to the response
+    timeout, 30 s by default) the others on its host wait too. Releasing
+    the lock would not help; use few sessions per browser when waits are long.
+
+    Args:
+        factory (callable): Launches the shared WebDriver
+    """
+
+    def __init__(self, factory=headless_chrome):
+        self.driver = factory()
+        self.contexts = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # The first tab, in the default context, takes commands from threads
+        # with no active context, such as creating and closing contexts
+        self.default_handle = self.driver.current_window_handle
+        self._current = self.default_handle
+        self._execute = self.driver.execute
+        self.driver.execute = self._execute_in_context
+        self.stats = {"commands": 0, "switches": 0}
+
+    def _execute_in_context(self, driver_command, params=None):
+        handle = getattr(self._local, "handle", None) or self.default_handle
+        with self._lock:
+            if handle != self._current:
+                self._execute(Command.SWITCH_TO_WINDOW, {"handle": handle})
+                self._current = handle
+                self.stats["switches"] += 1
+            self.stats["commands"] += 1
+            result = self._execute(driver_command, params)
+            if driver_command == Command.SWITCH_TO_WINDOW:
+                self._current = params["handle"]
+            return result
+
+    def new_context(self, url="about:blank"):
+        """Open a tab in a fresh browser context and return its BrowserContext"""
+        with self._lock:
+            before = set(self._execute(Command.W3C_GET_WINDOW_HANDLES)["value"])
+        context_id = self.driver.execute_cdp_cmd(
+            "Target.createBrowserContext", {}
+        )["browserContextId"]
+        target_id = self.driver.execute_cdp_cmd(
+            "Target.createTarget", {"url": url, "browserContextId": context_id}
+        )["targetId"]
+        with self._lock:
+            handles = self._execute(Command.W3C_GET_WINDOW_HANDLES)["value"]
+        # ChromeDriver names windows after their target ids; fall back to
+        # the window that just appeared
+        handle = target_id if target_id in handles else next(iter(set(handles) - before), None)
+        if handle is None:
+            raise Exception(f"No window found for browser context {context_id}")
+        context = BrowserContext(self, context_id, target_id, handle)
+        self.contexts.append(context)
+        return context
+
+    def activate(self, handle):
+        """Send this thread's commands to the window with handle (None for the default)"""
+        self._local.handle = handle
+
+    def close(self):
+        for context in list(self.contexts):
+            context.close()
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class BrowserContext:
+    """An isolated tab on a BrowserHost; use as a context manager to drive it"""
+
+    def __init__(self, host, context_id, target_id, handle):
+        self.host = host
+        self.context_id = context_id
+        self.target_id = target_id
+        self.handle = handle
+
+    @property
+    def driver(self):
+        return self.host.driver
+
+    def __enter__(self):
+        self.host.activate(self.handle)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.host.activate(None)
+
+    def close(self):
+        """Close the tab and dispose of the context's cookies and storage"""
+        if self in self.host.contexts:
+            self.host.contexts.remove(self)
+        self.host.activate(None)
+        try:
+            self.driver.execute_cdp_cmd("Target.closeTarget", {"targetId": self.target_id})
+            self.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": self.context_id})
+        except Exception as e:
+            print(f"Could not dispose browser context {self.context_id}: {str(e)}")
+
+
+class ContextScheduler:
+    """
+    Run many chatbot sessions concurrently over a few browser processes.
+
+    `sessions` worker threads each drive one ChatbotPage at a time, every
+    job in a fresh browser context, so lead forms and chat histories never
+    leak between jobs. Workers are spread over
+    ceil(sessions / sessions_per_browser) BrowserHosts.
+
+    Sessions on one host take turns: while one waits for a reply, the
+    others on that host are blocked (see BrowserHost). Only
+    ceil(sessions / sessions_per_browser) waits really run at once, so the
+    default keeps two sessions per browser. Raise it only when memory
+    matters more than latency, e.g. for fast stub replies.
+
+    Args:
+        sessions (int): Concurrent chatbot sessions
+        sessions_per_browser (int): Contexts per Chrome process,
+                                    CHATBOT_SESSIONS_PER_BROWSER or 2
+        factory (callable): Launches each browser
+        page_factory (callable): Builds the page object for a driver
+    """
+
+    def __init__(self, sessions, sessions_per_browser=None, factory=headless_chrome, page_factory=ChatbotPage):
+        if sessions_per_browser is None:
+            sessions_per_browser = int(os.environ.get("CHATBOT_SESSIONS_PER_BROWSER", 2))
+        self.sessions = sessions
+        self.sessions_per_browser = max(sessions_per_browser, 1)
+        self.factory = factory
+        self.page_factory = page_factory
+        self.hosts = []
+        self._slots = queue.Queue()
+
+    def start(self):
+        """Launch the browsers concurrently"""
+        count = -(-self.sessions // self.sessions_per_browser)
+        with ThreadPoolExecutor(count) as executor:
+            self.hosts = list(executor.map(lambda _: BrowserHost(self.factory), range(count)))
+        for slot in range(self.sessions):
+            self._slots.put(self.hosts[slot // self.sessions_per_browser])
+        return self
+
+    def run(self, job, count):
+        """
+        Run job(page, index) for index in range(count), `sessions` at a time.
+
+        Returns:
+            list: Each job's return value, or the exception it raised, in index order
+        """
+        with ThreadPoolExecutor(self.sessions) as executor:
+            return list(executor.map(lambda index: self._run_one(job, index), range(count)))
+
+    def _run_one(self, job, index):
+        host = self._slots.get()
+        try:
+            context = host.new_context()
+            try:
+                with context:
+                    return job(self.page_factory(context.driver), index)
+            finally:
+                context.close()
+        except Exception as e:
+            print(f"Session {index} failed: {str(e)}")
+            return e
+        finally:
+            self._slots.put(host)
+
+    def close(self):
+        for host in self.hosts:
+            host.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
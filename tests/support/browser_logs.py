@@ -0,0 +1,170 @@
+import collections
+import os
+import threading
+import time
+
+# Longest message kept per entry; stack dumps and outerHTML are cut here
+MAX_TEXT = 2000
+
+
+def _entry(level, source, text, timestamp=None):
+    return {
+        "time": timestamp if timestamp is not None else time.time(),
+        "level": level,
+        "source": source,
+        "text": text[:MAX_TEXT],
+    }
+
+
+def _remote_text(value):
+    """Render a CDP RemoteObject the way the console would"""
+    if value.value is not None:
+        return str(value.value)
+    return value.description or value.type_
+
+
+class BrowserLogCollector:
+    """
+    Keeps the most recent browser console messages and JS errors for a driver.
+
+    A daemon thread streams Runtime.consoleAPICalled, Runtime.exceptionThrown
+    and Log.entryAdded over the driver's CDP connection into a bounded
+    buffer, so nothing is fetched from the browser until a test fails. When
+    the connection cannot be opened the collector falls back to draining
+    chromedriver's browser log on demand.
+
+    Args:
+        driver: The WebDriver to collect from
+        limit (int): Entries kept, CHATBOT_BROWSER_LOG_LIMIT or 200
+    """
+
+    def __init__(self, driver, limit=None):
+        if limit is None:
+            limit = int(os.environ.get("CHATBOT_BROWSER_LOG_LIMIT", 200))
+        self.driver = driver
+        self.limit = limit
+        self.streaming = False
+        self.stats = {"received": 0, "polled": 0}
+        self._entries = collections.deque(maxlen=limit)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._cancel = None
+        self._token = None
+        self._ready = threading.Event()
+
+    def start(self, timeout=5):
+        """Start streaming; returns False when only polling is available"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="browser-logs", daemon=True)
+            self._thread.start()
+            self._ready.wait(timeout)
+        return self.streaming
+
+    def stop(self):
+        """Close the CDP connection, if one is open"""
+        if self._cancel is not None and self._token is not None:
+            import trio
+            try:
+                trio.from_thread.run_sync(self._cancel.cancel, trio_token=self._token)
+            except Exception:
+                pass  # The connection already closed with the browser
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def add(self, level, source, text, timestamp=None):
+        with self._lock:
+            self._entries.append(_entry(level, source, text, timestamp))
+        self.stats["received"] += 1
+
+    def entries(self):
+        """Return the buffered entries, oldest first"""
+        if not self.streaming:
+            self._poll()
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        """Drop everything collected so far, e.g. between tests on a reused session"""
+        if not self.streaming:
+            self._poll()
+        with self._lock:
+            self._entries.clear()
+
+    def _poll(self):
+        try:
+            logs = self.driver.get_log("browser")
+        except Exception as e:
+            print(f"Could not read the browser log: {str(e)}")
+            return
+        for log in logs:
+            self.add(log.get("level", "INFO").lower(), log.get("source", "console"),
+                     log.get("message", ""), log.get("timestamp", 0) / 1000.0)
+        self.stats["polled"] += len(logs)
+
+    def _run(self):
+        try:
+            import trio
+            trio.run(self._stream)
+        except Exception as e:
+            print(f"Browser log streaming stopped, polling instead: {str(e)}")
+        finally:
+            self.streaming = False
+            self._ready.set()
+
+    async def _stream(self):
+        import trio
+        async with self.driver.bidi_connection() as connection:
+            session, devtools = connection.session, connection.devtools
+            await session.execute(devtools.runtime.enable())
+            await session.execute(devtools.log.enable())
+            events = session.listen(
+                devtools.runtime.ConsoleAPICalled,
+                devtools.runtime.ExceptionThrown,
+                devtools.log.EntryAdded,
+                buffer_size=self.limit,
+            )
+            with trio.CancelScope() as scope:
+                self._cancel = scope
+                self._token = trio.lowlevel.current_trio_token()
+                self.streaming = True
+                self._ready.set()
+                async for event in events:
+                    self._record(event, devtools)
+
+    def _record(self, event, devtools):
+        if isinstance(event, devtools.runtime.ConsoleAPICalled):
+            text = " ".join(_remote_text(arg) for arg in event.args)
+            self.add(event.type_, "console", text, event.timestamp / 1000.0)
+        elif isinstance(event, devtools.runtime.ExceptionThrown):
+            details = event.exception_details
+            text = details.text
+            if details.exception and details.exception.description:
+                text = details.exception.description
+            location = f" ({details.url}:{details.line_number + 1})" if details.url else ""
+            self.add("error", "exception", text + location, event.timestamp / 1000.0)
+        else:
+            entry = event.entry
+            self.add(entry.level, entry.source, entry.text, entry.timestamp / 1000.0)
+
+
+_collectors = {}
+_collectors_lock = threading.Lock()
+
+
+def get_collector(driver):
+    """Return the driver's collector, starting it on first use so pooled sessions share one"""
+    with _collectors_lock:
+        collector = _collectors.get(id(driver))
+        if collector is None or collector.driver is not driver:
+            collector = BrowserLogCollector(driver)
+            _collectors[id(driver)] = collector
+            collector.start()
+        return collector
+
+
+def stop_collector(driver):
+    """Stop and forget the driver's collector, before the driver quits"""
+    with _collectors_lock:
+        collector = _collectors.pop(id(driver), None)
+    if collector:
+        collector.stop()
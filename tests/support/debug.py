@@ -0,0 +1,75 @@
+import json
+import os
+
+# Serializes the page's elements in the browser, stopping once the payload
+# reaches the size cap so large pages never ship megabytes over the wire.
+_PAGE_ELEMENTS_SCRIPT = """
+    const maxBytes = arguments[0];
+    const elements = [];
+    let size = 0;
+    for (const el of document.querySelectorAll('*')) {
+        const entry = {
+            tagName: el.tagName,
+            id: el.id,
+            className: typeof el.className === 'string' ? el.className : '',
+            attributes: Array.from(el.attributes).map(attr => `${attr.name}=${attr.value}`)
+        };
+        size += JSON.stringify(entry).length;
+        if (size > maxBytes) return { elements: elements, truncated: true };
+        elements.push(entry);
+    }
+    return { elements: elements, truncated: false };
+"""
+
+
+class DebugSnapshots:
+    """Opt-in DOM snapshots written to an artifact directory.
+
+    Disabled by default; set CHATBOT_DEBUG=1 (or pass enabled=True) to turn
+    it on. Snapshots are only collected when enabled, each one is capped at
+    max_bytes and capture stops once max_total_bytes have been written.
+    """
+
+    def __init__(self, driver, enabled=None, artifact_dir=None,
+                 max_bytes=256 * 1024, max_total_bytes=20 * 1024 * 1024):
+        if enabled is None:
+            enabled = os.environ.get("CHATBOT_DEBUG", "") not in ("", "0", "false")
+        self.driver = driver
+        self.enabled = enabled
+        self.artifact_dir = artifact_dir or os.environ.get("CHATBOT_DEBUG_DIR", "debug_artifacts")
+        self.max_bytes = max_bytes
+        self.max_total_bytes = max_total_bytes
+        self.written = 0
+        self._sequence = 0
+
+    def capture(self, name, collect):
+        """
+        Collect and write a snapshot when debug mode is on.
+
+        Args:
+            name (str): Snapshot name, used in the file name
+            collect (callable): Returns the snapshot; only called when enabled
+
+        Returns:
+            str: Path of the written file, or None if nothing was written
+        """
+        if not self.enabled or self.written >= self.max_total_bytes:
+            return None
+        data = collect()
+        payload = data if isinstance(data, str) else json.dumps(data, indent=1, default=str)
+        payload = payload[:self.max_bytes]
+
+        os.makedirs(self.artifact_dir, exist_ok=True)
+        self._sequence += 1
+        extension = "txt" if isinstance(data, str) else "json"
+        path = os.path.join(self.artifact_dir, f"{self._sequence:04d}-{name}.{extension}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        self.written += len(payload)
+        return path
+
+    def capture_page_elements(self, name="page_elements"):
+        """Snapshot every element on the page, capped at max_bytes"""
+        return self.capture(
+            name, lambda: self.driver.execute_script(_PAGE_ELEMENTS_SCRIPT, self.max_bytes)
+        )
@@ -0,0 +1,91 @@
+from selenium.common.exceptions import StaleElementReferenceException
+
+HANDLE_NAMES = ("shadow_root", "chat_view", "chat_input", "send_button")
+
+# Resolves every handle in one round trip and stamps the page with the
+# cache generation so a reload or navigation can be detected cheaply.
+_RESOLVE_SCRIPT = """
+    const host = document.querySelector(arguments[0]);
+    window.__chatbotHandleGeneration = arguments[1];
+    if (!host || !host.shadowRoot) return null;
+    const root = host.shadowRoot;
+    const sendIcon = root.querySelector('button svg.send-icon');
+    return {
+        shadow_root: root,
+        chat_view: root.querySelector('.chatbot-chat-view'),
+        chat_input: root.querySelector('textarea.text-input'),
+        send_button: sendIcon ? sendIcon.closest('button') : null
+    };
+"""
+
+_GENERATION_SCRIPT = "return window.__chatbotHandleGeneration || null;"
+
+
+class HandleCache:
+    """Per-page cache of the chatbot's shadow root and key element handles.
+
+    Handles are resolved together in a single script call and reused until
+    they go stale or the page navigates, which is detected by comparing the
+    generation stamped into the page with the cache's own.
+    """
+
+    def __init__(self, driver, host="flowise-fullchatbot"):
+        self.driver = driver
+        self.host = host
+        self.generation = 0
+        self._handles = {}
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "invalidations": 0, "resolves": 0}
+
+    def get(self, name):
+        """Return the cached handle, resolving all handles on a miss"""
+        handle = self._handles.get(name)
+        if handle is not None:
+            self.stats["hits"] += 1
+            return handle
+        self.stats["misses"] += 1
+        self._resolve()
+        return self._handles.get(name)
+
+    def peek(self, name):
+        """Return the cached handle or None, without resolving on a miss"""
+        handle = self._handles.get(name)
+        if handle is not None:
+            self.stats["hits"] += 1
+        return handle
+
+    def put(self, name, handle):
+        """Cache a handle located by a fallback strategy"""
+        if handle is not None:
+            self._handles[name] = handle
+
+    def invalidate(self, name=None):
+        """Forget one handle, or all of them"""
+        self.stats["invalidations"] += 1
+        if name is None:
+            self._handles.clear()
+        else:
+            self._handles.pop(name, None)
+
+    def revalidate(self):
+        """Drop every handle if the page navigated since they were resolved"""
+        if not self._handles:
+            return False
+        if self.driver.execute_script(_GENERATION_SCRIPT) != self.generation:
+            self.invalidate()
+            return False
+        return True
+
+    def retry_stale(self, action):
+        """Run action, re-resolving handles and retrying once if one went stale"""
+        try:
+            return action()
+        except StaleElementReferenceException:
+            self.stats["stale"] += 1
+            self.invalidate()
+            return action()
+
+    def _resolve(self):
+        self.generation += 1
+        self.stats["resolves"] += 1
+        handles = self.driver.execute_script(_RESOLVE_SCRIPT, self.host, self.generation)
+        self._handles = {name: handles[name] for name in HANDLE_NAMES if handles and handles.get(name)}
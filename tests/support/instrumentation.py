@@ -0,0 +1,207 @@
+import collections
+import functools
+import inspect
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# WebDriver commands worth telling apart, keyed by the marker Selenium puts
+# at the start of the scripts behind get_attribute and is_displayed
+_SCRIPT_MARKERS = {
+    "/* getAttribute */": "get_attribute",
+    "/* isDisplayed */": "is_displayed",
+}
+_COMMAND_NAMES = {
+    "w3cExecuteScript": "execute_script",
+    "w3cExecuteScriptAsync": "execute_async_script",
+    "findElement": "find_element",
+    "findChildElement": "find_element",
+    "findElementFromShadowRoot": "find_element",
+    "findElements": "find_elements",
+    "findChildElements": "find_elements",
+    "findElementsFromShadowRoot": "find_elements",
+    "getElementText": "text",
+    "getElementAttribute": "get_attribute",
+}
+
+UNTRACKED = "(untracked)"
+
+
+def command_name(driver_command, params):
+    """Map a raw WebDriver command to the Selenium API call that issued it"""
+    if driver_command == "w3cExecuteScript" and params:
+        script = params.get("script", "")
+        for marker, name in _SCRIPT_MARKERS.items():
+            if script.startswith(marker):
+                return name
+    return _COMMAND_NAMES.get(driver_command, driver_command)
+
+
+class StepStats:
+    """Counters for one call path through the page object"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.wall = 0.0
+        self.command_time = 0.0
+        self.wait_time = 0.0
+        self.retries = 0
+        self.commands = collections.Counter()
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "wall": self.wall,
+            "command_time": self.command_time,
+            "wait_time": self.wait_time,
+            "retries": self.retries,
+            "commands": dict(self.commands),
+        }
+
+
+class Instrumentation:
+    """
+    Records where a test's time goes inside the page object.
+
+    Every WebDriver command is counted and timed against the page-object
+    method that issued it, keyed by the full call path so nested steps can
+    be rendered as a flamegraph. Time spent in async scripts is reported as
+    waiting, since the page object's waits are all async scripts.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.steps = collections.defaultdict(StepStats)
+        self._stack = []
+        self._execute = driver.execute
+        # An instance attribute shadows WebDriver.execute, which every
+        # driver, element and shadow root command goes through
+        driver.execute = self._instrumented_execute
+
+    def detach(self):
+        """Stop recording and restore the driver, e.g. before it is pooled"""
+        if self.driver.__dict__.get("execute") == self._instrumented_execute:
+            del self.driver.execute
+
+    def instrument(self, page):
+        """Wrap every public method of a page object in a step"""
+        # Private helpers such as _retry are part of the step that called
+        # them; wrapping them would credit their commands and retries to a
+        # step of their own
+        for name, _ in inspect.getmembers(type(page), inspect.isfunction):
+            if not name.startswith("_"):
+                setattr(page, name, self._wrap(name, getattr(page, name)))
+        page.instrumentation = self
+        return page
+
+    @contextmanager
+    def step(self, name):
+        """Attribute everything inside the block to the step `name`"""
+        self._stack.append(name)
+        stats = self.steps[tuple(self._stack)]
+        started = time.perf_counter()
+        try:
+            yield stats
+        except BaseException:
+            stats.errors += 1
+            raise
+        finally:
+            stats.calls += 1
+            stats.wall += time.perf_counter() - started
+            self._stack.pop()
+
+    def count_retry(self):
+        self._current().retries += 1
+
+    def report(self, test_id=None):
+        """Return the recorded steps with self time, ready to be written as JSON"""
+        steps = []
+        for path, stats in sorted(self.steps.items()):
+            children = sum(
+                child.wall for child_path, child in self.steps.items()
+                if len(child_path) == len(path) + 1 and child_path[:-1] == path
+            )
+            entry = stats.as_dict()
+            entry["path"] = list(path)
+            entry["self"] = max(stats.wall - children, 0.0)
+            steps.append(entry)
+        return {"test": test_id, "steps": steps}
+
+    def folded_stacks(self):
+        """Return the report in folded-stack format (flamegraph.pl, speedscope)"""
+        lines = []
+        for step in self.report()["steps"]:
+            micros = int(step["self"] * 1e6)
+            if micros:
+                lines.append(f"{';'.join(step['path'])} {micros}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory, test_id):
+        """Write <test_id>.json and <test_id>.folded to directory"""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, test_id)
+        with open(base + ".json", "w") as f:
+            json.dump(self.report(test_id), f, indent=2)
+        with open(base + ".folded", "w") as f:
+            f.write(self.folded_stacks())
+        return base + ".json"
+
+    def _current(self):
+        return self.steps[tuple(self._stack) or (UNTRACKED,)]
+
+    def _wrap(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with self.step(name):
+                return method(*args, **kwargs)
+        return wrapper
+
+    def _instrumented_execute(self, driver_command, params=None):
+        started = time.perf_counter()
+        try:
+            return self._execute(driver_command, params)
+        finally:
+            elapsed = time.perf_counter() - started
+            stats = self._current()
+            stats.commands[command_name(driver_command, params)] += 1
+            stats.command_time += elapsed
+            if driver_command == "w3cExecuteScriptAsync":
+                stats.wait_time += elapsed
+
+
+class InstrumentationSummary:
+    """Totals per page-object method across every instrumented test"""
+
+    def __init__(self):
+        self.totals = collections.defaultdict(StepStats)
+        self.tests = 0
+
+    def add(self, instrumentation):
+        self.tests += 1
+        for entry in instrumentation.report()["steps"]:
+            total = self.totals[entry["path"][-1]]
+            total.calls += entry["calls"]
+            total.errors += entry["errors"]
+            total.wall += entry["self"]
+            total.command_time += entry["command_time"]
+            total.wait_time += entry["wait_time"]
+            total.retries += entry["retries"]
+            total.commands.update(entry["commands"])
+
+    def print_table(self):
+        if not self.tests:
+            return
+        print(f"\n=== Page object time across {self.tests} tests (self time) ===")
+        print(f"{'step':<26}{'calls':>6}{'wall':>9}{'wait':>9}{'cmds':>6}{'retry':>6}  top commands")
+        ordered = sorted(self.totals.items(), key=lambda item: item[1].wall, reverse=True)
+        for name, total in ordered:
+            top = ", ".join(f"{cmd}={n}" for cmd, n in total.commands.most_common(3))
+            print(f"{name:<26}{total.calls:>6}{total.wall:>8.2f}s{total.wait_time:>8.2f}s"
+                  f"{sum(total.commands.values()):>6}{total.retries:>6}  {top}")
+
+
+# Collects every instrumented test in this process for the end-of-run table
+SUMMARY = InstrumentationSummary()
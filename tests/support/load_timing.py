@@ -0,0 +1,293 @@
+import collections
+import json
+import os
+import statistics
+import time
+from urllib.parse import urlparse
+
+# Installed on every new document before any page script runs: marks when
+# the widget's custom element is defined, when it attaches its shadow root
+# and when the shadow root first renders (SHADOW_ROOT_RENDERED).
+_MARKS_SCRIPT = """
+(function () {
+    const host = %s;
+    const marks = window.__chatbotLoadMarks = { defined: null, shadowAttached: null, shadowReady: null };
+    customElements.whenDefined(host).then(() => { marks.defined = performance.now(); });
+    const attachShadow = Element.prototype.attachShadow;
+    Element.prototype.attachShadow = function (init) {
+        const root = attachShadow.call(this, init);
+        if (this.localName === host && marks.shadowAttached === null) {
+            marks.shadowAttached = performance.now();
+            const observer = new MutationObserver(() => {
+                if (root.childElementCount > 0) {
+                    marks.shadowReady = performance.now();
+                    observer.disconnect();
+                }
+            });
+            observer.observe(root, { childList: true });
+        }
+        return root;
+    };
+})();
+"""
+
+# Reads the navigation, paint and resource entries plus the widget marks
+_COLLECT_SCRIPT = """
+    const maxResources = arguments[0];
+    const nav = performance.getEntriesByType('navigation')[0];
+    const paints = {};
+    for (const entry of performance.getEntriesByType('paint')) paints[entry.name] = entry.startTime;
+    const types = ['script', 'link', 'css', 'fetch', 'xmlhttprequest'];
+    const resources = performance.getEntriesByType('resource')
+        .filter(r => types.includes(r.initiatorType))
+        .slice(0, maxResources)
+        .map(r => ({
+            url: r.name,
+            type: r.initiatorType,
+            start: r.startTime,
+            duration: r.duration,
+            size: r.transferSize || 0
+        }));
+    return {
+        navigation: nav ? {
+            responseStart: nav.responseStart,
+            domContentLoaded: nav.domContentLoadedEventEnd,
+            loadEvent: nav.loadEventEnd
+        } : null,
+        paints: paints,
+        marks: window.__chatbotLoadMarks || null,
+        resources: resources
+    };
+"""
+
+# Metrics in the order they happen during a load
+METRICS = (
+    "ttfb",
+    "first_paint",
+    "first_contentful_paint",
+    "dom_content_loaded",
+    "widget_defined",
+    "shadow_attached",
+    "shadow_ready",
+    "load_event",
+)
+
+# Seconds from navigation start; generous enough for the hosted widget,
+# which used to get a fixed five second sleep
+DEFAULT_LOAD_BUDGETS = {
+    "ttfb": 1.0,
+    "first_contentful_paint": 2.5,
+    "widget_defined": 3.0,
+    "shadow_ready": 5.0,
+}
+
+
+def _seconds(value):
+    """Convert a performance timestamp to seconds; 0 means it has not happened"""
+    return value / 1000.0 if value else None
+
+
+class LoadTiming:
+    """
+    Timing of one chatbot page load, measured inside the page.
+
+    All times are in seconds from navigation start. Widget marks are None
+    when the driver has no CDP support to install the marks script.
+
+    Attributes:
+        ttfb: Until the first byte of the page arrived
+        first_paint, first_contentful_paint: Paint timing entries
+        dom_content_loaded, load_event: Navigation timing events
+        widget_defined: Until the flowise-fullchatbot element was defined
+        shadow_attached: Until the widget attached its shadow root
+        shadow_ready: Until the shadow root first rendered
+        resources: The widget's script, stylesheet and API requests
+    """
+
+    def __init__(self, data):
+        navigation = data.get("navigation") or {}
+        paints = data.get("paints") or {}
+        marks = data.get("marks") or {}
+        self.ttfb = _seconds(navigation.get("responseStart"))
+        self.dom_content_loaded = _seconds(navigation.get("domContentLoaded"))
+        self.load_event = _seconds(navigation.get("loadEvent"))
+        self.first_paint = _seconds(paints.get("first-paint"))
+        self.first_contentful_paint = _seconds(paints.get("first-contentful-paint"))
+        self.widget_defined = _seconds(marks.get("defined"))
+        self.shadow_attached = _seconds(marks.get("shadowAttached"))
+        self.shadow_ready = _seconds(marks.get("shadowReady"))
+        self.resources = [
+            {
+                "url": r["url"],
+                "type": r["type"],
+                "start": r["start"] / 1000.0,
+                "duration": r["duration"] / 1000.0,
+                "size": r["size"],
+            }
+            for r in sorted(data.get("resources") or [], key=lambda r: r["start"])
+        ]
+
+    def metrics(self):
+        return {name: getattr(self, name) for name in METRICS}
+
+    def violations(self, budgets):
+        """
+        Check the timing against budgets.
+
+        Args:
+            budgets (dict): Metric name to the most seconds allowed
+
+        Returns:
+            list: A description of every budget that was exceeded
+        """
+        problems = []
+        for name, budget in budgets.items():
+            value = getattr(self, name)
+            if value is None:
+                print(f"No {name} measured, skipping its budget")
+            elif value > budget:
+                problems.append(f"{name} {value:.2f}s > {budget}s")
+        return problems
+
+    def waterfall(self, width=40):
+        """Return one line per widget request, with a bar for when it ran"""
+        if not self.resources:
+            return ["(no widget requests recorded)"]
+        end = max(r["start"] + r["duration"] for r in self.resources) or 1
+        lines = []
+        for r in self.resources:
+            offset = int(r["start"] / end * width)
+            length = max(int(r["duration"] / end * width), 1)
+            bar = (" " * offset + "=" * length).ljust(width)[:width]
+            path = urlparse(r["url"]).path or r["url"]
+            lines.append(f"{r['start'] * 1000:>7.0f}ms {r['duration'] * 1000:>6.0f}ms "
+                         f"{r['type']:<14} |{bar}| {path[-50:]}")
+        return lines
+
+    def as_dict(self):
+        return dict(self.metrics(), resources=self.resources)
+
+    def __repr__(self):
+        return f"LoadTiming({self.metrics()})"
+
+
+def load_budgets(overrides=None):
+    """
+    Return DEFAULT_LOAD_BUDGETS updated from CHATBOT_LOAD_BUDGETS and overrides.
+
+    CHATBOT_LOAD_BUDGETS is a comma separated list such as
+    "shadow_ready=3,ttfb=0.5".
+    """
+    budgets = dict(DEFAULT_LOAD_BUDGETS)
+    for item in filter(None, os.environ.get("CHATBOT_LOAD_BUDGETS", "").split(",")):
+        name, _, value = item.partition("=")
+        if name.strip() not in METRICS:
+            raise Exception(f"Unknown load metric in CHATBOT_LOAD_BUDGETS: {name}")
+        budgets[name.strip()] = float(value)
+    budgets.update(overrides or {})
+    return budgets
+
+
+class LoadHistory:
+    """
+    Past load timings in a JSON lines file, for spotting slow regressions.
+
+    A metric regresses when it is more than `tolerance` slower than the
+    median of the last `window` loads of the same key, and by at least
+    `min_delta` seconds so that jitter on fast metrics is ignored. Keys
+    should be stable across runs, such as ChatbotTarget.key. Once the file
+    holds more than max_entries loads the oldest are dropped, so reads stay
+    cheap.
+
+    Args:
+        path (str): History file, CHATBOT_LOAD_HISTORY or load_history.jsonl
+    """
+
+    def __init__(self, path=None, window=20, min_runs=5, tolerance=0.5, min_delta=0.1, max_entries=2000):
+        self.path = path or os.environ.get("CHATBOT_LOAD_HISTORY", "load_history.jsonl")
+        self.window = window
+        self.min_runs = min_runs
+        self.tolerance = tolerance
+        self.min_delta = min_delta
+        self.max_entries = max_entries
+
+    def recent(self, key):
+        """Return the last `window` recorded loads for key, oldest first"""
+        entries = collections.deque(maxlen=self.window)
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("key") == key:
+                    entries.append(entry)
+        return list(entries)
+
+    def record(self, key, timing):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"time": time.time(), "key": key, "metrics": timing.metrics()}) + "\n")
+        self._rotate()
+
+    def _rotate(self):
+        """Keep the newest half of max_entries once the file holds more than max_entries"""
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.readlines()
+        if len(lines) <= self.max_entries:
+            return
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as f:
+                f.writelines(lines[-(self.max_entries // 2):])
+            os.replace(temporary, self.path)
+        except OSError as e:
+            print(f"Could not rotate load history: {str(e)}")
+
+    def regressions(self, key, timing):
+        """
+        Compare a timing with the recent history of key.
+
+        Returns:
+            list: A description of every metric that regressed; empty until
+                  min_runs loads have been recorded
+        """
+        recent = self.recent(key)
+        if len(recent) < self.min_runs:
+            return []
+        problems = []
+        for name, value in timing.metrics().items():
+            past = [e["metrics"].get(name) for e in recent if e["metrics"].get(name) is not None]
+            if value is None or len(past) < self.min_runs:
+                continue
+            median = statistics.median(past)
+            if value > median * (1 + self.tolerance) and value - median >= self.min_delta:
+                problems.append(f"{name} {value:.2f}s regressed from a median of {median:.2f}s "
+                                f"over the last {len(past)} loads")
+        return problems
+
+
+def start_load_timing(driver, host):
+    """Install the widget marks for the next navigation; returns the CDP script id or None"""
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return None
+    try:
+        result = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+            "source": _MARKS_SCRIPT % json.dumps(host),
+        })
+        return result.get("identifier")
+    except Exception as e:
+        print(f"Could not install widget load marks, widget timings will be missing: {str(e)}")
+        return None
+
+
+def collect_load_timing(driver, script_id=None, max_resources=50):
+    """Read the timing of the current page and remove the marks script"""
+    if script_id is not None:
+        try:
+            driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+        except Exception as e:
+            print(f"Could not remove widget load marks: {str(e)}")
+    return LoadTiming(driver.execute_script(_COLLECT_SCRIPT, max_resources) or {})
@@ -0,0 +1,80 @@
+import json
+import os
+import threading
+from .targets import target_key
+
+DEFAULT_CACHE_PATH = ".chatbot_locators.json"
+
+
+def locator_key(url):
+    """Key rankings by target (see target_key), or by CHATBOT_LOCATOR_KEY (e.g. a Flowise version)"""
+    return os.environ.get("CHATBOT_LOCATOR_KEY") or target_key(url)
+
+
+class LocatorStrategies:
+    """
+    Remembers which selector last found each logical element and tries it first.
+
+    Rankings are kept per key (chatbot target or Flowise version) for each
+    logical element such as "chat_input" or "send_button", and persisted
+    to a JSON file so later runs start warm. A selector that finds the
+    element moves to the front; one that fails moves to the back.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path=None, key="default"):
+        self.path = path or os.environ.get("CHATBOT_LOCATOR_CACHE", DEFAULT_CACHE_PATH)
+        self.key = key
+        self.stats = {"first_try": 0, "fallback": 0}
+        self._rankings = self._read()
+
+    def set_key(self, key):
+        self.key = key
+
+    def ranked(self, element, selectors):
+        """Return selectors with the learned ranking first, then the rest in default order"""
+        learned = [s for s in self._rankings.get(self.key, {}).get(element, []) if s in selectors]
+        return learned + [s for s in selectors if s not in learned]
+
+    def succeeded(self, element, selector, selectors):
+        """Record that selector found element; selectors is the list that was tried"""
+        if selector not in selectors:
+            return
+        ranking = self.ranked(element, selectors)
+        if ranking and ranking[0] == selector:
+            self.stats["first_try"] += 1
+            return
+        self.stats["fallback"] += 1
+        self._set(element, [selector] + [s for s in ranking if s != selector])
+
+    def failed(self, element, selector, selectors):
+        """Demote a selector whose element turned out to be unusable"""
+        ranking = self.ranked(element, selectors)
+        if selector in ranking:
+            self._set(element, [s for s in ranking if s != selector] + [selector])
+
+    def _set(self, element, ranking):
+        self._rankings.setdefault(self.key, {})[element] = ranking
+        self._write()
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self):
+        # Merge with what other workers wrote, then replace the file atomically
+        with self._lock:
+            stored = self._read()
+            stored.setdefault(self.key, {}).update(self._rankings.get(self.key, {}))
+            self._rankings = stored
+            temporary = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(temporary, "w", encoding="utf-8") as f:
+                    json.dump(stored, f, indent=2)
+                os.replace(temporary, self.path)
+            except OSError as e:
+                print(f"Could not save locator rankings: {str(e)}")
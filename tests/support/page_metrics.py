@@ -0,0 +1,58 @@
+import time
+
+# Counts nodes in the document and inside the chatbot's shadow root, and
+# reads the JS heap where Chrome exposes performance.memory
+_PAGE_METRICS_SCRIPT = """
+    const host = document.querySelector(arguments[0]);
+    const root = host && host.shadowRoot;
+    const memory = performance.memory;
+    return {
+        documentNodes: document.getElementsByTagName('*').length,
+        shadowNodes: root ? root.querySelectorAll('*').length : null,
+        heapUsed: memory ? memory.usedJSHeapSize : null,
+        heapTotal: memory ? memory.totalJSHeapSize : null
+    };
+"""
+
+
+def sample_page_metrics(driver, host="flowise-fullchatbot", collect_garbage=False):
+    """
+    Sample the page's memory and DOM size.
+
+    Uses CDP Performance metrics when the driver supports them, which are
+    exact, and falls back to performance.memory, which Chrome rounds.
+
+    Args:
+        driver: The WebDriver to sample
+        host (str): Tag name of the chatbot's shadow host
+        collect_garbage (bool): Run a full GC first (CDP only) so heap
+                                samples reflect live objects, not garbage
+
+    Returns:
+        dict: heap_used and heap_total in bytes, document_nodes,
+              shadow_nodes, js_listeners (CDP only) and the sample time
+    """
+    page = driver.execute_script(_PAGE_METRICS_SCRIPT, host) or {}
+    sample = {
+        "time": time.time(),
+        "heap_used": page.get("heapUsed"),
+        "heap_total": page.get("heapTotal"),
+        "document_nodes": page.get("documentNodes"),
+        "shadow_nodes": page.get("shadowNodes"),
+        "js_listeners": None,
+    }
+    if hasattr(driver, "execute_cdp_cmd"):
+        try:
+            if collect_garbage:
+                driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+            driver.execute_cdp_cmd("Performance.enable", {})
+            metrics = {
+                m["name"]: m["value"]
+                for m in driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+            }
+            sample["heap_used"] = metrics.get("JSHeapUsedSize", sample["heap_used"])
+            sample["heap_total"] = metrics.get("JSHeapTotalSize", sample["heap_total"])
+            sample["js_listeners"] = metrics.get("JSEventListeners")
+        except Exception as e:
+            print(f"CDP metrics unavailable, using performance.memory: {str(e)}")
+    return sample
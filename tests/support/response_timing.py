@@ -0,0 +1,161 @@
+from .scripts import INNERMOST_JS
+
+# Installed before sending: records a timestamp every time the length of
+# the newest bot bubble changes, and when the user bubble appears.
+_START_SCRIPT = INNERMOST_JS + """
+    const host = document.querySelector(arguments[0]);
+    const userSelector = arguments[1].join(',');
+    const botSelector = arguments[2].join(',');
+    const root = host && host.shadowRoot;
+    const chatView = root && root.querySelector('.chatbot-chat-view');
+    if (!chatView) return false;
+
+    const previous = window.__chatbotResponseTiming;
+    if (previous) previous.observer.disconnect();
+
+    const users = () => innermost(Array.from(chatView.querySelectorAll(userSelector)));
+    const bots = () => innermost(Array.from(chatView.querySelectorAll(botSelector)));
+    const timing = {
+        installedAt: performance.now(),
+        sentAt: null,
+        baseUsers: users().length,
+        baseBots: bots().length,
+        samples: [],
+        lastLength: 0
+    };
+    function record() {
+        const now = performance.now();
+        if (timing.sentAt === null && users().length > timing.baseUsers) timing.sentAt = now;
+        const current = bots();
+        if (current.length <= timing.baseBots) return;
+        const length = (current[current.length - 1].textContent || '').trim().length;
+        if (length !== timing.lastLength) {
+            timing.samples.push([now, length]);
+            timing.lastLength = length;
+        }
+    }
+    timing.observer = new MutationObserver(record);
+    timing.observer.observe(chatView, { childList: true, subtree: true, characterData: true });
+    window.__chatbotResponseTiming = timing;
+    return true;
+"""
+
+# Resolves once the bot bubble has text and has not changed for settleMs.
+_COLLECT_SCRIPT = """
+    const done = arguments[arguments.length - 1];
+    const timeoutMs = arguments[0];
+    const settleMs = arguments[1];
+    const timing = window.__chatbotResponseTiming;
+    if (!timing) return done({ error: 'Response timing was not started' });
+    const started = performance.now();
+    function finish(complete) {
+        timing.observer.disconnect();
+        window.__chatbotResponseTiming = null;
+        done({
+            installedAt: timing.installedAt,
+            sentAt: timing.sentAt,
+            samples: timing.samples,
+            complete: complete
+        });
+    }
+    (function tick() {
+        const now = performance.now();
+        const last = timing.samples.length ? timing.samples[timing.samples.length - 1][0] : null;
+        if (last !== null && timing.lastLength > 0 && now - last >= settleMs) return finish(true);
+        if (now - started >= timeoutMs) return finish(false);
+        setTimeout(tick, 50);
+    })();
+"""
+
+
+class ResponseTiming:
+    """
+    Timing of one bot reply, measured inside the page.
+
+    All durations are in seconds and measured from the moment the user's
+    bubble appeared (or from when timing started, if it never did).
+
+    Attributes:
+        time_to_first_token: Until the bot bubble first had text
+        time_to_complete: Until the bot bubble last changed
+        chars_per_second: Streaming rate after the first token, or None
+                          when the reply arrived in one piece
+        stalls: Gaps between text updates longer than the stall threshold
+        length: Characters in the final reply
+        complete: False if the reply was still changing at the deadline
+        send_offset: From when timing started until the user bubble appeared
+    """
+
+    def __init__(self, data, stall_threshold=0.5):
+        sent = data["sentAt"] if data.get("sentAt") is not None else data["installedAt"]
+        samples = [(t, length) for t, length in data["samples"]]
+        text_samples = [(t, length) for t, length in samples if length > 0]
+        self.complete = bool(data.get("complete"))
+        self.send_offset = (sent - data["installedAt"]) / 1000.0
+        self.samples = [((t - sent) / 1000.0, length) for t, length in samples]
+        self.time_to_first_token = None
+        self.time_to_complete = None
+        self.chars_per_second = None
+        self.stalls = []
+        self.length = samples[-1][1] if samples else 0
+        if not text_samples:
+            return
+
+        first_t, first_length = text_samples[0]
+        last_t = text_samples[-1][0]
+        self.time_to_first_token = (first_t - sent) / 1000.0
+        self.time_to_complete = (last_t - sent) / 1000.0
+        if last_t > first_t:
+            self.chars_per_second = (self.length - first_length) / ((last_t - first_t) / 1000.0)
+        for (previous, _), (current, _) in zip(text_samples, text_samples[1:]):
+            gap = (current - previous) / 1000.0
+            if gap > stall_threshold:
+                self.stalls.append(gap)
+
+    def violations(self, max_ttft=None, max_complete=None, min_chars_per_second=None, max_stall=None):
+        """
+        Check the timing against budgets.
+
+        Returns:
+            list: A description of every budget that was exceeded
+        """
+        problems = []
+        if self.time_to_first_token is None:
+            return ["No response text received"]
+        if max_ttft is not None and self.time_to_first_token > max_ttft:
+            problems.append(f"Time to first token {self.time_to_first_token:.2f}s > {max_ttft}s")
+        if max_complete is not None and self.time_to_complete > max_complete:
+            problems.append(f"Time to complete {self.time_to_complete:.2f}s > {max_complete}s")
+        if (min_chars_per_second is not None and self.chars_per_second is not None
+                and self.chars_per_second < min_chars_per_second):
+            problems.append(f"Streaming rate {self.chars_per_second:.1f} chars/s < {min_chars_per_second}")
+        if max_stall is not None and self.stalls and max(self.stalls) > max_stall:
+            problems.append(f"Stall of {max(self.stalls):.2f}s > {max_stall}s")
+        return problems
+
+    def as_dict(self):
+        return {
+            "time_to_first_token": self.time_to_first_token,
+            "time_to_complete": self.time_to_complete,
+            "chars_per_second": self.chars_per_second,
+            "stalls": self.stalls,
+            "length": self.length,
+            "complete": self.complete,
+            "send_offset": self.send_offset,
+        }
+
+    def __repr__(self):
+        return f"ResponseTiming({self.as_dict()})"
+
+
+def start_response_timing(driver, host, user_selectors, bot_selectors):
+    """Install the in-page recorder; returns False if there is no chat view"""
+    return driver.execute_script(_START_SCRIPT, host, user_selectors, bot_selectors)
+
+
+def collect_response_timing(driver, timeout=30, settle=2.0, stall_threshold=0.5):
+    """Wait for the reply to settle and return its ResponseTiming"""
+    data = driver.execute_async_script(_COLLECT_SCRIPT, int(timeout * 1000), int(settle * 1000))
+    if not data or "error" in data:
+        raise Exception((data or {}).get("error", "Could not collect response timing"))
+    return ResponseTiming(data, stall_threshold=stall_threshold)
@@ -0,0 +1,42 @@
+import os
+
+# JavaScript snippets shared by the scripts the page object injects
+
+# Keeps only the innermost of nested matches. querySelectorAll returns
+# document order, so an element contains another match exactly when the
+# next match is one of its descendants.
+INNERMOST_JS = """
+    function innermost(elements) {
+        return elements.filter((el, i) => !(elements[i + 1] && el.contains(elements[i + 1])));
+    }
+"""
+
+# Levels for the in-page log() helper, most severe first
+LOG_LEVELS = {"off": -1, "error": 0, "warn": 1, "info": 2, "debug": 3}
+
+
+def get_log_level(level=None):
+    """Return the in-page log level: level, CHATBOT_PAGE_LOG_LEVEL or "warn" """
+    level = (level or os.environ.get("CHATBOT_PAGE_LOG_LEVEL", "warn")).lower()
+    if level not in LOG_LEVELS:
+        raise Exception(f"Unknown page log level: {level} (expected one of {', '.join(LOG_LEVELS)})")
+    return level
+
+
+def page_log_js(level):
+    """
+    Return a log(level, message, detail) helper for injected scripts.
+
+    Messages above the level are dropped before anything is built, and a
+    detail passed as a function is only called when the message is kept,
+    so debug dumps cost nothing at the default level.
+    """
+    return """
+    const LOG_LEVELS = { error: 0, warn: 1, info: 2, debug: 3 };
+    function log(level, message, detail) {
+        if (LOG_LEVELS[level] > %d) return;
+        const method = level === 'error' ? 'error' : level === 'warn' ? 'warn' : level === 'info' ? 'info' : 'debug';
+        if (detail === undefined) console[method](message);
+        else console[method](message, typeof detail === 'function' ? detail() : detail);
+    }
+""" % LOG_LEVELS[get_log_level(level)]
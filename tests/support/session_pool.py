@@ -0,0 +1,143 @@
+import queue
+import threading
+import time
+from .drivers import create_driver
+
+# Pool the current process's tests draw their drivers from, if any
+_active_pool = None
+
+
+def headless_chrome():
+    """Create the Chrome session used by pooled runs, headless unless CHATBOT_BROWSER_PROFILE says otherwise"""
+    return create_driver(default="headless")
+
+
+def get_active_pool():
+    """Return the pool set for this process, or None for one browser per test"""
+    return _active_pool
+
+
+def set_active_pool(pool):
+    global _active_pool
+    _active_pool = pool
+
+
+class SessionPool:
+    """A fixed set of pre-warmed browser sessions shared between tests.
+
+    Sessions are launched up front, in parallel, and reset between tests
+    by clearing cookies and storage instead of being relaunched.
+    """
+
+    def __init__(self, size=1, factory=headless_chrome, warm_url=None):
+        self.size = size
+        self.factory = factory
+        self.warm_url = warm_url
+        self._idle = queue.Queue()
+        self._sessions = []
+        self._lock = threading.Lock()
+        # Sessions alive or being relaunched; drops when a relaunch fails
+        self.capacity = 0
+        self.stats = {"acquired": 0, "resets": 0, "replaced": 0, "lost": 0}
+
+    def start(self):
+        """Launch every session concurrently and wait until they are ready"""
+        threads = [threading.Thread(target=self._launch) for _ in range(self.size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if len(self._sessions) < self.size:
+            self.close()
+            raise Exception(f"Only {len(self._sessions)} of {self.size} browser sessions started")
+        self.capacity = len(self._sessions)
+        return self
+
+    def acquire(self, timeout=None, poll=1.0):
+        """
+        Take an idle session, blocking until one is free.
+
+        Raises:
+            queue.Empty: If no session was freed within timeout
+            Exception: If every session was lost to failed relaunches
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.capacity <= 0:
+                raise Exception("No browser sessions left in the pool; every relaunch failed")
+            wait = poll if deadline is None else min(poll, deadline - time.monotonic())
+            if wait <= 0:
+                raise queue.Empty
+            try:
+                driver = self._idle.get(timeout=wait)
+            except queue.Empty:
+                continue
+            with self._lock:
+                self.stats["acquired"] += 1
+            return driver
+
+    def release(self, driver):
+        """Reset a session and return it to the pool, replacing it if it broke"""
+        try:
+            self.reset(driver)
+        except Exception as e:
+            print(f"Replacing broken browser session: {str(e)}")
+            with self._lock:
+                self.stats["replaced"] += 1
+            self._discard(driver)
+            if not self._launch():
+                with self._lock:
+                    self.capacity -= 1
+                    self.stats["lost"] += 1
+                print(f"Browser session lost, {self.capacity} of {self.size} left in the pool")
+            return
+        self._idle.put(driver)
+
+    def reset(self, driver):
+        """Clear cookies, storage and extra windows left behind by a test"""
+        with self._lock:
+            self.stats["resets"] += 1
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.delete_all_cookies()
+        driver.execute_script("""
+            try { window.localStorage.clear(); } catch (e) {}
+            try { window.sessionStorage.clear(); } catch (e) {}
+        """)
+
+    def close(self):
+        """Quit every session owned by the pool"""
+        for driver in list(self._sessions):
+            self._discard(driver)
+
+    def _launch(self):
+        """Start a session and make it idle; returns False if it failed to start"""
+        try:
+            driver = self.factory()
+            if self.warm_url:
+                driver.get(self.warm_url)
+        except Exception as e:
+            print(f"Failed to start browser session: {str(e)}")
+            return False
+        with self._lock:
+            self._sessions.append(driver)
+        self._idle.put(driver)
+        return True
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._sessions:
+                self._sessions.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
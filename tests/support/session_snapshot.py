@@ -0,0 +1,161 @@
+import json
+import threading
+from urllib.parse import urlparse
+
+# Reads the chatflow's storage entries; Flowise keys them by chatflow id,
+# e.g. `<chatflowid>_EXTERNAL` for the submitted lead
+_CAPTURE_SCRIPT = """
+    const prefix = arguments[0];
+    const entries = storage => Object.keys(storage)
+        .filter(key => key.startsWith(prefix))
+        .reduce((found, key) => { found[key] = storage.getItem(key); return found; }, {});
+    return { localStorage: entries(window.localStorage), sessionStorage: entries(window.sessionStorage) };
+"""
+
+# Writes the entries back, only on the chatbot's origin
+_RESTORE_SCRIPT = """
+    (function (origin, local, session) {
+        if (window.location.origin !== origin) return;
+        try {
+            Object.entries(local).forEach(([key, value]) => window.localStorage.setItem(key, value));
+            Object.entries(session).forEach(([key, value]) => window.sessionStorage.setItem(key, value));
+        } catch (e) {}
+    })(%s, %s, %s);
+"""
+
+
+def chatflow_id(url):
+    return urlparse(url).path.rstrip("/").split("/")[-1]
+
+
+class SessionSnapshot:
+    """
+    Cookies and chatflow storage saved after a successful lead form.
+
+    Restoring it before the widget boots makes Flowise treat the visitor as
+    returning, so the page opens straight at the chat view. Conversation
+    fields are dropped on capture so every restored session still starts a
+    new chat.
+    """
+
+    # Fields in stored JSON that belong to one conversation, not to the lead
+    CONVERSATION_FIELDS = ("chatId", "chatHistory")
+
+    def __init__(self, url, cookies, local_storage, session_storage):
+        self.url = url
+        self.cookies = cookies
+        self.local_storage = local_storage
+        self.session_storage = session_storage
+
+    @classmethod
+    def capture(cls, driver, url):
+        """Snapshot the current session; returns None if Flowise stored nothing"""
+        storage = driver.execute_script(_CAPTURE_SCRIPT, chatflow_id(url)) or {}
+        local_storage = {k: cls._strip(v) for k, v in storage.get("localStorage", {}).items()}
+        session_storage = {k: cls._strip(v) for k, v in storage.get("sessionStorage", {}).items()}
+        if not local_storage and not session_storage:
+            return None
+        return cls(url, driver.get_cookies(), local_storage, session_storage)
+
+    @classmethod
+    def _strip(cls, value):
+        try:
+            data = json.loads(value)
+        except (TypeError, ValueError):
+            return value
+        if not isinstance(data, dict):
+            return value
+        return json.dumps({k: v for k, v in data.items() if k not in cls.CONVERSATION_FIELDS})
+
+    def open(self, driver, url):
+        """Navigate to url with the snapshot already in place"""
+        if hasattr(driver, "execute_cdp_cmd"):
+            self._open_with_cdp(driver, url)
+        else:
+            # Without CDP the storage can only be written once on the origin
+            driver.get(url)
+            self._add_cookies(driver)
+            driver.execute_script(self._restore_script())
+            driver.refresh()
+
+    def _open_with_cdp(self, driver, url):
+        # Seed storage before any page script runs, saving a second navigation
+        if self.cookies:
+            driver.execute_cdp_cmd("Network.setCookies", {
+                "cookies": [self._cdp_cookie(cookie) for cookie in self.cookies]
+            })
+        script = driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": self._restore_script()}
+        )
+        try:
+            driver.get(url)
+        finally:
+            # Pooled sessions must not keep restoring into later tests
+            driver.execute_cdp_cmd(
+                "Page.removeScriptToEvaluateOnNewDocument", {"identifier": script["identifier"]}
+            )
+
+    def _restore_script(self):
+        parsed = urlparse(self.url)
+        return _RESTORE_SCRIPT % (
+            json.dumps(f"{parsed.scheme}://{parsed.netloc}"),
+            json.dumps(self.local_storage),
+            json.dumps(self.session_storage),
+        )
+
+    def _add_cookies(self, driver):
+        for cookie in self.cookies:
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                print(f"Could not restore cookie {cookie.get('name')}: {str(e)}")
+
+    def _cdp_cookie(self, cookie):
+        converted = {
+            "name": cookie["name"],
+            "value": cookie["value"],
+            "domain": cookie.get("domain"),
+            "path": cookie.get("path", "/"),
+            "secure": cookie.get("secure", False),
+            "httpOnly": cookie.get("httpOnly", False),
+        }
+        if "sameSite" in cookie:
+            converted["sameSite"] = cookie["sameSite"]
+        if "expiry" in cookie:
+            converted["expires"] = cookie["expiry"]
+        return converted
+
+
+class SessionSnapshotStore:
+    """Snapshots by chatbot URL, shared by every test in the process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        self.stats = {"restored": 0, "captured": 0, "rejected": 0}
+
+    def get(self, url):
+        with self._lock:
+            return self._snapshots.get(url)
+
+    def put(self, snapshot):
+        if snapshot is None:
+            return
+        with self._lock:
+            self._snapshots[snapshot.url] = snapshot
+            self.stats["captured"] += 1
+
+    def discard(self, url):
+        """Forget a snapshot that no longer skips the form"""
+        with self._lock:
+            self._snapshots.pop(url, None)
+            self.stats["rejected"] += 1
+
+
+SNAPSHOTS = SessionSnapshotStore()
+
+
+def full_lead_form(test_method):
+    """Mark a test that covers the lead form, so it never starts from a saved session"""
+    test_method.full_lead_form = True
+    return test_method
@@ -0,0 +1,42 @@
+from urllib.parse import urlparse
+
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+# The target the running ChatbotTarget stands for, and the targets this
+# process has already found ready. Kept here rather than in os.environ so
+# nothing leaks into later targets or child processes unannounced.
+_active_key = None
+_ready = set()
+
+
+def set_active_target(key):
+    """Record the target loopback URLs stand for, or None when it stops"""
+    global _active_key
+    _active_key = key
+
+
+def mark_ready(key):
+    _ready.add(key)
+
+
+def is_ready(key):
+    return key in _ready
+
+
+def ready_targets():
+    """Targets found ready so far, e.g. to hand to worker processes"""
+    return sorted(_ready)
+
+
+def target_key(url=None):
+    """
+    A stable name for the chatbot target, for keying what is learned across runs.
+
+    Remote targets are keyed by scheme and host. Loopback URLs, the stub and
+    the cassette proxy, listen on a new port every run, so they take the
+    active target (the one behind the proxy, set by ChatbotTarget) or "stub".
+    """
+    parsed = urlparse(url or "")
+    if parsed.hostname and parsed.hostname not in LOOPBACK_HOSTS:
+        return f"{parsed.scheme}://{parsed.netloc}"
+    return _active_key or ("stub" if parsed.hostname else "default")
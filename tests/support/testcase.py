@@ -0,0 +1,92 @@
+import os
+import unittest
+from ..pages.chatbot_page import ChatbotPage
+from ..scenarios.scenario import DEFAULT_LEAD
+from .artifacts import ArtifactCollector, flush_artifacts
+from .browser_logs import get_collector, stop_collector
+from .drivers import create_driver
+from .instrumentation import Instrumentation, SUMMARY
+from .session_pool import get_active_pool
+from .session_snapshot import SNAPSHOTS
+from .timing_policy import get_policy
+
+
+def tear_down_module(target):
+    """Print the run's summaries, save what was learned and stop the module's target"""
+    SUMMARY.print_table()
+    # Before stopping, while the policy still knows which target it timed
+    get_policy().print_summary()
+    get_policy().store.save()
+    flush_artifacts()
+    target.stop()
+
+
+class ChatbotTestCase(unittest.TestCase):
+    """
+    Opens the chatbot ready to chat before each test and cleans up after.
+
+    Subclasses set `target` to a started ChatbotTarget.
+    """
+
+    target = None
+
+    def setUp(self):
+        # Reuse a pre-warmed session when running under the parallel runner
+        self.pool = get_active_pool()
+        if self.pool:
+            self.driver = self.pool.acquire()
+            # Runs even if setUp fails, so the session always goes back
+            self.addCleanup(self.pool.release, self.driver)
+        else:
+            # Launch Chrome with CHATBOT_BROWSER_PROFILE (headed incognito by default)
+            self.driver = create_driver()
+            # Registered first so it runs last, and even if setUp fails
+            self.addCleanup(self._quit_driver)
+        self.chatbot_page = ChatbotPage(
+            self.driver,
+            batched=os.environ.get("CHATBOT_BATCHED_ACTIONS") == "1",
+            artifacts=ArtifactCollector(self.driver, test_id=self.id())
+        )
+        
+        # Keep this test's browser console and JS errors, saved only if it fails
+        self.browser_logs = get_collector(self.driver)
+        self.browser_logs.clear()
+        self.addCleanup(self._attach_browser_logs)
+        
+        # Record WebDriver commands and time per page-object step
+        self.instrumentation = None
+        if os.environ.get("CHATBOT_INSTRUMENT") == "1":
+            self.instrumentation = Instrumentation(self.driver)
+            self.instrumentation.instrument(self.chatbot_page)
+            self.addCleanup(self.instrumentation.detach)
+        
+        # Fill in user information, or restore the session saved after an earlier fill
+        reuse = os.environ.get("CHATBOT_REUSE_SESSION", "1") == "1"
+        self.chatbot_page.start_chat(
+            self.target.url, DEFAULT_LEAD,
+            snapshots=SNAPSHOTS if reuse else None,
+            full_form=getattr(getattr(self, self._testMethodName), "full_lead_form", False)
+        )
+
+    def tearDown(self):
+        print(f"Handle cache stats: {self.chatbot_page.handles.stats}")
+        if self.chatbot_page.retries:
+            print(f"Retries: {dict(self.chatbot_page.retries)}")
+        if self.instrumentation:
+            self.instrumentation.write(
+                os.environ.get("CHATBOT_INSTRUMENT_DIR", "instrumentation"), self.id()
+            )
+            SUMMARY.add(self.instrumentation)
+        if not self.pool:
+            self._attach_browser_logs()
+
+    def _quit_driver(self):
+        stop_collector(self.driver)
+        self.driver.quit()
+
+    def _attach_browser_logs(self):
+        """Save the browser log with the test's artifacts if the test failed, once"""
+        if self._outcome.success or getattr(self, "_browser_logs_attached", False):
+            return
+        self._browser_logs_attached = True
+        self.chatbot_page.artifacts.attach("browser-log", self.browser_logs.entries())
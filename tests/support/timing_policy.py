@@ -0,0 +1,197 @@
+import atexit
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+from selenium.common.exceptions import TimeoutException
+from .stats import percentile
+from .targets import target_key
+
+DEFAULT_STORE_PATH = ".chatbot_latency.json"
+
+
+def _seconds(value):
+    return f"{value:.2f}s" if value is not None else "-"
+
+
+class LatencyStore:
+    """
+    The most recent latencies of each page-object operation, persisted as JSON.
+
+    Samples are kept per target (see target_key) and operation, so a fast
+    stub does not shrink the timeouts used against a cold live host.
+    Samples recorded in this process are appended to what other workers
+    saved when the store is written, keeping the last `window` per operation.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path=None, window=200):
+        self.path = path or os.environ.get("CHATBOT_LATENCY_STORE", DEFAULT_STORE_PATH)
+        self.window = window
+        self._samples = collections.defaultdict(lambda: collections.deque(maxlen=window))
+        self._new = collections.defaultdict(list)
+        for target, operations in self._read().items():
+            for operation, samples in operations.items():
+                self._samples[(target, operation)].extend(samples)
+
+    def record(self, operation, seconds, target="default"):
+        with self._lock:
+            self._samples[(target, operation)].append(seconds)
+            self._new[(target, operation)].append(seconds)
+
+    def samples(self, operation, target="default"):
+        with self._lock:
+            return list(self._samples.get((target, operation), ()))
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Files from before samples were kept per target have lists here
+        return {target: operations for target, operations in stored.items() if isinstance(operations, dict)}
+
+    def save(self):
+        # Merge with what other workers wrote, then replace the file atomically
+        with self._lock:
+            if not self._new:
+                return
+            stored = self._read()
+            for (target, operation), samples in self._new.items():
+                operations = stored.setdefault(target, {})
+                operations[operation] = (operations.get(operation, []) + samples)[-self.window:]
+            self._new.clear()
+            temporary = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(temporary, "w", encoding="utf-8") as f:
+                    json.dump(stored, f)
+                os.replace(temporary, self.path)
+            except OSError as e:
+                print(f"Could not save latency history: {str(e)}")
+
+
+class TimingPolicy:
+    """
+    Timeouts and poll intervals derived from each operation's recent latencies.
+
+    Until an operation has min_samples recorded latencies its default
+    timeout is used. After that the timeout is its p99 times `factor`,
+    clamped to [min_timeout, max_timeout], so fast targets stop over-waiting
+    and slow ones get room. A wait that times out is recorded at its full
+    timeout, which raises the next one. Retries and timeouts are counted
+    per operation and reported, not absorbed.
+
+    Args:
+        store (LatencyStore): Where latencies are kept
+        adaptive (bool): Defaults to on unless CHATBOT_ADAPTIVE_TIMEOUTS=0
+        target (str): Target the latencies belong to; defaults to the one
+                      the running ChatbotTarget stands for
+    """
+
+    def __init__(self, store=None, adaptive=None, factor=3.0, min_samples=10,
+                 min_timeout=0.5, max_timeout=60.0, min_poll=0.05, max_poll=0.5, target=None):
+        if adaptive is None:
+            adaptive = os.environ.get("CHATBOT_ADAPTIVE_TIMEOUTS", "1") not in ("", "0", "false")
+        self.store = store or LatencyStore()
+        self.target = target
+        self.adaptive = adaptive
+        self.factor = factor
+        self.min_samples = min_samples
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.retries = collections.Counter()
+        self.timeouts = collections.Counter()
+        self.calls = collections.Counter()
+        self._used = {}
+
+    def _target(self):
+        # Looked up on every call: the process-wide policy exists before the target starts
+        return self.target or target_key()
+
+    def _percentile(self, operation, p):
+        samples = self.store.samples(operation, self._target())
+        if not self.adaptive or len(samples) < self.min_samples:
+            return None
+        return percentile(samples, p)
+
+    def timeout(self, operation, default):
+        """Seconds to wait for operation; default until there is enough history"""
+        p99 = self._percentile(operation, 99)
+        timeout = default if p99 is None else min(max(p99 * self.factor, self.min_timeout), self.max_timeout)
+        self._used[operation] = timeout
+        return timeout
+
+    def poll_interval(self, operation, default):
+        """Seconds between polls: a tenth of the median latency, clamped"""
+        p50 = self._percentile(operation, 50)
+        if p50 is None:
+            return default
+        return min(max(p50 / 10, self.min_poll), self.max_poll)
+
+    def record(self, operation, seconds, timed_out=False):
+        self.calls[operation] += 1
+        if timed_out:
+            self.timeouts[operation] += 1
+        self.store.record(operation, seconds, self._target())
+
+    def record_retry(self, operation):
+        self.retries[operation] += 1
+
+    @contextlib.contextmanager
+    def measure(self, operation, timeout):
+        """Record how long the block took, or the full timeout if it timed out"""
+        started = time.monotonic()
+        try:
+            yield
+        except TimeoutException:
+            self.record(operation, timeout, timed_out=True)
+            raise
+        self.record(operation, time.monotonic() - started)
+
+    def report(self):
+        """Per-operation calls, latency percentiles, timeout in use, timeouts and retries"""
+        operations = sorted(set(self.calls) | set(self.retries))
+        report = {}
+        for operation in operations:
+            samples = self.store.samples(operation, self._target())
+            report[operation] = {
+                "calls": self.calls[operation],
+                "p50": percentile(samples, 50),
+                "p99": percentile(samples, 99),
+                "timeout": self._used.get(operation),
+                "timeouts": self.timeouts[operation],
+                "retries": self.retries[operation],
+            }
+        return report
+
+    def print_summary(self):
+        report = self.report()
+        if not report:
+            return
+        print(f"\n{'operation':<24}{'calls':>7}{'p50':>9}{'p99':>9}{'timeout':>9}{'timeouts':>10}{'retries':>9}")
+        for operation, row in report.items():
+            print(f"{operation:<24}{row['calls']:>7}{_seconds(row['p50']):>9}{_seconds(row['p99']):>9}"
+                  f"{_seconds(row['timeout']):>9}{row['timeouts']:>10}{row['retries']:>9}")
+        flaky = {operation: row["retries"] for operation, row in report.items() if row["retries"]}
+        if flaky:
+            print(f"Retried operations: {flaky}")
+
+
+_policy = None
+_policy_lock = threading.Lock()
+
+
+def get_policy():
+    """Return the process-wide policy, saving its latencies at exit"""
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = TimingPolicy()
+            atexit.register(_policy.store.save)
+        return _policy
@@ -0,0 +1,198 @@
+import collections
+
+# Keeps a MutationObserver on the chat view that queues bubbles as they are
+# added, so each call only reads what arrived since the previous one. The
+# newest bubble is re-read on every call because streamed replies grow in
+# place. The observer is reinstalled whenever the chat view is replaced.
+_TRANSCRIPT_SCRIPT = """
+    const host = document.querySelector(arguments[0]);
+    const userSelector = arguments[1].join(',');
+    const botSelector = arguments[2].join(',');
+    const maxPending = arguments[3];
+    const root = host && host.shadowRoot;
+    const view = root && root.querySelector('.chatbot-chat-view');
+    if (!view) return { error: 'Chat view not found' };
+
+    const now = () => performance.timeOrigin + performance.now();
+    const selector = userSelector + ',' + botSelector;
+    let state = window.__chatbotTranscript;
+    let reset = false;
+    if (!state || state.view !== view) {
+        if (state) state.observer.disconnect();
+        state = window.__chatbotTranscript = {
+            view: view, pending: [], seen: new WeakSet(), tail: null, tailText: null,
+            lastBot: null, dropped: 0
+        };
+        state.collect = node => {
+            if (node.nodeType !== 1) return;
+            const found = node.matches(selector) ? [node] : [];
+            found.push(...node.querySelectorAll(selector));
+            for (const el of found) {
+                if (state.seen.has(el)) continue;
+                state.seen.add(el);
+                state.pending.push({ el: el, at: now() });
+                if (state.pending.length > maxPending) {
+                    state.pending.shift();
+                    state.dropped++;
+                }
+            }
+        };
+        state.observer = new MutationObserver(records => records.forEach(
+            record => record.addedNodes.forEach(state.collect)));
+        state.observer.observe(view, { childList: true, subtree: true });
+        state.collect(view);
+        reset = true;
+    }
+    // For waits on the bubbles queued after this update (USER_BUBBLE_ADDED)
+    state.userSelector = userSelector;
+    state.observer.takeRecords().forEach(record => record.addedNodes.forEach(state.collect));
+
+    const text = el => (el.innerText || el.textContent || '').trim();
+    let tailUpdate = null;
+    if (state.tail && state.tail.isConnected) {
+        const tailText = text(state.tail);
+        if (tailText !== state.tailText) {
+            state.tailText = tailText;
+            tailUpdate = { text: tailText, at: now() };
+        }
+    }
+
+    // Keep only the innermost of nested bubbles, e.g. a bubble inside its row
+    const pending = state.pending.filter(p => !state.pending.some(
+        q => q !== p && p.el.contains(q.el)));
+    state.pending = [];
+    const added = pending.map(p => ({
+        role: p.el.matches(userSelector) ? 'user' : 'bot',
+        text: text(p.el),
+        at: p.at
+    }));
+    pending.forEach((p, i) => { if (added[i].role === 'bot') state.lastBot = p.el; });
+    if (pending.length) {
+        state.tail = pending[pending.length - 1].el;
+        state.tailText = added[added.length - 1].text;
+    }
+    const dropped = state.dropped;
+    state.dropped = 0;
+    return { reset: reset, added: added, tailUpdate: tailUpdate, dropped: dropped };
+"""
+
+_LAST_BOT_SCRIPT = "return window.__chatbotTranscript ? window.__chatbotTranscript.lastBot : null;"
+
+
+class TranscriptEntry:
+    """
+    One chat bubble.
+
+    Attributes:
+        index: Position in the conversation, counting from the first bubble seen
+        role: 'user' or 'bot'
+        text: The bubble's text; the newest bubble keeps updating while it streams
+        appeared_at: Epoch seconds when the bubble was added to the page
+        updated_at: Epoch seconds when its text last changed
+    """
+
+    __slots__ = ("index", "role", "text", "appeared_at", "updated_at")
+
+    def __init__(self, index, role, text, appeared_at):
+        self.index = index
+        self.role = role
+        self.text = text
+        self.appeared_at = appeared_at
+        self.updated_at = appeared_at
+
+    def __repr__(self):
+        return f"TranscriptEntry({self.index}, {self.role!r}, {self.text[:40]!r})"
+
+
+class TranscriptTracker:
+    """
+    Follows a ChatbotPage conversation at constant cost per update.
+
+    An observer in the page queues bubbles as they are added, and update()
+    fetches only those in one script call. Entries are kept in a ring buffer
+    of `limit` records, so memory stays bounded however long the chat runs.
+
+    Args:
+        page (ChatbotPage): The page to follow
+        user_selectors (list): Selectors for the user's bubbles
+        bot_selectors (list): Selectors for the bot's bubbles
+        limit (int): Most recent entries to keep
+    """
+
+    def __init__(self, page, user_selectors, bot_selectors, limit=500):
+        self.page = page
+        self.user_selectors = user_selectors
+        self.bot_selectors = bot_selectors
+        self.limit = limit
+        self.entries = collections.deque(maxlen=limit)
+        self.total = 0  # Entries seen so far, including those rotated out
+        self.dropped = 0  # Bubbles the page queue overflowed before they were fetched
+        self.resets = 0
+
+    def update(self):
+        """
+        Fetch the bubbles added since the last update.
+
+        Returns:
+            list: The new TranscriptEntry records
+        """
+        page = self.page
+        result = page.driver.execute_script(
+            _TRANSCRIPT_SCRIPT, page.SHADOW_HOST,
+            page.locators.ranked("user_bubble", self.user_selectors),
+            page.locators.ranked("bot_bubble", self.bot_selectors),
+            self.limit
+        )
+        if not result or 'error' in result:
+            raise Exception((result or {}).get('error', 'Transcript update failed'))
+
+        if result['reset'] and self.total:
+            # The chat view was re-rendered; what it shows now is a new transcript
+            self.resets += 1
+            self.entries.clear()
+        tail_update = result['tailUpdate']
+        if tail_update and self.entries:
+            self.entries[-1].text = tail_update['text']
+            self.entries[-1].updated_at = tail_update['at'] / 1000.0
+
+        added = []
+        for bubble in result['added']:
+            entry = TranscriptEntry(self.total, bubble['role'], bubble['text'], bubble['at'] / 1000.0)
+            self.entries.append(entry)
+            added.append(entry)
+            self.total += 1
+        self.dropped += result['dropped']
+        return added
+
+    def mark(self):
+        """Return a position to pass to since() or find() later, e.g. before sending"""
+        return self.total
+
+    def since(self, mark):
+        """Entries from position mark onwards that are still in the buffer"""
+        # Walk back from the newest entry so the cost is the number of new entries
+        found = []
+        for entry in reversed(self.entries):
+            if entry.index < mark:
+                break
+            found.append(entry)
+        found.reverse()
+        return found
+
+    def find(self, text=None, role=None, since=0):
+        """Entries from position since onwards matching role and containing text"""
+        return [
+            entry for entry in self.since(since)
+            if (role is None or entry.role == role) and (text is None or text in entry.text)
+        ]
+
+    def last(self, role=None):
+        """The newest entry, or the newest with role"""
+        for entry in reversed(self.entries):
+            if role is None or entry.role == role:
+                return entry
+        return None
+
+    def last_bot_element(self):
+        """The newest bot bubble as a WebElement, without searching the chat"""
+        return self.page.driver.execute_script(_LAST_BOT_SCRIPT)
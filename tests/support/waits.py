@@ -0,0 +1,172 @@
+import threading
+import time
+from selenium.common.exceptions import TimeoutException
+
+# Conditions are JavaScript expressions evaluated with `root` (the chatbot
+# shadow root, or null while the widget is booting) and `args` (the extra
+# arguments passed to ShadowWait.until) in scope.
+SHADOW_ROOT_RENDERED = "root && root.childElementCount > 0"
+
+CHAT_INPUT_PRESENT = """root && root.querySelector('.chatbot-chat-view')
+    && root.querySelector("textarea, div[contenteditable='true'], [role='textbox']")"""
+
+# 'chat' once the chat input is up, 'form' while the lead form is showing
+CHAT_OR_LEAD_FORM = """root && (
+    root.querySelector('.chatbot-chat-view')
+        && root.querySelector("textarea, div[contenteditable='true'], [role='textbox']") ? 'chat'
+    : root.querySelector('input[placeholder*="email" i]') ? 'form' : null)"""
+
+CHAT_VIEW_CONTAINS = """root && (view => view && view.textContent.includes(args[0]))(
+    root.querySelector('.chatbot-chat-view'))"""
+
+# A user bubble containing args[0] was added since the transcript was last
+# updated (see TranscriptTracker), so neither an earlier identical message
+# nor a bot reply echoing it counts. Only reads the bubbles added since.
+USER_BUBBLE_ADDED = """(state => !!state && state.view.isConnected && (
+    state.observer.takeRecords().forEach(record => record.addedNodes.forEach(state.collect)),
+    state.pending.some(p => p.el.matches(state.userSelector)
+        && (p.el.innerText || p.el.textContent || '').includes(args[0]))))(window.__chatbotTranscript)"""
+
+INPUT_VALUE_CONTAINS = "args[0] && (args[0].value || args[0].textContent || '').includes(args[1])"
+
+# Guards the script timeout recorded on each driver, which pages sharing a
+# driver (see BrowserHost) would otherwise race to set
+_script_timeout_lock = threading.Lock()
+
+# Resolves through the async script callback as soon as the condition holds.
+# A MutationObserver on the shadow root catches DOM changes; the interval
+# covers what observers cannot see (shadow root attachment, input values).
+_WAIT_SCRIPT = """
+    const done = arguments[arguments.length - 1];
+    const hostSelector = arguments[0];
+    const timeoutMs = arguments[1];
+    const pollMs = arguments[2];
+    const args = arguments[3];
+    const started = performance.now();
+    const observers = [];
+    let observedRoot = null;
+    let finished = false;
+    let timer = null;
+    let poll = null;
+
+    function finish(result) {
+        if (finished) return;
+        finished = true;
+        observers.forEach(o => o.disconnect());
+        clearTimeout(timer);
+        clearInterval(poll);
+        result.elapsed = performance.now() - started;
+        done(result);
+    }
+
+    function check() {
+        if (finished) return true;
+        const host = document.querySelector(hostSelector);
+        const root = host ? host.shadowRoot : null;
+        if (root && root !== observedRoot) {
+            observedRoot = root;
+            const observer = new MutationObserver(check);
+            observer.observe(root, {
+                childList: true, subtree: true, characterData: true, attributes: true
+            });
+            observers.push(observer);
+        }
+        let value = null;
+        try {
+            value = (__CONDITION__);
+        } catch (e) {
+            value = null;
+        }
+        if (value) {
+            finish({ ok: true, value: value });
+            return true;
+        }
+        return false;
+    }
+
+    if (check()) return;
+    const documentObserver = new MutationObserver(check);
+    documentObserver.observe(document.documentElement, { childList: true, subtree: true });
+    observers.push(documentObserver);
+    poll = setInterval(check, pollMs);
+    timer = setTimeout(() => finish({ ok: false }), timeoutMs);
+"""
+
+
+class ShadowWait:
+    """Event-driven waits on the flowise-fullchatbot shadow DOM.
+
+    Each wait is a single execute_async_script call that returns as soon as
+    the condition holds instead of sleeping for a fixed amount of time.
+    """
+
+    def __init__(self, driver, host="flowise-fullchatbot", timeout=10, poll_interval=0.1, policy=None):
+        self.driver = driver
+        self.host = host
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.policy = policy  # TimingPolicy that adapts named waits, if any
+        self.waited = 0.0  # Total seconds spent inside waits, for benchmarks
+
+    def until(self, condition, timeout=None, args=None, message="", operation=None):
+        """
+        Wait until the JavaScript condition is truthy and return its value.
+
+        Args:
+            condition (str): JavaScript expression over `root` and `args`
+            timeout (float): Deadline in seconds, defaults to self.timeout
+            args (list): Values (including WebElements) exposed as `args`
+            message (str): Message for the TimeoutException
+            operation (str): Name the policy records this wait under; with a
+                             policy, timeout is only the default until the
+                             operation has a latency history
+
+        Returns:
+            The condition's value, e.g. True or a WebElement
+
+        Raises:
+            TimeoutException: If the deadline passes first
+        """
+        timeout = self.timeout if timeout is None else timeout
+        poll_interval = self.poll_interval
+        if self.policy and operation:
+            timeout = self.policy.timeout(operation, timeout)
+            poll_interval = self.policy.poll_interval(operation, poll_interval)
+        self.ensure_script_timeout(timeout)
+        script = _WAIT_SCRIPT.replace("__CONDITION__", condition)
+        started = time.monotonic()
+        try:
+            result = self.driver.execute_async_script(
+                script, self.host, int(timeout * 1000), int(poll_interval * 1000), args or []
+            )
+        finally:
+            self.waited += time.monotonic() - started
+        ok = bool(result and result.get("ok"))
+        if self.policy and operation:
+            elapsed = result["elapsed"] / 1000.0 if ok and result.get("elapsed") is not None else timeout
+            self.policy.record(operation, elapsed, timed_out=not ok)
+        if not ok:
+            raise TimeoutException(message or f"Condition not met within {timeout}s: {condition}")
+        return result.get("value")
+
+    def until_or_none(self, condition, timeout=None, args=None, operation=None):
+        """Like until, but return None instead of raising on timeout"""
+        try:
+            return self.until(condition, timeout=timeout, args=args, operation=operation)
+        except TimeoutException:
+            return None
+
+    def ensure_script_timeout(self, timeout):
+        """
+        Raise the driver's async script timeout to cover an in-page deadline.
+
+        The timeout is a setting of the WebDriver session, so it is tracked on
+        the driver rather than per wait and never lowered: another page on the
+        same session may be inside a longer wait.
+        """
+        needed = timeout + 5
+        with _script_timeout_lock:
+            current = getattr(self.driver, "_chatbot_script_timeout", None)
+            if current is None or current < needed:
+                self.driver.set_script_timeout(needed)
+                self.driver._chatbot_script_timeout = needed
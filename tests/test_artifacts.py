@@ -0,0 +1,60 @@
+import base64
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from .support.artifacts import ArtifactCollector, flush_artifacts
+
+PNG = b"\x89PNG\r\n\x1a\nfake"
+
+class FakeDriver:
+    def __init__(self):
+        self.commands = 0
+        self.scripts = []
+
+    def get_screenshot_as_base64(self):
+        self.commands += 1
+        return base64.b64encode(PNG).decode("ascii")
+
+    def execute_script(self, script, *args):
+        self.commands += 1
+        self.scripts.append(script)
+        return {"url": "http://stub/chatbot/x", "elements": [], "shadowHtml": "<div></div>"}
+
+class ArtifactCollectorTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        self.driver = FakeDriver()
+
+    def test_capture_writes_screenshot_and_compressed_snapshot(self):
+        """Test that a capture lands in the per-worker, per-test directory"""
+        collector = ArtifactCollector(self.driver, test_id="tests.Test.test_x", root=self.root)
+        base = collector.capture("send_message_error")
+        self.assertTrue(flush_artifacts())
+
+        self.assertIn(os.path.join(f"worker-{os.getpid()}", "tests.Test.test_x"), base)
+        with open(base + ".png", "rb") as f:
+            self.assertEqual(f.read(), PNG)
+        with gzip.open(base + ".json.gz") as f:
+            self.assertEqual(json.load(f)["shadowHtml"], "<div></div>")
+
+    def test_captures_are_limited_per_test(self):
+        """Test that a failure storm stops touching the browser after the limit"""
+        collector = ArtifactCollector(self.driver, root=self.root, max_per_test=2)
+        paths = [collector.capture("error") for _ in range(10)]
+        flush_artifacts()
+
+        self.assertEqual(len([p for p in paths if p]), 2)
+        self.assertEqual(self.driver.commands, 4)
+
+    def test_element_listing_leaves_out_the_page_html(self):
+        """Test that debugging output does not pull the whole document over the wire"""
+        ArtifactCollector(self.driver, root=self.root).elements()
+        self.assertNotIn("outerHTML", self.driver.scripts[0])
+        self.assertNotIn("innerHTML", self.driver.scripts[0])
+
+if __name__ == "__main__":
+    unittest.main()
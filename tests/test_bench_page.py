@@ -0,0 +1,20 @@
+import unittest
+from .benchmarks.bench_page import compare
+
+def result(p50, commands):
+    return {"seconds": {"p50": p50}, "commands": commands}
+
+class BenchmarkComparisonTests(unittest.TestCase):
+    def test_regressions_beyond_threshold_are_flagged(self):
+        """Test that slower or chattier operations are flagged and noise is not"""
+        baseline = {"load@10": result(0.100, 4), "send_message@100": result(0.200, 10)}
+        results = {
+            "load@10": result(0.110, 4),
+            "send_message@100": result(0.300, 14),
+            "is_message_visible@1000": result(0.050, 2),
+        }
+        regressions = compare(results, baseline, threshold=0.2)
+        self.assertEqual([key for key, _ in regressions], ["send_message@100", "send_message@100"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import threading
+import unittest
+from selenium.webdriver.remote.command import Command
+from .support.browser_contexts import BrowserHost, ContextScheduler
+from .support.waits import ShadowWait
+
+class FakeDriver:
+    """Records which window each command ran in; CDP targets become windows"""
+
+    def __init__(self):
+        self.current_window_handle = "default"
+        self.handles = ["default"]
+        self.contexts = set()
+        self.created = 0
+        self.log = []
+        self.lock = threading.Lock()
+
+    def execute(self, command, params=None):
+        with self.lock:
+            if command == Command.SWITCH_TO_WINDOW:
+                self.current_window_handle = params["handle"]
+            elif command == Command.W3C_GET_WINDOW_HANDLES:
+                return {"value": list(self.handles)}
+            else:
+                self.log.append((self.current_window_handle, command))
+            return {"value": None}
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.execute("executeCdpCommand", {"cmd": cmd, "params": params})
+        if cmd == "Target.createBrowserContext":
+            with self.lock:
+                self.created += 1
+                self.contexts.add(f"context-{self.created}")
+                return {"browserContextId": f"context-{self.created}"}
+        if cmd == "Target.createTarget":
+            self.handles.append(f"tab-{params['browserContextId']}")
+            return {"targetId": self.handles[-1]}
+        if cmd == "Target.closeTarget":
+            self.handles.remove(params["targetId"])
+        if cmd == "Target.disposeBrowserContext":
+            self.contexts.discard(params["browserContextId"])
+        return {}
+
+    def quit(self):
+        pass
+
+class BrowserHostTests(unittest.TestCase):
+    def test_commands_run_in_the_calling_threads_context(self):
+        """Test that each thread's commands are routed to its own tab"""
+        host = BrowserHost(factory=FakeDriver)
+        first, second = host.new_context(), host.new_context()
+
+        def drive(context, count):
+            with context:
+                for _ in range(count):
+                    context.driver.execute("executeScript", {})
+
+        threads = [threading.Thread(target=drive, args=(c, 20)) for c in (first, second)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        scripts = [window for window, command in host.driver.log if command == "executeScript"]
+        self.assertEqual(scripts.count(first.handle), 20)
+        self.assertEqual(scripts.count(second.handle), 20)
+
+        first.close()
+        self.assertNotIn(first.handle, host.driver.handles)
+        self.assertEqual(host.driver.contexts, {second.context_id})
+
+    def test_pages_on_a_host_never_lower_the_script_timeout(self):
+        """Test that a short wait in one context keeps another context's longer timeout"""
+        host = BrowserHost(factory=FakeDriver)
+        timeouts = []
+        host.driver.set_script_timeout = timeouts.append
+        first, second = ShadowWait(host.driver), ShadowWait(host.driver)
+
+        first.ensure_script_timeout(30)
+        second.ensure_script_timeout(10)
+        second.ensure_script_timeout(40)
+        self.assertEqual(timeouts, [35, 45])
+
+class ContextSchedulerTests(unittest.TestCase):
+    def test_every_job_gets_a_fresh_context(self):
+        """Test that jobs are spread over browsers and contexts are disposed after each job"""
+        class FakePage:
+            def __init__(self, driver):
+                self.driver = driver
+
+        def job(page, index):
+            return page.driver
+
+        with ContextScheduler(4, sessions_per_browser=2, factory=FakeDriver, page_factory=FakePage) as scheduler:
+            drivers = scheduler.run(job, 6)
+            self.assertEqual(len(scheduler.hosts), 2)
+            self.assertEqual({id(d) for d in drivers}, {id(h.driver) for h in scheduler.hosts})
+            for host in scheduler.hosts:
+                self.assertEqual(host.driver.contexts, set())
+                self.assertEqual(host.driver.handles, ["default"])
+
+if __name__ == "__main__":
+    unittest.main()
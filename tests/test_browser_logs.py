@@ -0,0 +1,50 @@
+import unittest
+from .support.browser_logs import BrowserLogCollector
+from .support.scripts import get_log_level, page_log_js
+
+class FakeDriver:
+    """A driver without a CDP connection, so the collector polls get_log"""
+
+    def __init__(self):
+        self.pending = []
+
+    def get_log(self, log_type):
+        logs, self.pending = self.pending, []
+        return logs
+
+def console(message, level="SEVERE"):
+    return {"level": level, "source": "javascript", "message": message, "timestamp": 1700000000000}
+
+class BrowserLogCollectorTests(unittest.TestCase):
+    def test_falls_back_to_polling_into_a_bounded_buffer(self):
+        """Test that only the newest entries are kept when streaming is unavailable"""
+        driver = FakeDriver()
+        collector = BrowserLogCollector(driver, limit=3)
+        self.assertFalse(collector.start())
+
+        driver.pending = [console(f"error {i}") for i in range(5)]
+        entries = collector.entries()
+        self.assertEqual([e["text"] for e in entries], ["error 2", "error 3", "error 4"])
+        self.assertEqual(entries[0]["level"], "severe")
+        self.assertEqual(entries[0]["time"], 1700000000.0)
+
+    def test_clear_drops_earlier_tests_logs(self):
+        """Test that clearing drains logs that arrived before the current test"""
+        driver = FakeDriver()
+        collector = BrowserLogCollector(driver, limit=10)
+        driver.pending = [console("previous test")]
+        collector.clear()
+        driver.pending = [console("this test", level="WARNING")]
+        self.assertEqual([e["text"] for e in collector.entries()], ["this test"])
+
+class PageLogLevelTests(unittest.TestCase):
+    def test_level_is_validated_and_inlined(self):
+        """Test that the level switch is checked and compiled into the helper"""
+        self.assertEqual(get_log_level("DEBUG"), "debug")
+        self.assertIn("> 3)", page_log_js("debug"))
+        self.assertIn("> -1)", page_log_js("off"))
+        with self.assertRaises(Exception):
+            get_log_level("verbose")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from .client.chatbot_client import ChatbotClient
+from .client.http_pool import HTTPConnectionPool
+from .scenarios.scenario import GREETING
+from .stub.cassette_proxy import CassetteProxy, cassette_key, RECORD, REPLAY
+from .stub.server import StubServer, StubConfig
+
+def run_scenario(url):
+    async def run():
+        pool = HTTPConnectionPool()
+        try:
+            return await ChatbotClient(url, pool).run_scenario(GREETING)
+        finally:
+            await pool.close()
+    return asyncio.run(run())
+
+class CassetteProxyTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cassettes = directory.name
+
+    def record(self, config):
+        with StubServer(config=config) as server:
+            url = server.chatbot_url()
+            with CassetteProxy(url, self.cassettes, RECORD) as proxy:
+                return url, run_scenario(proxy.proxied_url(url))
+
+    def test_replay_without_upstream(self):
+        """Test that a recorded streamed conversation replays after the upstream is gone"""
+        url, recorded = self.record(StubConfig(streaming=True, token_delay=0.05))
+
+        with CassetteProxy(url, self.cassettes, REPLAY, timing=1.0) as proxy:
+            replayed = run_scenario(proxy.proxied_url(url))
+            self.assertEqual(proxy.stats["missed"], 0)
+
+        self.assertEqual([r.text for r in replayed], [r.text for r in recorded])
+        self.assertTrue(replayed[0].streamed)
+        self.assertGreater(replayed[0].elapsed - replayed[0].time_to_first_token, 0.1,
+                           "Replay should keep the recorded gaps between tokens")
+
+    def test_replay_with_timing_removed(self):
+        """Test that timing=0 serves a slow recording immediately"""
+        url, recorded = self.record(StubConfig(latency=0.5))
+
+        with CassetteProxy(url, self.cassettes, REPLAY, timing=0) as proxy:
+            started = time.monotonic()
+            replayed = run_scenario(proxy.proxied_url(url))
+            self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual([r.text for r in replayed], [r.text for r in recorded])
+
+    def test_key_ignores_chat_id(self):
+        """Test that requests from different chats share a cassette"""
+        first = cassette_key("POST", "/api/v1/prediction/x", b'{"question": "Hi", "chatId": "a"}')
+        second = cassette_key("POST", "/api/v1/prediction/x", b'{"chatId": "b", "question": "Hi"}')
+        other = cassette_key("POST", "/api/v1/prediction/x", b'{"question": "Bye", "chatId": "a"}')
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_key_keeps_nested_ids(self):
+        """Test that only top-level volatile fields are dropped from the key"""
+        first = cassette_key("POST", "/api/v1/prediction/x", b'{"question": "Hi", "uploads": [{"id": "a"}]}')
+        second = cassette_key("POST", "/api/v1/prediction/x", b'{"question": "Hi", "uploads": [{"id": "b"}]}')
+        self.assertNotEqual(first, second)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import unittest
+from .client.chatbot_client import ChatbotClient, run_conversations
+from .client.http_pool import HTTPConnectionPool
+from .scenarios.scenario import GREETING
+from .stub.server import StubServer, StubConfig
+
+class ChatbotClientTests(unittest.TestCase):
+    def setUp(self):
+        self.server = StubServer(config=StubConfig()).start()
+        self.url = self.server.chatbot_url()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def run_client(self, coroutine_function):
+        async def run():
+            pool = HTTPConnectionPool()
+            try:
+                return await coroutine_function(ChatbotClient(self.url, pool)), pool
+            finally:
+                await pool.close()
+        return asyncio.run(run())
+
+    def test_scenario_over_http(self):
+        """Test that a scenario submits the lead and gets a reply per turn"""
+        replies, pool = self.run_client(lambda client: client.run_scenario(GREETING))
+
+        self.assertEqual([r.text for r in replies], [f"You said: {t}" for t in GREETING.turns])
+        self.assertEqual(self.server.leads[0]["email"], GREETING.lead["email"])
+        self.assertEqual(pool.stats["opened"], 1, "Requests should share one kept-alive connection")
+
+    def test_streaming_reply(self):
+        """Test that streamed replies are reassembled with a time to first token"""
+        self.server.config.streaming = True
+        self.server.config.token_delay = 0.05
+        replies, _ = self.run_client(lambda client: client.run_scenario(GREETING))
+
+        reply = replies[0]
+        self.assertTrue(reply.streamed)
+        self.assertEqual(reply.text, "You said: Hello, how are you?")
+        self.assertLess(reply.time_to_first_token, reply.elapsed)
+
+    def test_concurrent_conversations(self):
+        """Test that many conversations run from one process over a bounded pool"""
+        replies = []
+        failures, stats = asyncio.run(run_conversations(
+            self.url, GREETING, conversations=50, concurrency=10, on_reply=replies.append
+        ))
+
+        self.assertEqual(failures, [])
+        self.assertEqual(len(replies), 50 * len(GREETING.turns))
+        self.assertLessEqual(stats["opened"], 10)
+
+    def test_failed_conversations_are_reported_by_session(self):
+        """Test that a failure names the conversation and turn it happened in"""
+        replies = []
+
+        def on_reply(reply):
+            replies.append(reply)
+            if len(replies) == 3:
+                raise Exception("Bad reply")
+
+        failures, _ = asyncio.run(run_conversations(
+            self.url, GREETING, conversations=5, concurrency=1, on_reply=on_reply
+        ))
+
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(failures[0]["session"], (3 - 1) // len(GREETING.turns))
+        self.assertEqual(failures[0]["turn"], (3 - 1) % len(GREETING.turns))
+        self.assertEqual(failures[0]["error"], "Bad reply")
+
+class HTTPConnectionPoolTests(unittest.TestCase):
+    def test_timed_out_connection_is_closed(self):
+        """Test that a request that times out closes its connection instead of leaking it"""
+        async def scenario():
+            closed = asyncio.Event()
+
+            async def never_answer(reader, writer):
+                await reader.read()  # Returns once the client closes the connection
+                closed.set()
+
+            server = await asyncio.start_server(never_answer, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            pool = HTTPConnectionPool(limit=1, timeout=0.2)
+            opened = []
+            connect = pool._connect
+
+            async def recording_connect(key, fresh=False):
+                connection, reused = await connect(key, fresh)
+                opened.append(connection[1])
+                return connection, reused
+
+            pool._connect = recording_connect
+            try:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await pool.request("GET", f"http://127.0.0.1:{port}/")
+                self.assertTrue(opened[0].is_closing())
+                await asyncio.wait_for(closed.wait(), 2)
+                self.assertEqual(pool._idle, {})
+            finally:
+                await pool.close()
+                server.close()
+
+        asyncio.run(scenario())
+
+if __name__ == "__main__":
+    unittest.main()
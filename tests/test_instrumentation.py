@@ -0,0 +1,44 @@
+import collections
+import unittest
+from .pages.chatbot_page import ChatbotPage
+from .support.instrumentation import Instrumentation, InstrumentationSummary
+from .support.timing_policy import LatencyStore, TimingPolicy
+
+class FakeDriver:
+    def execute(self, driver_command, params=None):
+        return {"value": None}
+
+class FakePage:
+    _retry = ChatbotPage._retry
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.retries = collections.Counter()
+        self.timing = TimingPolicy(LatencyStore("/nonexistent/latency.json"), adaptive=False)
+        self.instrumentation = None
+
+    def send_message(self, message):
+        self.driver.execute("w3cExecuteScript", {"script": "return 1"})
+        self._retry("send_message")
+        self.driver.execute("w3cExecuteScript", {"script": "return 1"})
+
+class InstrumentationTests(unittest.TestCase):
+    def test_retries_are_credited_to_the_step_that_retried(self):
+        """Test that a retry inside send_message is counted under send_message"""
+        driver = FakeDriver()
+        instrumentation = Instrumentation(driver)
+        page = instrumentation.instrument(FakePage(driver))
+        page.send_message("hello")
+
+        self.assertEqual(list(instrumentation.steps), [("send_message",)])
+        step = instrumentation.steps[("send_message",)]
+        self.assertEqual(step.retries, 1)
+        self.assertEqual(step.commands["execute_script"], 2)
+
+        summary = InstrumentationSummary()
+        summary.add(instrumentation)
+        self.assertEqual(summary.totals["send_message"].retries, 1)
+        self.assertNotIn("_retry", summary.totals)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from .support.load_timing import LoadHistory, LoadTiming, load_budgets
+
+def page_data(shadow_ready=900.0):
+    return {
+        "navigation": {"responseStart": 50.0, "domContentLoaded": 200.0, "loadEvent": 0},
+        "paints": {"first-paint": 120.0, "first-contentful-paint": 130.0},
+        "marks": {"defined": 300.0, "shadowAttached": 310.0, "shadowReady": shadow_ready},
+        "resources": [
+            {"url": "http://stub/api/v1/chatflows-streaming/x", "type": "fetch",
+             "start": 320.0, "duration": 40.0, "size": 120},
+            {"url": "http://stub/stub/web.js", "type": "script", "start": 150.0, "duration": 100.0, "size": 9000},
+        ],
+    }
+
+class LoadTimingTests(unittest.TestCase):
+    def test_metrics_are_seconds_and_resources_ordered(self):
+        """Test that page timestamps become seconds and the waterfall follows request order"""
+        timing = LoadTiming(page_data())
+        self.assertEqual(timing.ttfb, 0.05)
+        self.assertEqual(timing.shadow_ready, 0.9)
+        self.assertIsNone(timing.load_event)
+        lines = timing.waterfall()
+        self.assertIn("/stub/web.js", lines[0])
+        self.assertIn("chatflows-streaming", lines[1])
+
+    def test_budgets_flag_slow_metrics_and_skip_missing_ones(self):
+        """Test that only measured metrics over budget are reported"""
+        timing = LoadTiming(page_data(shadow_ready=6000.0))
+        budgets = load_budgets({"load_event": 1.0})
+        self.assertEqual(timing.violations(budgets), ["shadow_ready 6.00s > 5.0s"])
+
+class LoadHistoryTests(unittest.TestCase):
+    def test_regression_against_recent_median(self):
+        """Test that a load well above the recent median is flagged once enough history exists"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        history = LoadHistory(os.path.join(directory.name, "history.jsonl"), min_runs=3)
+        slow = LoadTiming(page_data(shadow_ready=2000.0))
+        self.assertEqual(history.regressions("stub/chatbot", slow), [])
+
+        for _ in range(3):
+            history.record("stub/chatbot", LoadTiming(page_data()))
+        history.record("other/chatbot", slow)
+        self.assertEqual(len(history.regressions("stub/chatbot", slow)), 1)
+        self.assertEqual(history.regressions("stub/chatbot", LoadTiming(page_data(950.0))), [])
+
+    def test_history_is_capped(self):
+        """Test that the oldest loads are dropped once the file is full"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        history = LoadHistory(os.path.join(directory.name, "history.jsonl"), min_runs=3, max_entries=10)
+        for _ in range(25):
+            history.record("stub", LoadTiming(page_data()))
+        with open(history.path) as f:
+            self.assertLessEqual(len(f.readlines()), 10)
+        self.assertGreaterEqual(len(history.recent("stub")), 5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+from .support.locators import LocatorStrategies, locator_key
+from .support.targets import set_active_target
+
+SELECTORS = ["textarea", "input[type='text']", "[contenteditable='true']"]
+
+class LocatorStrategiesTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "locators.json")
+
+    def test_successful_selector_is_tried_first(self):
+        """Test that the selector that worked moves to the front and persists"""
+        locators = LocatorStrategies(self.path, key="host/chatbot/a")
+        locators.succeeded("chat_input", "[contenteditable='true']", SELECTORS)
+
+        self.assertEqual(locators.stats["fallback"], 1)
+        reloaded = LocatorStrategies(self.path, key="host/chatbot/a")
+        self.assertEqual(reloaded.ranked("chat_input", SELECTORS)[0], "[contenteditable='true']")
+        reloaded.succeeded("chat_input", "[contenteditable='true']", SELECTORS)
+        self.assertEqual(reloaded.stats["first_try"], 1)
+
+    def test_rankings_are_per_key(self):
+        """Test that a ranking learned for one chatbot does not affect another"""
+        locators = LocatorStrategies(self.path, key="host/chatbot/a")
+        locators.succeeded("chat_input", "input[type='text']", SELECTORS)
+
+        other = LocatorStrategies(self.path, key="host/chatbot/b")
+        self.assertEqual(other.ranked("chat_input", SELECTORS), SELECTORS)
+
+    def test_failed_selector_is_demoted(self):
+        """Test that a selector whose element was unusable moves to the back"""
+        locators = LocatorStrategies(self.path)
+        locators.failed("chat_input", "textarea", SELECTORS)
+        self.assertEqual(locators.ranked("chat_input", SELECTORS)[-1], "textarea")
+
+    def test_stub_runs_share_a_key(self):
+        """Test that the stub's ephemeral ports do not start a new ranking every run"""
+        self.assertEqual(locator_key("http://127.0.0.1:40123/chatbot/a"), "stub")
+        self.assertEqual(locator_key("http://127.0.0.1:51877/chatbot/a"), "stub")
+        self.assertEqual(locator_key("https://flowise.example.com/chatbot/a"), "https://flowise.example.com")
+        set_active_target("https://flowise.example.com")
+        self.addCleanup(set_active_target, None)
+        self.assertEqual(locator_key("http://127.0.0.1:40123/chatbot/a"), "https://flowise.example.com")
+
+if __name__ == "__main__":
+    unittest.main()
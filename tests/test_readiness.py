@@ -0,0 +1,47 @@
+import unittest
+from .client.readiness import ReadinessProbe
+from .config import ChatbotTarget
+from .stub.server import StubConfig, StubServer
+
+class ReadinessProbeTests(unittest.TestCase):
+    def test_waits_for_a_cold_starting_target(self):
+        """Test that probing backs off until the stub finishes booting"""
+        with StubServer(config=StubConfig(startup=1.0)) as server:
+            result = ReadinessProbe(server.chatbot_url(), timeout=10, initial_delay=0.1, max_delay=0.4).run()
+            paths = [path for _, path, _ in server.requests]
+
+        self.assertTrue(result.ready)
+        self.assertTrue(result.cold)
+        self.assertGreaterEqual(result.waited, 0.9)
+        self.assertGreater(result.attempts, 2)
+        self.assertIn("/api/v1/ping", paths)
+        self.assertTrue(any(path.startswith("/api/v1/chatflows-streaming/") for path in paths))
+
+    def test_gives_up_at_the_deadline(self):
+        """Test that a target that never boots is reported with its last error"""
+        with StubServer(config=StubConfig(startup=60)) as server:
+            result = ReadinessProbe(server.chatbot_url(), timeout=0.5, initial_delay=0.1).run()
+
+        self.assertFalse(result.ready)
+        self.assertIn("HTTP 503", result.last_error)
+
+    def test_warm_target_is_ready_on_the_first_probe(self):
+        """Test that a running target costs a single probe round"""
+        with StubServer() as server:
+            result = ReadinessProbe(server.chatbot_url()).run()
+        self.assertTrue(result.ready)
+        self.assertFalse(result.cold)
+        self.assertEqual(result.attempts, 1)
+
+class TargetReadinessTests(unittest.TestCase):
+    def test_remote_target_is_probed_once_per_run(self):
+        """Test that a second module starting the same target skips the probe"""
+        with StubServer() as server:
+            for _ in range(2):
+                target = ChatbotTarget(server.chatbot_url(), cassettes="", ready_check=True).start()
+                target.stop()
+            pings = [path for _, path, _ in server.requests if path == "/api/v1/ping"]
+        self.assertEqual(len(pings), 1)
+
+if __name__ == "__main__":
+    unittest.main()
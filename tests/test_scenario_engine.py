@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from .scenarios.engine import run_scenario
+from .scenarios.loader import load_scenarios
+from .scenarios.scenario import Scenario
+from .support.transcript import TranscriptEntry
+
+class FakeTiming:
+    def violations(self, max_ttft=None, max_complete=None):
+        return ["Time to first token 5.00s > 1s"] if max_ttft is not None and max_ttft < 5 else []
+
+    def as_dict(self):
+        return {}
+
+class FakeTranscript:
+    """Hands out the page's bubbles like TranscriptTracker and records each read position"""
+
+    def __init__(self, page):
+        self.page = page
+        self.entries = []
+        self.read_from = []
+
+    def update(self):
+        for bubble in self.page.bubbles[len(self.entries):]:
+            self.entries.append(TranscriptEntry(len(self.entries), bubble["role"], bubble["text"], 0))
+
+    def mark(self):
+        return len(self.entries)
+
+    def since(self, mark):
+        self.read_from.append(mark)
+        return self.entries[mark:]
+
+class FakePage:
+    """Echoes every message like the stub bot"""
+
+    def __init__(self):
+        self.bubbles = [{"role": "bot", "text": "Hi there!"}]
+        self.transcript = FakeTranscript(self)
+
+    def start_response_timing(self):
+        pass
+
+    def send_message(self, message):
+        self.bubbles.append({"role": "user", "text": message})
+        self.bubbles.append({"role": "bot", "text": f"You said: {message}"})
+        return True
+
+    def collect_response_timing(self, timeout=30, settle=1.0):
+        return FakeTiming()
+
+class ScenarioEngineTests(unittest.TestCase):
+    def test_replies_are_matched_to_turns_incrementally(self):
+        """Test that each turn reads only the bubbles appended since the last one"""
+        page = FakePage()
+        scenario = Scenario("capital", [
+            {"message": "What is capital protection?", "expect": ["capital"]},
+            {"message": "What if the market falls?", "expect": "market"},
+        ])
+        result = run_scenario(page, scenario)
+
+        self.assertTrue(result.passed, result.problems())
+        self.assertEqual(result.turns[1].reply, "You said: What if the market falls?")
+        self.assertEqual(page.transcript.read_from, [1, 3])
+
+    def test_expectations_and_budgets_are_reported(self):
+        """Test that unmatched patterns and blown budgets fail the scenario"""
+        scenario = Scenario("strict", [{"message": "Hello", "expect": "goodbye", "budget": {"ttft": 1}}])
+        result = run_scenario(FakePage(), scenario)
+
+        self.assertFalse(result.passed)
+        self.assertEqual(len(result.turns[0].problems), 2)
+
+    def test_load_yaml_and_jsonl(self):
+        """Test that both scenario file formats load from one directory"""
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "a.yaml"), "w") as f:
+                f.write("scenarios:\n  - name: one\n    turns: [Hello]\n")
+            with open(os.path.join(directory, "b.jsonl"), "w") as f:
+                f.write('{"name": "two", "turns": [{"message": "Hi", "budget": {"ttft": 2}}]}\n')
+            scenarios = load_scenarios(directory)
+
+        self.assertEqual([s.name for s in scenarios], ["one", "two"])
+        self.assertEqual(scenarios[1].steps[0].budget, {"ttft": 2})
+
+if __name__ == "__main__":
+    unittest.main()
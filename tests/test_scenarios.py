@@ -0,0 +1,54 @@
+import json
+import os
+import re
+import unittest
+from .support.testcase import ChatbotTestCase, tear_down_module
+from .config import ChatbotTarget
+from .scenarios.engine import run_scenario
+from .scenarios.loader import load_scenarios
+
+SCENARIO_PATH = os.environ.get(
+    "CHATBOT_SCENARIOS", os.path.join(os.path.dirname(__file__), "scenarios", "data")
+)
+
+target = ChatbotTarget()
+
+
+def setUpModule():
+    target.start()
+
+
+def tearDownModule():
+    tear_down_module(target)
+
+
+class ScenarioTests(ChatbotTestCase):
+    """One test per scenario in CHATBOT_SCENARIOS, so the runner can shard them"""
+
+    target = target
+
+    def run_and_check(self, scenario):
+        result = run_scenario(
+            self.chatbot_page, scenario,
+            response_timeout=float(os.environ.get("CHATBOT_RESPONSE_TIMEOUT", "30"))
+        )
+        results_dir = os.environ.get("CHATBOT_SCENARIO_RESULTS")
+        if results_dir:
+            os.makedirs(results_dir, exist_ok=True)
+            with open(os.path.join(results_dir, f"{scenario.name}.json"), "w") as f:
+                json.dump(result.as_dict(), f, indent=2)
+        self.assertTrue(result.passed, "\n".join(result.problems()))
+
+
+def _add_scenario_tests(path):
+    for scenario in load_scenarios(path) if os.path.exists(path) else []:
+        name = "test_" + re.sub(r"\W+", "_", scenario.name).strip("_")
+        test = lambda self, scenario=scenario: self.run_and_check(scenario)
+        test.__doc__ = f"Scenario {scenario.name}: {len(scenario.turns)} turns"
+        setattr(ScenarioTests, name, test)
+
+
+_add_scenario_tests(SCENARIO_PATH)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import json
+import unittest
+from .support.session_snapshot import SessionSnapshot, SessionSnapshotStore
+
+URL = "http://127.0.0.1:5000/chatbot/abc"
+
+class FakeDriver:
+    def __init__(self, local_storage=None):
+        self.local_storage = local_storage or {}
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append("execute_script")
+        return {"localStorage": self.local_storage, "sessionStorage": {}}
+
+    def get_cookies(self):
+        return [{"name": "sid", "value": "1", "domain": "127.0.0.1", "path": "/"}]
+
+    def get(self, url):
+        self.calls.append("get")
+
+    def add_cookie(self, cookie):
+        self.calls.append("add_cookie")
+
+    def refresh(self):
+        self.calls.append("refresh")
+
+class SessionSnapshotTests(unittest.TestCase):
+    def test_capture_keeps_lead_and_drops_conversation(self):
+        """Test that a restored session keeps the lead but starts a new chat"""
+        stored = {"chatId": "c-1", "chatHistory": [], "lead": {"name": "Test User"}}
+        snapshot = SessionSnapshot.capture(FakeDriver({"abc_EXTERNAL": json.dumps(stored)}), URL)
+
+        self.assertEqual(json.loads(snapshot.local_storage["abc_EXTERNAL"]), {"lead": {"name": "Test User"}})
+        self.assertEqual(snapshot.cookies[0]["name"], "sid")
+
+    def test_capture_without_storage_is_not_saved(self):
+        """Test that nothing is cached when Flowise stored nothing"""
+        store = SessionSnapshotStore()
+        store.put(SessionSnapshot.capture(FakeDriver(), URL))
+        self.assertIsNone(store.get(URL))
+
+    def test_open_without_cdp_restores_then_reloads(self):
+        """Test the fallback for drivers without CDP"""
+        snapshot = SessionSnapshot(URL, FakeDriver().get_cookies(), {"abc_EXTERNAL": "{}"}, {})
+        driver = FakeDriver()
+        snapshot.open(driver, URL)
+        self.assertEqual(driver.calls, ["get", "add_cookie", "execute_script", "refresh"])
+
+if __name__ == "__main__":
+    unittest.main()
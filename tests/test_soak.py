@@ -0,0 +1,28 @@
+import unittest
+from .soak import SoakRun, analyze
+
+def run_with(heap, nodes, responses):
+    run = SoakRun()
+    for index, (heap_used, shadow_nodes) in enumerate(zip(heap, nodes)):
+        run.samples.append({"turn": index * 10, "elapsed": 0, "heap_used": heap_used,
+                            "shadow_nodes": shadow_nodes, "js_listeners": None})
+    for turn, response in enumerate(responses, 1):
+        run.turns.append({"turn": turn, "send": 0.2, "response": response})
+    return run
+
+class SoakAnalysisTests(unittest.TestCase):
+    def test_steady_run_passes(self):
+        """Test that linear DOM growth and flat latency stay within thresholds"""
+        report = analyze(run_with([10e6, 11e6, 10.5e6], [100, 300, 500], [1.0] * 20))
+        self.assertEqual(report["violations"], [])
+        self.assertAlmostEqual(report["dom"]["per_turn"], 20.0)
+
+    def test_growth_and_drift_fail(self):
+        """Test that heap growth, DOM bloat and latency drift are each reported"""
+        responses = [1.0] * 10 + [3.0] * 10
+        report = analyze(run_with([10e6, 20e6, 30e6], [100, 1100, 2100], responses))
+        self.assertEqual(len(report["violations"]), 3)
+        self.assertAlmostEqual(report["latency"]["response"]["drift"], 3.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import http.client
+import json
+import time
+import unittest
+from urllib.parse import urlparse
+from .stub.server import StubServer, StubConfig, DEFAULT_CHATFLOW_ID
+
+class StubServerTests(unittest.TestCase):
+    def setUp(self):
+        self.server = StubServer(config=StubConfig()).start()
+        address = urlparse(self.server.base_url)
+        self.connection = http.client.HTTPConnection(address.hostname, address.port, timeout=10)
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.stop()
+
+    def request(self, method, path, body=None):
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        payload = json.dumps(body) if body is not None else None
+        self.connection.request(method, path, body=payload, headers=headers)
+        response = self.connection.getresponse()
+        return response, response.read().decode("utf-8")
+
+    def test_serves_chatbot_page(self):
+        """Test that the chatbot page embeds the flowise-fullchatbot element"""
+        response, body = self.request("GET", f"/chatbot/{DEFAULT_CHATFLOW_ID}")
+        self.assertEqual(response.status, 200)
+        self.assertIn("<flowise-fullchatbot>", body)
+
+        response, body = self.request("GET", "/stub/web.js")
+        self.assertEqual(response.status, 200)
+        self.assertIn("customElements.define('flowise-fullchatbot'", body)
+
+    def test_records_leads(self):
+        """Test that submitted leads are kept by the server"""
+        lead = {"chatflowid": DEFAULT_CHATFLOW_ID, "name": "Test User", "email": "test@example.com"}
+        response, body = self.request("POST", "/api/v1/leads", lead)
+        self.assertEqual(response.status, 200)
+        self.assertEqual(self.server.leads[0]["email"], "test@example.com")
+
+    def test_prediction_with_latency(self):
+        """Test that the prediction endpoint answers after the injected latency"""
+        self.server.config.latency = 0.2
+        started = time.monotonic()
+        response, body = self.request(
+            "POST", f"/api/v1/prediction/{DEFAULT_CHATFLOW_ID}", {"question": "Hello"}
+        )
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+        self.assertEqual(json.loads(body)["text"], "You said: Hello")
+
+    def test_streaming_prediction(self):
+        """Test that streamed predictions arrive as token events on a kept-alive connection"""
+        self.server.config.streaming = True
+        response, body = self.request(
+            "POST", f"/api/v1/prediction/{DEFAULT_CHATFLOW_ID}", {"question": "Hi there", "streaming": True}
+        )
+        self.assertEqual(response.getheader("Content-Type"), "text/event-stream")
+        events = [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+        tokens = "".join(e["data"] for e in events if e["event"] == "token")
+        self.assertEqual(tokens, "You said: Hi there")
+        self.assertEqual(events[-1]["event"], "end")
+
+        # The connection is reused for the next request
+        response, body = self.request("GET", "/api/v1/ping")
+        self.assertEqual(body, "pong")
+
+if __name__ == "__main__":
+    unittest.main()
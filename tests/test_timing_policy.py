@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from selenium.common.exceptions import TimeoutException
+from .pages.chatbot_page import ChatbotPage
+from .support.timing_policy import LatencyStore, TimingPolicy
+from .support.waits import ShadowWait, CHAT_INPUT_PRESENT
+
+class FakeDriver:
+    def __init__(self, results):
+        self.results = list(results)
+        self.timeouts = []
+
+    def set_script_timeout(self, timeout):
+        pass
+
+    def execute_async_script(self, script, host, timeout_ms, poll_ms, args):
+        self.timeouts.append((timeout_ms, poll_ms))
+        return self.results.pop(0)
+
+class TimingPolicyTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "latency.json")
+
+    def policy(self, target="default", **kwargs):
+        return TimingPolicy(LatencyStore(self.path), adaptive=True, min_samples=5, target=target, **kwargs)
+
+    def test_timeout_follows_recent_latency_within_bounds(self):
+        """Test that defaults apply until there is history, then p99 x factor clamped"""
+        policy = self.policy(factor=3.0, min_timeout=0.5, max_timeout=20)
+        self.assertEqual(policy.timeout("chat_input", 10), 10)
+        for _ in range(5):
+            policy.record("chat_input", 0.2)
+        self.assertAlmostEqual(policy.timeout("chat_input", 10), 0.6)
+        self.assertAlmostEqual(policy.poll_interval("chat_input", 0.1), 0.05)
+
+        for _ in range(5):
+            policy.record("response", 12.0)
+        self.assertEqual(policy.timeout("response", 30), 20)
+
+    def test_stub_history_does_not_shrink_other_targets_timeouts(self):
+        """Test that fast stub latencies leave a live target on its defaults"""
+        stub = self.policy(target="stub")
+        for _ in range(10):
+            stub.record("response", 0.05)
+        stub.store.save()
+        self.assertEqual(stub.timeout("response", 30), 0.5)
+
+        live = self.policy(target="https://flowise.example.com")
+        self.assertEqual(live.timeout("response", 30), 30)
+        self.assertEqual(self.policy(target="stub").timeout("response", 30), 0.5)
+
+    def test_latencies_persist_and_merge_across_workers(self):
+        """Test that saved samples are appended to what other workers stored"""
+        first, second = LatencyStore(self.path), LatencyStore(self.path)
+        first.record("widget_render", 1.0)
+        second.record("widget_render", 2.0)
+        first.save()
+        second.save()
+        self.assertEqual(LatencyStore(self.path).samples("widget_render"), [1.0, 2.0])
+
+    def test_waits_record_latency_timeouts_and_retries(self):
+        """Test that named waits feed the policy and timeouts are counted, not hidden"""
+        policy = self.policy()
+        driver = FakeDriver([{"ok": True, "value": True, "elapsed": 150.0}, {"ok": False}])
+        waits = ShadowWait(driver, policy=policy)
+        waits.until(CHAT_INPUT_PRESENT, timeout=2, operation="chat_input")
+        with self.assertRaises(TimeoutException):
+            waits.until(CHAT_INPUT_PRESENT, timeout=2, operation="chat_input")
+        policy.record_retry("send_message")
+
+        self.assertEqual(policy.store.samples("chat_input"), [0.15, 2])
+        report = policy.report()
+        self.assertEqual(report["chat_input"]["timeouts"], 1)
+        self.assertEqual(report["send_message"]["retries"], 1)
+
+class SettlingReplyDriver:
+    """Answers the response timing script like the page would for a reply taking reply_ms"""
+
+    def __init__(self, reply_ms):
+        self.reply_ms = reply_ms
+
+    def set_script_timeout(self, timeout):
+        pass
+
+    def execute_async_script(self, script, timeout_ms, settle_ms):
+        return {
+            "installedAt": 0.0,
+            "sentAt": 0.0,
+            "samples": [[self.reply_ms, 20]],
+            "complete": timeout_ms >= self.reply_ms + settle_ms,
+        }
+
+class ResponseTimeoutTests(unittest.TestCase):
+    def test_fast_history_leaves_room_for_the_reply_to_settle(self):
+        """Test that a timeout learned from fast replies still lets a stub reply come back complete"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        policy = TimingPolicy(LatencyStore(os.path.join(directory.name, "latency.json")),
+                              adaptive=True, min_samples=5, target="stub")
+        for _ in range(10):
+            policy.record("response", 0.1)
+        page = ChatbotPage(SettlingReplyDriver(reply_ms=100), timing=policy)
+
+        timing = page.collect_response_timing(timeout=30, settle=2.0)
+
+        self.assertEqual(policy.timeout("response", 30), 0.5)
+        self.assertTrue(timing.complete)
+        self.assertEqual(policy.timeouts["response"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
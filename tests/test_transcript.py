@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from .pages.chatbot_page import ChatbotPage
+from .support.locators import LocatorStrategies
+from .support.timing_policy import LatencyStore, TimingPolicy
+from .support.transcript import TranscriptTracker, _TRANSCRIPT_SCRIPT
+
+class FakeDriver:
+    """Returns queued transcript script results"""
+
+    def __init__(self):
+        self.results = []
+
+    def execute_script(self, script, *args):
+        return self.results.pop(0)
+
+class FakePage:
+    SHADOW_HOST = "flowise-fullchatbot"
+
+    def __init__(self, path):
+        self.driver = FakeDriver()
+        self.locators = LocatorStrategies(path)
+
+def bubbles(*pairs, at=1000.0):
+    return [{"role": role, "text": text, "at": at} for role, text in pairs]
+
+def result(added=(), tail=None, reset=False):
+    return {"reset": reset, "added": list(added), "tailUpdate": tail, "dropped": 0}
+
+class TranscriptTrackerTests(unittest.TestCase):
+    def setUp(self):
+        self.page = FakePage("/nonexistent/locators.json")
+        self.tracker = TranscriptTracker(self.page, [".user"], [".bot"], limit=3)
+
+    def update(self, *results):
+        self.page.driver.results.extend(results)
+        for _ in results:
+            self.tracker.update()
+
+    def test_streamed_reply_updates_in_place(self):
+        """Test that a growing bot bubble updates its entry instead of adding one"""
+        self.update(
+            result(bubbles(("user", "Hi"), ("bot", "Hel"))),
+            result(tail={"text": "Hello there", "at": 2500.0}),
+        )
+        self.assertEqual([e.text for e in self.tracker.entries], ["Hi", "Hello there"])
+        self.assertEqual(self.tracker.last("bot").updated_at, 2.5)
+
+    def test_ring_buffer_is_bounded(self):
+        """Test that old entries rotate out while marks keep counting"""
+        self.update(result(bubbles(*[("user", f"m{i}") for i in range(5)])))
+        mark = self.tracker.mark()
+        self.update(result(bubbles(("bot", "reply"))))
+
+        self.assertEqual(len(self.tracker.entries), 3)
+        self.assertEqual([e.text for e in self.tracker.since(mark)], ["reply"])
+        self.assertEqual(self.tracker.find("m4")[0].index, 4)
+        self.assertEqual(self.tracker.find("m0"), [])
+
+    def test_new_chat_view_starts_a_new_transcript(self):
+        """Test that a re-rendered chat view clears the buffer"""
+        self.update(result(bubbles(("bot", "Welcome"))))
+        self.update(result(bubbles(("bot", "Welcome back")), reset=True))
+        self.assertEqual([e.text for e in self.tracker.entries], ["Welcome back"])
+        self.assertEqual(self.tracker.resets, 1)
+
+class FakeChatDriver:
+    """Queued transcript updates; every wait times out and nothing else is found"""
+
+    def __init__(self, updates):
+        self.updates = list(updates)
+
+    def execute_script(self, script, *args):
+        if script == _TRANSCRIPT_SCRIPT:
+            return self.updates.pop(0) if self.updates else result()
+        return {"found": False, "elements": []}
+
+    def execute_async_script(self, script, *args):
+        return {"ok": False}
+
+    def set_script_timeout(self, timeout):
+        pass
+
+class SentMessageTests(unittest.TestCase):
+    def page(self, *updates):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        timing = TimingPolicy(LatencyStore(os.path.join(directory.name, "latency.json")), adaptive=False)
+        page = ChatbotPage(FakeChatDriver(updates), timing=timing)
+        page.locators = LocatorStrategies(os.path.join(directory.name, "locators.json"))
+        page.transcript.update()
+        return page, page.transcript.mark()
+
+    def test_bot_echo_does_not_verify_a_send(self):
+        """Test that a bot reply quoting the message is not taken for the user's bubble"""
+        page, mark = self.page(result(bubbles(("user", "hello"))), result(bubbles(("bot", "You said: hello"))))
+        self.assertFalse(page.get_sent_message("hello", since=mark))
+
+    def test_new_user_bubble_verifies_a_send(self):
+        """Test that the user's own bubble after the mark verifies the send"""
+        page, mark = self.page(result(bubbles(("user", "hello"))), result(bubbles(("user", "hello"))))
+        self.assertTrue(page.get_sent_message("hello", since=mark))
+
+if __name__ == "__main__":
+    unittest.main()